@@ -0,0 +1,4 @@
+"""Micro-benchmarks for runtime hot paths.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.cache_backends``.
+"""
@@ -0,0 +1,65 @@
+"""Compare adapter bundle verification strategies.
+
+Writes a bundle of random files and verifies it three ways::
+
+    python -m benchmarks.bundle_hash --files 8 --mb 64
+
+Rows report wall time in milliseconds for whole-file reads hashed one
+after another (the previous implementation), chunked parallel hashing
+(``ModelLoader._bundle_hash``) and a check against the verified sidecar
+(``ModelLoader._verify_bundle`` once the bundle has been verified).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from symphonia.runtime.model_loader import ModelLoader
+
+
+def _legacy_hash(directory: Path) -> str:
+    digests = [
+        hashlib.sha256(p.read_bytes()).hexdigest()
+        for p in sorted(p for p in directory.rglob("*") if p.is_file())
+        if not (p.name.startswith(".") or p.name.endswith(".tmp"))
+    ]
+    return hashlib.sha256("".join(digests).encode()).hexdigest()
+
+
+def _timed(call: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    call()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--mb", type=int, default=32, help="Size of each file in MiB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = Path(tmp) / "bundle"
+        bundle.mkdir()
+        for i in range(args.files):
+            (bundle / f"shard-{i}.safetensors").write_bytes(os.urandom(args.mb << 20))
+        loader = ModelLoader(cache_dir=Path(tmp) / "cache")
+        sha = _legacy_hash(bundle)
+        assert loader._bundle_hash(bundle) == sha
+        loader._verify_bundle(bundle, sha)
+
+        print(f"{'strategy':28s} {'ms':>10s}")
+        print(f"{'read_bytes, sequential':28s} {_timed(lambda: _legacy_hash(bundle)):10.1f}")
+        print(f"{'chunked, parallel':28s} {_timed(lambda: loader._bundle_hash(bundle)):10.1f}")
+        sidecar_ms = _timed(lambda: loader._verify_bundle(bundle, sha))
+        print(f"{'verified sidecar':28s} {sidecar_ms:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
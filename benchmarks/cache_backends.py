@@ -0,0 +1,66 @@
+"""Compare the on-disk cache backends.
+
+Writes and then reads ``--entries`` small JSON entries through each backend
+and reports operations per second plus the on-disk footprint::
+
+    python -m benchmarks.cache_backends --entries 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from symphonia.runtime.cache import cache_key
+from symphonia.runtime.cache_backends import open_cache
+from symphonia.runtime.constants import CacheBackendKind
+from symphonia.runtime.run_index import dir_bytes
+
+
+def bench(backend: str, entries: int, value_bytes: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        keys = [cache_key("bench", "1", {"i": i}, "m") for i in range(entries)]
+        payload = {"text": "x" * value_bytes}
+
+        cache = open_cache(backend, root)
+        start = time.perf_counter()
+        for key in keys:
+            cache.write(key, payload)
+        cache.flush()
+        write_s = time.perf_counter() - start
+        cache.close()
+
+        cache = open_cache(backend, root)
+        start = time.perf_counter()
+        for key in keys:
+            assert cache.read(key) is not None
+        read_s = time.perf_counter() - start
+        cache.close()
+
+        return {
+            "backend": backend,
+            "write_ops_s": entries / write_s,
+            "read_ops_s": entries / read_s,
+            "disk_bytes": dir_bytes(root),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--value-bytes", type=int, default=200)
+    args = parser.parse_args()
+    print(f"{'backend':<8} {'write/s':>12} {'read/s':>12} {'disk':>12}")
+    for kind in CacheBackendKind:
+        r = bench(kind.value, args.entries, args.value_bytes)
+        print(
+            f"{r['backend']:<8} {r['write_ops_s']:>12.0f} {r['read_ops_s']:>12.0f} "
+            f"{r['disk_bytes']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare the binary cache entry format with plain JSON entries.
+
+Encodes representative tool responses (small dicts, large triple lists and
+long text payloads) both ways and reports the stored size and the time to
+decode an entry::
+
+    python -m benchmarks.cache_format --repeat 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from symphonia.runtime.cache import _stable_dumps
+from symphonia.runtime.cache_format import DEFAULT_CODEC, DEFAULT_COMPRESSION, decode_entry, encode_entry
+
+PAYLOADS: Dict[str, Any] = {
+    "small": {"mentions": ["Ada Lovelace", "London"], "ok": True},
+    "triples": {
+        "triples": [
+            {"s": f"entity:{i}", "p": "related_to", "o": f"entity:{i * 7 % 1000}", "score": 0.5}
+            for i in range(2000)
+        ]
+    },
+    "text": {"text": "The quick brown fox jumps over the lazy dog. " * 2000},
+}
+
+
+def _time_decode(fn, blob: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(blob)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    print(f"codec={DEFAULT_CODEC.name} compression={DEFAULT_COMPRESSION.name}")
+    print(f"{'payload':<8} {'json B':>10} {'binary B':>10} {'saved':>7} {'json us':>10} {'binary us':>10}")
+    for name, payload in PAYLOADS.items():
+        legacy = _stable_dumps(payload).encode()
+        binary = encode_entry(payload)
+        json_us = _time_decode(json.loads, legacy, args.repeat)
+        bin_us = _time_decode(decode_entry, binary, args.repeat)
+        saved = 1 - len(binary) / len(legacy)
+        print(
+            f"{name:<8} {len(legacy):>10} {len(binary):>10} {saved:>6.0%} "
+            f"{json_us:>10.1f} {bin_us:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare tool-call latency over a Unix socket and TCP loopback.
+
+The same small echo tool is served by the reference servers on
+``127.0.0.1`` and on a Unix domain socket, then called repeatedly with a
+small payload::
+
+    python -m benchmarks.uds_latency --calls 2000
+
+Rows report p50/p99 latency in microseconds for ``HttpTool`` over TCP (one
+connection per call, as for ``http`` endpoints), a keep-alive TCP client
+(the fair transport-only comparison) and ``HttpTool`` over the socket.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import httpx
+
+from symphonia.registry.manifest import ToolManifest
+from symphonia.runtime.tools import HttpTool
+from symphonia.tools.server import ToolServer, UnixToolServer
+
+PAYLOAD = {"mention": "Ada Lovelace", "context": "wrote the first program"}
+
+
+def _tool(endpoint: str) -> HttpTool:
+    manifest = ToolManifest(
+        name="echo", version="v1", kind="http", input_schema={}, output_schema={}
+    )
+    manifest.endpoint = endpoint
+    return HttpTool(manifest)
+
+
+def latencies(call: Callable[[], object], calls: int, warmup: int = 50) -> List[float]:
+    for _ in range(warmup):
+        call()
+    out = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        call()
+        out.append((time.perf_counter() - t0) * 1e6)
+    return out
+
+
+def _row(label: str, samples: List[float]) -> None:
+    q = statistics.quantiles(samples, n=100)
+    print(f"{label:28s} {q[49]:10.1f} {q[98]:10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    echo = lambda p: p  # noqa: E731
+    with tempfile.TemporaryDirectory() as tmp, ToolServer(echo) as tcp, UnixToolServer(
+        echo, Path(tmp) / "echo.sock"
+    ) as uds:
+        tcp_tool, uds_tool = _tool(tcp.url), _tool(uds.url)
+        print(f"{'transport':28s} {'p50 µs':>10s} {'p99 µs':>10s}")
+        _row("tcp, connection per call", latencies(lambda: tcp_tool.invoke(PAYLOAD), args.calls))
+        with httpx.Client() as client:
+            _row(
+                "tcp, keep-alive",
+                latencies(lambda: client.post(tcp.url, json=PAYLOAD).json(), args.calls),
+            )
+        _row("unix socket", latencies(lambda: uds_tool.invoke(PAYLOAD), args.calls))
+
+
+if __name__ == "__main__":
+    main()
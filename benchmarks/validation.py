@@ -0,0 +1,84 @@
+"""Compare per-call schema validation cost for a registry's manifests.
+
+For every manifest the input and output schemas are validated against a
+small synthetic instance with each available engine::
+
+    python -m benchmarks.validation registry/manifests --calls 20000
+
+``jsonschema`` is the interpretive ``Draft7Validator`` the tools used
+before; ``codegen`` is the built-in compiler and ``fastjsonschema`` is
+reported when that package is installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.validation import compile_schema, fastjsonschema
+
+_SAMPLES = {
+    "string": "Ada Lovelace wrote the first program.",
+    "integer": 3,
+    "number": 0.5,
+    "boolean": True,
+    "null": None,
+}
+
+
+def sample_instance(schema: Dict[str, Any]) -> Any:
+    """Build a small instance satisfying the common keywords of *schema*."""
+
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = kind[0]
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {name: sample_instance(sub) for name, sub in props.items()}
+    if kind == "array":
+        items = schema.get("items")
+        return [sample_instance(items) for _ in range(3)] if isinstance(items, dict) else []
+    return _SAMPLES[kind]
+
+
+def time_call(validate: Any, instance: Any, calls: int) -> float:
+    """Mean microseconds per ``validate(instance)``."""
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        validate(instance)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("registry")
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    engines = ["jsonschema", "codegen"] + (["fastjsonschema"] if fastjsonschema else [])
+    registry = Registry(args.registry)
+    print(f"{'schema':40s}" + "".join(f"{e:>16s}" for e in engines) + "  (µs/call)")
+    for fqdn in sorted(registry.summary()):
+        manifest = registry.resolve(fqdn)
+        for side, schema in (("in", manifest.input_schema), ("out", manifest.output_schema)):
+            instance = sample_instance(schema)
+            row = f"{fqdn + ' ' + side:40s}"
+            for engine in engines:
+                try:
+                    validate = compile_schema(schema, engine)
+                except NotImplementedError:
+                    row += f"{'n/a':>16s}"
+                    continue
+                row += f"{time_call(validate, instance, args.calls):16.2f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
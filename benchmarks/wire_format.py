@@ -0,0 +1,78 @@
+"""Compare JSON and msgpack tool calls against the reference server.
+
+An echo tool returning its ``triples`` input is served locally by
+:class:`~symphonia.tools.server.ToolServer` and called through
+:class:`~symphonia.runtime.tools.HttpTool` for several payload sizes::
+
+    python -m benchmarks.wire_format --sizes 10 1000 10000 --seconds 2
+
+For each wire format the throughput and the CPU time per call are printed.
+The server runs in the same process, so CPU covers both ends of the call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from symphonia.registry.manifest import ToolManifest
+from symphonia.runtime import wire
+from symphonia.runtime.tools import HttpTool
+from symphonia.tools.server import ToolServer
+
+
+def triples(n: int) -> List[Dict[str, Any]]:
+    return [
+        {"subject": f"entity:{i}", "predicate": "related_to", "object": f"entity:{i + 1}"}
+        for i in range(n)
+    ]
+
+
+def measure(tool: HttpTool, payload: Dict[str, Any], seconds: float) -> Dict[str, float]:
+    calls = 0
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    while time.perf_counter() - wall0 < seconds:
+        tool.invoke(payload)
+        calls += 1
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+    return {"calls_per_s": calls / wall, "cpu_ms_per_call": cpu / calls * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    formats = [("json", False)]
+    if wire.msgpack is not None:
+        formats += [("msgpack", False), ("msgpack", True)]
+    else:
+        print("msgpack not installed; only JSON is measured")
+
+    with ToolServer(lambda p: {"triples": p["triples"]}) as server:
+        print(f"{'triples':>8s} {'format':>14s} {'calls/s':>10s} {'cpu ms/call':>12s}")
+        for size in args.sizes:
+            payload = {"triples": triples(size)}
+            for fmt, compress in formats:
+                manifest = ToolManifest(
+                    name="echo",
+                    version="v1",
+                    kind="http",
+                    endpoint=server.url,
+                    input_schema={},
+                    output_schema={},
+                    wire_format=fmt,
+                    wire_compress=compress,
+                )
+                result = measure(HttpTool(manifest), payload, args.seconds)
+                label = fmt + ("+gzip" if compress else "")
+                print(
+                    f"{size:8d} {label:>14s} {result['calls_per_s']:10.1f}"
+                    f" {result['cpu_ms_per_call']:12.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
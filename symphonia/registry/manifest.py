@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -16,9 +16,19 @@ class ToolManifest:
     input_schema: Dict[str, Any]
     output_schema: Dict[str, Any]
     endpoint: Optional[str] = None
+    endpoints: List[str] | None = None
     entrypoint: Optional[str] = None
     model: Dict[str, Any] | None = None
     tags: list[str] | None = None
+    cache_ttl_s: Optional[float] = None
+    canonicalize: Dict[str, List[str]] | None = None
+    canonicalize_invoke: bool = False
+    validate_input: str = "always"
+    validate_output: str = "always"
+    batch_endpoint: Optional[str] = None
+    max_batch_size: int = 32
+    wire_format: str = "json"
+    wire_compress: bool = False
 
     @property
     def fqdn(self) -> str:
@@ -5,12 +5,21 @@ from __future__ import annotations
 import json
 import hashlib
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from jsonschema import Draft7Validator
 
 from .manifest import ToolManifest
+from ..runtime.canonical import check_rules
 from ..runtime.errors import RegistryError
+from ..runtime.validation import parse_mode
+from ..runtime import transport
+from ..runtime.health import (
+    DEFAULT_HEALTH_CONCURRENCY,
+    DEFAULT_HEALTH_TIMEOUT_S,
+    check_health,
+)
+from ..runtime.wire import WIRE_FORMATS
 from ..runtime.constants import LoaderType, ADAPTER_URI_SCHEMES
 
 
@@ -34,8 +43,19 @@ class Registry:
             if key in self._manifests:
                 raise RegistryError(f"duplicate manifest for {key}")
             if manifest.kind == "http":
-                if not manifest.endpoint or not manifest.endpoint.startswith("http"):
+                endpoints = manifest.endpoints or [manifest.endpoint]
+                if not all(transport.valid_endpoint(e) for e in endpoints):
                     raise RegistryError(f"http tool {key} missing valid endpoint")
+                batch = manifest.batch_endpoint
+                relative = bool(manifest.endpoints) and (batch or "").startswith("/")
+                if batch and not (transport.valid_endpoint(batch) or relative):
+                    raise RegistryError(f"http tool {key} has an invalid batch_endpoint")
+                if manifest.max_batch_size < 1:
+                    raise RegistryError(f"http tool {key} max_batch_size must be >= 1")
+                if manifest.wire_format not in WIRE_FORMATS:
+                    raise RegistryError(
+                        f"http tool {key} has unknown wire_format {manifest.wire_format}"
+                    )
             elif manifest.kind == "inproc":
                 if not manifest.entrypoint:
                     raise RegistryError(f"inproc tool {key} missing entrypoint")
@@ -54,6 +74,16 @@ class Registry:
                     raise RegistryError("Unsupported scheme for adapter_uri")
             Draft7Validator.check_schema(manifest.input_schema)
             Draft7Validator.check_schema(manifest.output_schema)
+            if manifest.canonicalize:
+                try:
+                    check_rules(manifest.canonicalize)
+                except ValueError as exc:
+                    raise RegistryError(f"{key}: {exc}") from exc
+            for mode in (manifest.validate_input, manifest.validate_output):
+                try:
+                    parse_mode(mode)
+                except ValueError as exc:
+                    raise RegistryError(f"{key}: {exc}") from exc
             self._manifests[key] = manifest
 
     # ------------------------------------------------------------------
@@ -99,20 +129,38 @@ class Registry:
         return hashlib.sha256(blob.encode()).hexdigest()
 
     # ------------------------------------------------------------------
-    def health(self, base_url: str | None = None) -> Dict[str, bool]:
-        import httpx
+    def health(
+        self,
+        base_url: str | None = None,
+        *,
+        max_age_s: float = 0.0,
+        timeout_s: float = DEFAULT_HEALTH_TIMEOUT_S,
+        concurrency: int = DEFAULT_HEALTH_CONCURRENCY,
+    ) -> Dict[str, bool]:
+        """Probe every HTTP tool's ``/health``; replicated tools need one up.
+
+        Endpoints are probed concurrently and the results cached for
+        preflight and replica routing; results younger than *max_age_s* are
+        reused instead of probing again.
+        """
 
-        results: Dict[str, bool] = {}
+        targets: Dict[str, List[str]] = {}
         for key, manifest in self._manifests.items():
-            if manifest.kind == "http" and manifest.endpoint:
-                url = manifest.endpoint
-                if base_url:
-                    url = url.replace("http://localhost", base_url.rstrip("/"))
-                try:
-                    resp = httpx.get(f"{url}/health", timeout=2.0)
-                    results[key] = resp.status_code == 200
-                except Exception:  # pragma: no cover - network issues
-                    results[key] = False
-            else:
-                results[key] = True
-        return results
+            urls = manifest.endpoints or ([manifest.endpoint] if manifest.endpoint else [])
+            if manifest.kind == "http" and urls and base_url:
+                urls = [
+                    u if transport.is_unix(u)
+                    else u.replace("http://localhost", base_url.rstrip("/"))
+                    for u in urls
+                ]
+            targets[key] = urls if manifest.kind == "http" else []
+        status = check_health(
+            (u for urls in targets.values() for u in urls),
+            max_age_s=max_age_s,
+            timeout_s=timeout_s,
+            concurrency=concurrency,
+        )
+        return {
+            key: any(status[u] for u in urls) if urls else True
+            for key, urls in targets.items()
+        }
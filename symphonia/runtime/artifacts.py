@@ -3,10 +3,13 @@ from __future__ import annotations
 import datetime as _dt
 import json
 from pathlib import Path
-from typing import Any, Dict, Iterable
+from typing import Any, Dict
 from uuid import uuid4
 
 from ..sdk.plan_ir import Plan
+from .constants import RunStatus
+from .errors import EngineError
+from .run_index import RunIndex, dir_bytes
 
 
 class RunArtifacts:
@@ -15,18 +18,28 @@ class RunArtifacts:
     The helper owns the on-disk directory structure for a run.  When a
     ``run_id`` is supplied the corresponding directory will be reused
     (allowing resumption); otherwise a new run identifier is generated.
+    Existing runs are located through the :class:`RunIndex` stored under the
+    runs root; the date directories are only scanned when a supplied run_id
+    misses the index.
     """
 
     def __init__(self, root: str | Path = "runs", run_id: str | None = None) -> None:
         self.root_base = Path(root)
+        self.index = RunIndex(self.root_base)
+        # Runs are grouped by date for easier browsing.  A supplied run_id is
+        # looked up in the index, falling back to a scan of the date
+        # directories for runs the index never saw (e.g. copied in after it
+        # was created); a generated one is new, so neither is needed.
+        existing: Path | None = None
         if run_id is None:
             run_id = uuid4().hex[:8]
-        # Runs are grouped by date for easier browsing.  When resuming we
-        # search for an existing directory with the supplied run_id.
-        candidates: Iterable[Path] = self.root_base.glob(f"*/{run_id}")
-        try:
-            self.root = next(iter(candidates))
-        except StopIteration:
+        else:
+            existing = self.index.lookup(run_id)
+            if existing is None:
+                existing = next(iter(self.root_base.glob(f"*/{run_id}")), None)
+        if existing is not None:
+            self.root = existing
+        else:
             date_dir = _dt.date.today().isoformat()
             self.root = self.root_base / date_dir / run_id
         self.run_id = run_id
@@ -36,6 +49,8 @@ class RunArtifacts:
         self.root.mkdir(parents=True, exist_ok=True)
         self.nodes_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        if not self.index.register(run_id, self.root):
+            raise EngineError(f"run {run_id} is being deleted by garbage collection")
         self.paths: Dict[str, Any] = {"root": str(self.root), "nodes": {}}
 
     # ------------------------------------------------------------------
@@ -92,6 +107,8 @@ class RunArtifacts:
     def write_run_info(self, info: Dict[str, Any]) -> None:
         path = self.root / "run.json"
         self._write(path, info)
+        indexed = ("created_at", "inputs_hash", "registry_hash")
+        self.index.update(self.run_id, **{k: info[k] for k in indexed if k in info})
 
     # ------------------------------------------------------------------
     def read_run_info(self) -> Dict[str, Any] | None:
@@ -111,3 +128,10 @@ class RunArtifacts:
     def write_summary(self, summary: Dict[str, Any]) -> None:
         path = self.root / "summary.json"
         self._write(path, summary)
+        self.index.update(
+            self.run_id,
+            status=(RunStatus.OK if summary.get("ok") else RunStatus.FAILED).value,
+            stop_reason=summary.get("stop_reason"),
+            total_ms=summary.get("totals", {}).get("total_ms"),
+            bytes=dir_bytes(self.root),
+        )
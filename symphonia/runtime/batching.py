@@ -0,0 +1,85 @@
+"""Coalesce concurrent calls to a tool into batch requests.
+
+Nodes calling the same tool become ready together far more often than not
+(one node per mention, per chunk, per candidate ...).  A
+:class:`MicroBatcher` sits in front of a tool with a batch endpoint: calls
+submitted while others are pending are collected for a short window and sent
+with a single :meth:`~symphonia.runtime.tools.HttpTool.invoke_batch`.  A call
+with nothing to batch with goes through the tool's plain ``invoke``, and
+each item's output or error is delivered back to the node that submitted it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from .errors import ToolCallError, copies_of
+
+DEFAULT_BATCH_WAIT_MS = 2.0
+
+
+class MicroBatcher:
+    """Batch ``invoke`` calls of *tool* arriving within *wait_ms*."""
+
+    def __init__(self, tool: Any, *, wait_ms: float = DEFAULT_BATCH_WAIT_MS):
+        self.tool = tool
+        self.max_batch_size = max(1, tool.manifest.max_batch_size or 1)
+        self.wait_s = wait_ms / 1000.0
+        self.counters: Dict[str, int] = {"batches": 0, "batched_calls": 0, "single_calls": 0}
+        self._pending: List[Tuple[dict, float | None, asyncio.Future]] = []
+        self._flush: asyncio.TimerHandle | None = None
+        self._tasks: set = set()
+
+    # ------------------------------------------------------------------
+    async def invoke(self, payload: dict, timeout_ms: int | None = None) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        timeout_s = timeout_ms / 1000.0 if timeout_ms else None
+        self._pending.append((payload, timeout_s, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._flush is None:
+            self._flush = loop.call_later(self.wait_s, self._dispatch)
+        return await future
+
+    # ------------------------------------------------------------------
+    def _dispatch(self) -> None:
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    # ------------------------------------------------------------------
+    async def _run(self, batch: List[Tuple[dict, float | None, asyncio.Future]]) -> None:
+        timeouts = [t for _, t, _ in batch if t is not None]
+        timeout_s = min(timeouts) if timeouts else None
+        payloads = [p for p, _, _ in batch]
+        try:
+            if len(batch) == 1:
+                self.counters["single_calls"] += 1
+                single = await asyncio.to_thread(self.tool.invoke, payloads[0], timeout_s)
+                results: List[Any] = [single]
+            else:
+                self.counters["batches"] += 1
+                self.counters["batched_calls"] += len(batch)
+                results = await asyncio.to_thread(self.tool.invoke_batch, payloads, timeout_s)
+        except Exception as exc:  # noqa: BLE001 - delivered to every caller
+            results = copies_of(exc, len(batch))
+        if len(results) != len(batch):
+            mismatch = ToolCallError(
+                status=None, message=f"batch returned {len(results)} results for {len(batch)} calls"
+            )
+            results = copies_of(mismatch, len(batch))
+        for (_, _, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,9 +1,40 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Protocol, Set, Tuple
+
+from .cache_format import Codec, decode_entry, deserialize, encode_entry, serialize
+from .canonical import canonicalize
+from .db import connect
+from .state import State, interpolate, key_view
+
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+CACHE_INDEX_FILE = "index.sqlite"
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    atime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_atime ON entries(atime);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, bytes) VALUES (0, 0);
+"""
+
+
+def _now() -> float:
+    return time.time()
 
 
 def _stable_dumps(obj: Any) -> str:
@@ -24,60 +55,621 @@ def cache_key(
     return hashlib.sha256(blob.encode()).hexdigest()
 
 
-class SimpleCache:
-    """Very small JSON-on-disk cache used for testing.
+# Manifest fields that tune caching, checking or transport rather than what
+# a tool computes; they are left out of the manifest hash so changing them
+# keeps the entries.
+_CACHE_NEUTRAL_FIELDS = frozenset(
+    {
+        "cache_ttl_s",
+        "validate_input",
+        "validate_output",
+        "batch_endpoint",
+        "max_batch_size",
+        "wire_format",
+        "wire_compress",
+        "endpoints",
+    }
+)
+# Fields added after the cache shipped; hashed only when set so manifests
+# that do not use them keep their existing keys.
+_HASHED_WHEN_SET = frozenset({"canonicalize", "canonicalize_invoke"})
+
+
+def manifest_hash(manifest: Any) -> str:
+    """Hash of the fields of *manifest* that affect a tool's output."""
+
+    fields = {
+        k: v
+        for k, v in vars(manifest).items()
+        if k not in _CACHE_NEUTRAL_FIELDS and (v or k not in _HASHED_WHEN_SET)
+    }
+    return hashlib.sha256(_stable_dumps(fields).encode()).hexdigest()
+
+
+def _has_refs(view: Any) -> bool:
+    if isinstance(view, dict):
+        return "$node" in view or "$template" in view or any(map(_has_refs, view.values()))
+    if isinstance(view, list):
+        return any(map(_has_refs, view))
+    return False
+
+
+def canonical_cache_key(
+    manifest: Any,
+    inputs: Dict[str, Any],
+    state: State | None = None,
+    manifest_digest: str | None = None,
+) -> Tuple[str, bool]:
+    """:func:`node_cache_key` plus whether the ``canonicalize`` rules changed
+    the inputs.
+
+    Fields with rules that refer to other nodes are keyed by their resolved,
+    canonical value instead of the upstream hash, so the key agrees with
+    the canonical inputs the tool is invoked with.
+    """
+
+    view = key_view(inputs, state) if state is not None else inputs
+    rules = getattr(manifest, "canonicalize", None)
+    changed = False
+    if rules:
+        view = dict(view)
+        for field in view:
+            if ("*" in rules or field in rules) and _has_refs(view[field]):
+                view[field] = interpolate(inputs[field], state)
+        canonical = canonicalize(view, rules)
+        changed, view = canonical != view, canonical
+    key = cache_key(
+        manifest.name, manifest.version, view, manifest_digest or manifest_hash(manifest)
+    )
+    return key, changed
+
+
+def node_cache_key(
+    manifest: Any,
+    inputs: Dict[str, Any],
+    state: State | None = None,
+    manifest_digest: str | None = None,
+    *,
+    canonical: bool = True,
+) -> str:
+    """Cache key for invoking *manifest* with a node's plan-level *inputs*.
+
+    With a *state*, references to other nodes are keyed by the content hash
+    of the referenced output (see :func:`~symphonia.runtime.state.key_view`)
+    rather than by the value itself; without one *inputs* must already be
+    resolved.  The manifest's ``canonicalize`` rules are applied unless
+    *canonical* is false.  Pass *manifest_digest* to reuse a memoized
+    :func:`manifest_hash`.
+    """
+
+    if canonical:
+        return canonical_cache_key(manifest, inputs, state, manifest_digest)[0]
+    view = key_view(inputs, state) if state is not None else inputs
+    return cache_key(
+        manifest.name, manifest.version, view, manifest_digest or manifest_hash(manifest)
+    )
+
+
+ENTRY_TAG = "__symphonia_cache__"
+
+
+def pack_entry(value: Any, *, tool: str, ms: int) -> Dict[str, Any]:
+    """Wrap a tool response with the metadata used for TTLs and statistics.
+
+    ``ms`` is the latency of the original call, i.e. the time a later hit
+    saves, ``bytes`` the size of the serialized response and ``sha256`` its
+    content hash, which seeds the state hash of the node on a hit.
+    """
+
+    blob = _stable_dumps(value).encode()
+    return {
+        ENTRY_TAG: 1,
+        "tool": tool,
+        "created_at": _now(),
+        "ms": ms,
+        "bytes": len(blob),
+        "sha256": hashlib.sha256(blob).hexdigest(),
+        "value": value,
+    }
+
+
+def unpack_entry(raw: Any) -> Tuple[Any, Dict[str, Any]]:
+    """Split a stored entry into ``(value, meta)``.
+
+    Entries written before metadata was recorded are returned as-is with
+    empty metadata.
+    """
+
+    if isinstance(raw, dict) and raw.get(ENTRY_TAG) == 1:
+        meta = {k: v for k, v in raw.items() if k not in (ENTRY_TAG, "value")}
+        return raw["value"], meta
+    return raw, {}
+
+
+def entry_expired(meta: Dict[str, Any], ttl_s: float | None) -> bool:
+    """Whether an entry with *meta* is older than *ttl_s*.
+
+    Entries without a creation time predate TTL support and count as
+    expired whenever a TTL applies.
+    """
+
+    if ttl_s is None:
+        return False
+    return "created_at" not in meta or time.time() - meta["created_at"] > ttl_s
 
-    The implementation is intentionally tiny but includes a couple of
-    characteristics that are important for the runtime:
 
-    * Writes are atomic – data is written to a ``.tmp`` file and then
-      atomically renamed over the target path to avoid torn writes.
-    * A size cap (``max_bytes``) can be supplied; when the cache grows
-      beyond the limit the oldest entries are evicted in a basic LRU
-      manner.
+class CacheBackend(Protocol):
+    """Storage engine for the node result cache.
 
-    The cache stores each entry as ``<key>.json`` containing a JSON
-    document.  Keys are assumed to already be content addressed.
+    Keys are content addressed hex digests (see :func:`cache_key`); values
+    are JSON-compatible tool responses.
     """
 
+    def read(self, key: str) -> Any | None: ...
+
+    def write(self, key: str, data: Any) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def prune(self, max_bytes: int | None = None, max_age_s: float | None = None) -> int: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class SimpleCache:
+    """JSON-on-disk cache with a sharded layout and an LRU index.
+
+    Characteristics that are important for the runtime:
+
+    * Entries are stored as ``<root>/<key[:2]>/<key>.json`` so no single
+      directory grows beyond a few thousand files.  Flat ``<key>.json``
+      entries written by older versions are moved into shards the first
+      time the index is created.
+    * Writes are atomic – data is written to a per-writer ``.tmp`` file and
+      then atomically renamed over the target path to avoid torn writes.
+    * Entries use the compact binary format of
+      :mod:`~symphonia.runtime.cache_format` (the ``.json`` suffix is kept
+      for layout compatibility); plain JSON entries still read back.
+    * ``index.sqlite`` records each entry's size and last access time plus
+      the running total, so enforcing ``max_bytes`` is a lookup of the
+      least recently *used* entries on an indexed column (``O(log n)`` per
+      eviction) instead of a scan of the directory.  Reads refresh recency;
+      the updates are buffered and flushed with the next write.
+    * Several processes may share one cache: index updates run in SQLite
+      transactions and a reader racing an eviction simply sees a miss.
+      A write renames its file into place inside the transaction that
+      indexes it, so an eviction never runs between the two and leaves a
+      row without a file; :meth:`prune` also drops rows whose file is gone.
+    """
+
+    TOUCH_FLUSH = 256
+
     def __init__(self, root: Path, max_bytes: int | None = None):
-        self.root = root
+        self.root = Path(root)
         self.max_bytes = max_bytes
         self.root.mkdir(parents=True, exist_ok=True)
+        index_path = self.root / CACHE_INDEX_FILE
+        fresh = not index_path.exists()
+        self._db = connect(index_path)
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._db.executescript(_CACHE_SCHEMA)
+        if fresh:
+            self._adopt_flat_entries()
 
     # ------------------------------------------------------------------
     def _path(self, key: str) -> Path:
-        return self.root / f"{key}.json"
+        return self.root / key[:2] / f"{key}.json"
+
+    # ------------------------------------------------------------------
+    def _adopt_flat_entries(self) -> None:
+        for legacy in self.root.glob("*.json"):
+            key = legacy.stem
+            target = self._path(key)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                st = legacy.stat()
+                legacy.replace(target)
+            except FileNotFoundError:  # pragma: no cover - race safe
+                continue
+            with self._lock:
+                self._begin()
+                self._index_entry(key, st.st_size, st.st_mtime)
+                self._db.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    def _begin(self) -> None:
+        self._db.execute("BEGIN IMMEDIATE")
+        if self._touched:
+            self._db.executemany(
+                "UPDATE entries SET atime = ? WHERE key = ?",
+                [(atime, key) for key, atime in self._touched.items()],
+            )
+            self._touched.clear()
+
+    # ------------------------------------------------------------------
+    def _index_entry(self, key: str, size: int, atime: float) -> None:
+        row = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        old = row["size"] if row else 0
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (key, size, atime) VALUES (?, ?, ?)",
+            (key, size, atime),
+        )
+        self._db.execute("UPDATE totals SET bytes = bytes + ? WHERE id = 0", (size - old,))
+
+    # ------------------------------------------------------------------
+    def _evict(self, rows: List[Any]) -> int:
+        reclaimed = 0
+        for row in rows:
+            try:
+                self._path(row["key"]).unlink()
+            except FileNotFoundError:  # pragma: no cover - race safe
+                pass
+            reclaimed += row["size"]
+        self._db.executemany("DELETE FROM entries WHERE key = ?", [(r["key"],) for r in rows])
+        self._db.execute("UPDATE totals SET bytes = bytes - ? WHERE id = 0", (reclaimed,))
+        return reclaimed
+
+    # ------------------------------------------------------------------
+    def total_bytes(self) -> int:
+        return self._db.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()["bytes"]
 
     # ------------------------------------------------------------------
     def read(self, key: str) -> Any | None:
-        path = self._path(key)
-        if not path.exists():
+        try:
+            blob = self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._touched[key] = _now()
+            if len(self._touched) >= self.TOUCH_FLUSH:
+                self._begin()
+                self._db.execute("COMMIT")
+        try:
+            return decode_entry(blob)
+        except ValueError:  # written by a newer version or missing codec
             return None
-        return json.loads(path.read_text())
 
     # ------------------------------------------------------------------
     def write(self, key: str, data: Any) -> None:
         path = self._path(key)
-        tmp = path.with_suffix(".tmp")
-        tmp.write_text(_stable_dumps(data))
-        tmp.replace(path)
-        if self.max_bytes is not None:
-            self._enforce_size()
+        path.parent.mkdir(exist_ok=True)
+        blob = encode_entry(data)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(blob)
+        with self._lock:
+            self._begin()
+            try:
+                tmp.replace(path)
+                self._index_entry(key, len(blob), _now())
+                if self.max_bytes is not None:
+                    self._enforce_size_locked(self.max_bytes)
+            finally:
+                self._db.execute("COMMIT")
 
     # ------------------------------------------------------------------
-    def _enforce_size(self) -> None:
-        """Delete oldest files until the cache fits ``max_bytes``."""
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._begin()
+            try:
+                row = self._db.execute(
+                    "SELECT key, size FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._evict([row])
+                else:
+                    self._path(key).unlink(missing_ok=True)
+            finally:
+                self._db.execute("COMMIT")
 
-        files = sorted(
-            [p for p in self.root.glob("*.json") if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-        )
-        total = sum(p.stat().st_size for p in files)
-        while total > (self.max_bytes or 0) and files:
-            victim = files.pop(0)
-            total -= victim.stat().st_size
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        """Persist buffered access times."""
+
+        with self._lock:
+            self._begin()
+            self._db.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    # ------------------------------------------------------------------
+    def _enforce_size_locked(self, max_bytes: int) -> int:
+        reclaimed = 0
+        total = self.total_bytes()
+        while total > max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM entries ORDER BY atime LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            # Only evict as many of the oldest entries as needed.
+            victims = []
+            excess = total - max_bytes
+            for row in rows:
+                victims.append(row)
+                excess -= row["size"]
+                if excess <= 0:
+                    break
+            freed = self._evict(victims)
+            reclaimed += freed
+            total -= freed
+        return reclaimed
+
+    # ------------------------------------------------------------------
+    def _drop_missing_locked(self) -> None:
+        """Forget index rows whose file was removed behind the cache's back."""
+
+        rows = self._db.execute("SELECT key, size FROM entries").fetchall()
+        gone = [row for row in rows if not self._path(row["key"]).exists()]
+        if gone:
+            self._evict(gone)
+
+    # ------------------------------------------------------------------
+    def prune(self, max_bytes: int | None = None, max_age_s: float | None = None) -> int:
+        """Evict entries not used within *max_age_s*, then the least recently
+        used entries until the cache fits *max_bytes*.  Returns the number of
+        bytes reclaimed."""
+
+        reclaimed = 0
+        with self._lock:
+            self._begin()
             try:
-                victim.unlink()
-            except FileNotFoundError:  # pragma: no cover - race safe
-                pass
+                self._drop_missing_locked()
+                if max_age_s is not None:
+                    rows = self._db.execute(
+                        "SELECT key, size FROM entries WHERE atime < ?",
+                        (_now() - max_age_s,),
+                    ).fetchall()
+                    reclaimed += self._evict(rows)
+                if max_bytes is not None:
+                    reclaimed += self._enforce_size_locked(max_bytes)
+            finally:
+                self._db.execute("COMMIT")
+        return reclaimed
+
+
+class MemoryCache:
+    """Bounded in-process LRU tier holding serialized cache entries.
+
+    Entries are kept in their serialized form and decoded on every read, so
+    each reader gets its own copy and mutating it cannot corrupt the cached
+    value.  The budget is expressed in serialized bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Codec, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def read(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return deserialize(entry[1], entry[0])
+
+    # ------------------------------------------------------------------
+    def write(self, key: str, data: Any) -> None:
+        codec, payload = serialize(data)
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old[1])
+            self._entries[key] = (codec, payload)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+
+    # ------------------------------------------------------------------
+    def delete(self, key: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old[1])
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    def prune(self, max_bytes: int | None = None, max_age_s: float | None = None) -> int:
+        return 0
+
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        pass
+
+
+_MEMORY_TIERS: Dict[str, MemoryCache] = {}
+_MEMORY_TIERS_LOCK = threading.Lock()
+
+
+def shared_memory_cache(root: Path, max_bytes: int) -> MemoryCache:
+    """Return the process-wide memory tier for the cache stored at *root*.
+
+    Sharing the tier across :func:`run_plan` calls lets long-lived processes
+    (batch drivers, servers) serve hot keys without touching disk.
+    """
+
+    key = str(Path(root).resolve())
+    with _MEMORY_TIERS_LOCK:
+        tier = _MEMORY_TIERS.get(key)
+        if tier is None:
+            tier = _MEMORY_TIERS[key] = MemoryCache(max_bytes)
+        tier.max_bytes = max_bytes
+        return tier
+
+
+class TieredCache:
+    """Chain of named cache tiers with read-through/write-through semantics.
+
+    Reads consult the tiers front to back and promote a hit into every tier
+    in front of the one that served it; writes go to all tiers.  Hits and
+    misses are counted per tier for the lifetime of this object, so the
+    engine creates one per run even when the tiers themselves are shared.
+    """
+
+    def __init__(self, tiers: List[Tuple[str, Any]]):
+        self.tiers = tiers
+        self._stats = {name: {"hits": 0, "misses": 0} for name, _ in tiers}
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    def _count(self, name: str, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[name][outcome] += 1
+
+    # ------------------------------------------------------------------
+    def read(
+        self,
+        key: str,
+        *,
+        start: int = 0,
+        stop: int | None = None,
+        ttl_s: float | None = None,
+    ) -> Any | None:
+        """Read *key* from tiers ``start:stop``.
+
+        A hit is promoted into every tier in front of the serving one,
+        including tiers before *start*, so a read may be split into a quick
+        pass over the in-process tiers and a slower pass over the rest.
+        Entries older than *ttl_s* count as misses and are never promoted; a
+        deeper tier may still hold a fresh copy.  If none does, the first
+        expired entry is returned so callers can tell expiry from a miss.
+        """
+
+        expired = None
+        for pos in range(start, len(self.tiers) if stop is None else stop):
+            name, tier = self.tiers[pos]
+            data = tier.read(key)
+            if data is None or entry_expired(unpack_entry(data)[1], ttl_s):
+                self._count(name, "misses")
+                expired = data if expired is None else expired
+                continue
+            self._count(name, "hits")
+            for _, upper in self.tiers[:pos]:
+                upper.write(key, data)
+            return data
+        return expired
+
+    # ------------------------------------------------------------------
+    def write(self, key: str, data: Any, *, start: int = 0, stop: int | None = None) -> None:
+        for _, tier in self.tiers[start:stop]:
+            tier.write(key, data)
+
+    # ------------------------------------------------------------------
+    def in_process_tiers(self) -> int:
+        """Number of leading tiers that live in process memory."""
+
+        count = 0
+        for _, tier in self.tiers:
+            if not isinstance(tier, MemoryCache):
+                break
+            count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    def delete(self, key: str) -> None:
+        for _, tier in self.tiers:
+            tier.delete(key)
+
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return hits, misses and hit ratio per tier.
+
+        Tiers exposing a ``counters`` mapping (e.g. upload counts of the
+        remote tier) have it merged into their entry.
+        """
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, tier in self.tiers:
+            counts = self._stats[name]
+            total = counts["hits"] + counts["misses"]
+            out[name] = dict(counts, hit_ratio=counts["hits"] / total if total else 0.0)
+            out[name].update(getattr(tier, "counters", {}))
+        return out
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Close every tier; later calls do nothing."""
+
+        if self._closed:
+            return
+        self._closed = True
+        for _, tier in self.tiers:
+            tier.close()
+
+
+DEFAULT_CACHE_IO_CONCURRENCY = 8
+
+
+class AsyncCache:
+    """Event-loop front end for a :class:`TieredCache`.
+
+    In-process tiers are consulted inline since they never block; the
+    remaining tiers are read on worker threads (at most *max_concurrency*
+    operations at once) so a slow disk or network mount does not stall the
+    event loop.  Writes update the in-process tiers immediately and the
+    others in the background; :meth:`drain` waits for them.  A failed
+    background write is counted in :attr:`write_errors` and otherwise
+    ignored – the entry is simply not cached.
+    """
+
+    def __init__(self, cache: TieredCache, max_concurrency: int = DEFAULT_CACHE_IO_CONCURRENCY):
+        self.cache = cache
+        self.write_errors = 0
+        self._fast = cache.in_process_tiers()
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._writes: Set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------
+    async def read(self, key: str, ttl_s: float | None = None) -> Any | None:
+        data = self.cache.read(key, stop=self._fast, ttl_s=ttl_s)
+        fresh = data is not None and not entry_expired(unpack_entry(data)[1], ttl_s)
+        if fresh or self._fast == len(self.cache.tiers):
+            return data
+        async with self._sem:
+            deeper = await asyncio.to_thread(
+                self.cache.read, key, start=self._fast, ttl_s=ttl_s
+            )
+        return data if deeper is None else deeper
+
+    # ------------------------------------------------------------------
+    def write(self, key: str, data: Any) -> None:
+        self.cache.write(key, data, stop=self._fast)
+        if self._fast < len(self.cache.tiers):
+            task = asyncio.ensure_future(self._write_slow(key, data))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    # ------------------------------------------------------------------
+    async def _write_slow(self, key: str, data: Any) -> None:
+        async with self._sem:
+            try:
+                await asyncio.to_thread(self.cache.write, key, data, start=self._fast)
+            except Exception:
+                self.write_errors += 1
+
+    # ------------------------------------------------------------------
+    async def drain(self) -> None:
+        """Wait for all background writes to finish."""
+
+        while self._writes:
+            await asyncio.gather(*list(self._writes))
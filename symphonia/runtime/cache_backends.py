@@ -0,0 +1,585 @@
+"""Single-file cache backends for large numbers of small entries.
+
+:class:`~symphonia.runtime.cache.SimpleCache` stores one file per key, which
+is easy to inspect but pays an ``open``/``close`` and an inode per entry.
+The backends here keep every entry inside one file:
+
+* :class:`SQLiteCache` – a WAL-mode SQLite table of ``key → entry`` with
+  batched commits and an indexed LRU column.
+* :class:`MmapCache` – an append-only log read through ``mmap``, in the
+  spirit of LMDB.  Writers append under an exclusive file lock; readers map
+  the file and follow other processes' appends by rescanning the tail.
+
+:class:`RemoteCache` is not a local store but a shared tier on any
+``fsspec`` filesystem (object storage, NFS, ``memory://`` in tests) that
+several workers read through and upload to in the background.
+
+:func:`open_cache` selects a backend by name; see
+:class:`~symphonia.runtime.constants.CacheBackendKind`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import fsspec
+
+try:  # pragma: no cover - not available on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+from . import cache as _cache
+from .cache import CacheBackend, SimpleCache, TieredCache, shared_memory_cache
+from .cache_format import decode_entry, encode_entry
+from .constants import CacheBackendKind
+from .errors import CacheError
+from .db import connect
+
+SQLITE_FILE = "cache.sqlite"
+MMAP_FILE = "cache.mmap"
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    atime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_atime ON entries(atime);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_ins AFTER INSERT ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_upd AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_del AFTER DELETE ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+"""
+
+
+class SQLiteCache:
+    """Cache stored as rows of a single SQLite database.
+
+    Writes are buffered and committed in batches of ``batch_size`` (and on
+    :meth:`flush`/:meth:`close`), trading a small window of durability – it
+    is only a cache – for far fewer commits.  Buffered entries are visible
+    to reads from the same instance immediately.
+    """
+
+    def __init__(self, root: Path, max_bytes: int | None = None, batch_size: int = 64):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self._db = connect(self.root / SQLITE_FILE)
+        self._db.executescript(_SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, bytes] = {}
+        self._touched: Dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    def read(self, key: str) -> Any | None:
+        with self._lock:
+            blob = self._pending.get(key)
+            if blob is None:
+                row = self._db.execute(
+                    "SELECT value FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                blob = row["value"]
+                self._touched[key] = _cache._now()
+        try:
+            return decode_entry(blob)
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    def write(self, key: str, data: Any) -> None:
+        with self._lock:
+            self._pending[key] = encode_entry(data)
+            if len(self._pending) >= self.batch_size:
+                self._commit_locked()
+
+    # ------------------------------------------------------------------
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            self._touched.pop(key, None)
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    # ------------------------------------------------------------------
+    def _commit_locked(self) -> None:
+        now = _cache._now()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany(
+                "INSERT INTO entries (key, value, size, atime) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET value = excluded.value,"
+                " size = excluded.size, atime = excluded.atime",
+                [(k, v, len(v), now) for k, v in self._pending.items()],
+            )
+            self._db.executemany(
+                "UPDATE entries SET atime = ? WHERE key = ?",
+                [(t, k) for k, t in self._touched.items()],
+            )
+            if self.max_bytes is not None:
+                self._evict_locked(self.max_bytes, None)
+        finally:
+            self._db.execute("COMMIT")
+        self._pending.clear()
+        self._touched.clear()
+
+    # ------------------------------------------------------------------
+    def _evict_locked(self, max_bytes: int | None, max_age_s: float | None) -> int:
+        before = self.total_bytes()
+        if max_age_s is not None:
+            self._db.execute("DELETE FROM entries WHERE atime < ?", (_cache._now() - max_age_s,))
+        if max_bytes is not None:
+            while self.total_bytes() > max_bytes:
+                rows = self._db.execute(
+                    "SELECT key FROM entries ORDER BY atime LIMIT 64"
+                ).fetchall()
+                if not rows:
+                    break
+                self._db.executemany(
+                    "DELETE FROM entries WHERE key = ?", [(r["key"],) for r in rows]
+                )
+        return before - self.total_bytes()
+
+    # ------------------------------------------------------------------
+    def total_bytes(self) -> int:
+        return self._db.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()["bytes"]
+
+    # ------------------------------------------------------------------
+    def prune(self, max_bytes: int | None = None, max_age_s: float | None = None) -> int:
+        with self._lock:
+            self._commit_locked()
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                return self._evict_locked(max_bytes, max_age_s)
+            finally:
+                self._db.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending or self._touched:
+                self._commit_locked()
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+
+# Record layout of the mmap log: magic, key length, value length, CRC32 of
+# the value and the write time.  A value length of ``_TOMBSTONE`` marks a
+# deleted key.
+_REC = struct.Struct("<4sIIId")
+_MAGIC = b"SYM1"
+_TOMBSTONE = 0xFFFFFFFF
+
+
+class MmapCache:
+    """Append-only single-file log read through a memory map.
+
+    Every write appends ``header + key + value`` to ``cache.mmap`` under an
+    exclusive ``flock``; an in-memory index maps keys to value offsets.  Reads
+    slice the memory map without copying the file, and a miss rescans only
+    the bytes appended since the last scan so entries written by other
+    processes become visible.  :meth:`prune` compacts the log, keeping the
+    most recently written entries that fit the budget; other processes notice
+    the replaced file and rebuild their index.
+    """
+
+    def __init__(self, root: Path, max_bytes: int | None = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / MMAP_FILE
+        self.path.touch(exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._closed = False
+        self._reset()
+
+    # ------------------------------------------------------------------
+    def _reset(self) -> None:
+        self._index: Dict[str, Tuple[int, int, float]] = {}
+        self._scanned = 0
+        self._ino = self.path.stat().st_ino
+        self._map: mmap.mmap | None = None
+        self._mapped = 0
+
+    # ------------------------------------------------------------------
+    def _record_at(self, view: memoryview, pos: int) -> Tuple[str, int, int, float, int] | None:
+        """Parse the record at *pos* as ``(key, offset, length, ts, end)``.
+
+        Returns ``None`` for an incomplete record, bad magic, a key that is
+        not UTF-8 or a value whose CRC32 does not match.
+        """
+
+        if pos + _REC.size > self._mapped:
+            return None
+        magic, klen, vlen, crc, ts = _REC.unpack_from(view, pos)
+        start = pos + _REC.size
+        end = start + klen + (0 if vlen == _TOMBSTONE else vlen)
+        if magic != _MAGIC or end > self._mapped:
+            return None
+        try:
+            key = bytes(view[start : start + klen]).decode()
+        except UnicodeDecodeError:
+            return None
+        if vlen != _TOMBSTONE and zlib.crc32(view[start + klen : end]) != crc:
+            return None
+        return key, start + klen, vlen, ts, end
+
+    # ------------------------------------------------------------------
+    def _resync(self, view: memoryview, pos: int) -> int | None:
+        """Offset of the first valid record after the bad one at *pos*."""
+
+        nxt = self._map.find(_MAGIC, pos + 1)  # type: ignore[union-attr]
+        while nxt != -1:
+            if self._record_at(view, nxt) is not None:
+                return nxt
+            nxt = self._map.find(_MAGIC, nxt + 1)  # type: ignore[union-attr]
+        return None
+
+    # ------------------------------------------------------------------
+    def _tail_is_garbage(self, flocked: bool) -> bool:
+        """Whether an unreadable tail was left by a crashed writer.
+
+        Writers append whole records under an exclusive lock, so once a
+        shared lock is granted and the file has not grown, nobody is still
+        writing the tail.
+        """
+
+        if flocked:
+            return True
+        if fcntl is None:
+            return False
+        with self.path.open("rb") as fh:
+            fcntl.flock(fh, fcntl.LOCK_SH)
+            try:
+                st = os.fstat(fh.fileno())
+                return st.st_ino == self._ino and st.st_size == self._mapped
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    def _refresh_locked(self, flocked: bool = False) -> None:
+        """Index the records appended since the last scan.
+
+        Corrupt records – e.g. a header torn by a crashed writer – are
+        skipped by resyncing on the next valid record; a corrupt tail is
+        skipped once no writer can still be appending to it, so later
+        appends after it stay readable.  *flocked* means the caller holds
+        the exclusive file lock.
+        """
+
+        st = self.path.stat()
+        if st.st_ino != self._ino:
+            if self._map is not None:
+                self._map.close()
+            self._reset()
+        if st.st_size == self._scanned:
+            return
+        if self._map is not None:
+            self._map.close()
+        with self.path.open("rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = len(self._map)
+        pos = self._scanned
+        with memoryview(self._map) as view:
+            while pos < self._mapped:
+                record = self._record_at(view, pos)
+                if record is None:
+                    nxt = self._resync(view, pos)
+                    if nxt is None:
+                        if self._tail_is_garbage(flocked):
+                            pos = self._mapped
+                        break
+                    pos = nxt
+                    continue
+                key, offset, length, ts, pos = record
+                if length == _TOMBSTONE:
+                    self._index.pop(key, None)
+                else:
+                    self._index[key] = (offset, length, ts)
+        self._scanned = pos
+
+    # ------------------------------------------------------------------
+    def read(self, key: str) -> Any | None:
+        with self._lock:
+            if self._closed:
+                return None
+            loc = self._index.get(key)
+            if loc is None:
+                self._refresh_locked()
+                loc = self._index.get(key)
+                if loc is None:
+                    return None
+            offset, length, _ = loc
+            blob = self._map[offset : offset + length]  # type: ignore[index]
+        try:
+            return decode_entry(blob)
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    def _append(self, records: List[Tuple[str, bytes | None]]) -> None:
+        chunks = []
+        now = _cache._now()
+        for key, value in records:
+            kb = key.encode()
+            if value is None:
+                chunks.append(_REC.pack(_MAGIC, len(kb), _TOMBSTONE, 0, now) + kb)
+            else:
+                header = _REC.pack(_MAGIC, len(kb), len(value), zlib.crc32(value), now)
+                chunks.append(header + kb + value)
+        while True:
+            with self.path.open("ab") as fh:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    # A prune may have replaced the file while we waited for
+                    # the lock; appending to the unlinked one would lose data.
+                    if os.fstat(fh.fileno()).st_ino != self.path.stat().st_ino:
+                        continue
+                    fh.write(b"".join(chunks))
+                    fh.flush()
+                    return
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(fh, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    def write(self, key: str, data: Any) -> None:
+        self._append([(key, encode_entry(data))])
+        if self.max_bytes is not None and self.path.stat().st_size > self.max_bytes:
+            self.prune(max_bytes=self.max_bytes // 2)
+
+    # ------------------------------------------------------------------
+    def delete(self, key: str) -> None:
+        self._append([(key, None)])
+        with self._lock:
+            self._index.pop(key, None)
+
+    # ------------------------------------------------------------------
+    def prune(self, max_bytes: int | None = None, max_age_s: float | None = None) -> int:
+        cutoff = _cache._now() - max_age_s if max_age_s is not None else None
+        with self._lock, self.path.open("rb+") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            self._refresh_locked(flocked=True)
+            before = self.path.stat().st_size
+            live = sorted(self._index.items(), key=lambda kv: kv[1][2], reverse=True)
+            kept: List[Tuple[str, bytes, float]] = []
+            total = 0
+            for key, (offset, length, ts) in live:
+                if cutoff is not None and ts < cutoff:
+                    continue
+                size = _REC.size + len(key.encode()) + length
+                if max_bytes is not None and total + size > max_bytes:
+                    continue
+                kept.append((key, bytes(self._map[offset : offset + length]), ts))  # type: ignore[index]
+                total += size
+            tmp = self.path.with_name(f"{MMAP_FILE}.{os.getpid()}.tmp")
+            with tmp.open("wb") as out:
+                for key, value, ts in reversed(kept):
+                    kb = key.encode()
+                    out.write(_REC.pack(_MAGIC, len(kb), len(value), zlib.crc32(value), ts))
+                    out.write(kb + value)
+            tmp.replace(self.path)
+            if self._map is not None:
+                self._map.close()
+            self._reset()
+        return max(0, before - total)
+
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+
+class RemoteCache:
+    """Shared cache tier on an ``fsspec`` filesystem.
+
+    Entries live at ``<url>/<key[:2]>/<key>.json`` in the same encoding as
+    the local backends.  Keys are content addressed, so an existing object is
+    only replaced by an entry created after it – e.g. when the engine
+    recomputes an expired entry – and concurrent uploads of the same key from
+    different workers are harmless.
+    Writes are queued on a small thread pool and do not block the caller;
+    :meth:`flush` waits for them.  Remote failures never fail a run – reads
+    degrade to misses and failed uploads are counted in :attr:`counters`.
+    """
+
+    def __init__(self, url: str, max_workers: int = 4):
+        self.url = url.rstrip("/")
+        self.fs, self.base = fsspec.core.url_to_fs(self.url)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-upload")
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self.counters = {"uploads": 0, "upload_errors": 0, "read_errors": 0}
+
+    # ------------------------------------------------------------------
+    def _path(self, key: str) -> str:
+        return f"{self.base}/{key[:2]}/{key}.json"
+
+    # ------------------------------------------------------------------
+    def read(self, key: str) -> Any | None:
+        try:
+            blob = self.fs.cat_file(self._path(key))
+        except FileNotFoundError:
+            return None
+        except Exception:  # pragma: no cover - depends on the remote
+            with self._lock:
+                self.counters["read_errors"] += 1
+            return None
+        try:
+            return decode_entry(blob)
+        except ValueError:  # partially visible upload on non-atomic stores
+            return None
+
+    # ------------------------------------------------------------------
+    def _superseded(self, path: str, created_at: float | None) -> bool:
+        """Whether the object at *path* is missing or older than *created_at*.
+
+        Only the object's metadata is fetched: it was stored no earlier than
+        the entry it holds was created, so a modification time before
+        *created_at* means the new entry is newer.
+        """
+
+        try:
+            modified = self.fs.modified(path).timestamp()
+        except FileNotFoundError:
+            return True
+        except NotImplementedError:  # pragma: no cover - store without mtimes
+            return created_at is not None or not self.fs.exists(path)
+        return created_at is not None and modified < created_at
+
+    # ------------------------------------------------------------------
+    def _upload(self, key: str, blob: bytes, created_at: float | None) -> None:
+        path = self._path(key)
+        try:
+            if self._superseded(path, created_at):
+                self.fs.makedirs(path.rsplit("/", 1)[0], exist_ok=True)
+                self.fs.pipe_file(path, blob)
+                with self._lock:
+                    self.counters["uploads"] += 1
+        except Exception:
+            with self._lock:
+                self.counters["upload_errors"] += 1
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    # ------------------------------------------------------------------
+    def write(self, key: str, data: Any) -> None:
+        blob = encode_entry(data)
+        created_at = _cache.unpack_entry(data)[1].get("created_at")
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending[key] = self._pool.submit(self._upload, key, blob, created_at)
+
+    # ------------------------------------------------------------------
+    def delete(self, key: str) -> None:
+        self.flush()
+        try:
+            self.fs.rm_file(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------
+    def prune(self, max_bytes: int | None = None, max_age_s: float | None = None) -> int:
+        """Remote retention is left to the store (e.g. bucket lifecycle rules)."""
+
+        return 0
+
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        with self._lock:
+            pending = list(self._pending.values())
+        for fut in pending:
+            fut.result()
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self.flush()
+        self._pool.shutdown(wait=True)
+
+
+CACHE_BACKENDS = {
+    CacheBackendKind.FILE: SimpleCache,
+    CacheBackendKind.SQLITE: SQLiteCache,
+    CacheBackendKind.MMAP: MmapCache,
+}
+
+_MARKERS = {
+    CacheBackendKind.FILE: _cache.CACHE_INDEX_FILE,
+    CacheBackendKind.SQLITE: SQLITE_FILE,
+    CacheBackendKind.MMAP: MMAP_FILE,
+}
+
+
+def open_cache(
+    backend: CacheBackendKind | str, root: Path, max_bytes: int | None = None
+) -> CacheBackend:
+    """Instantiate the cache *backend* stored under *root*."""
+
+    try:
+        kind = CacheBackendKind(backend)
+    except ValueError as exc:
+        choices = ", ".join(k.value for k in CacheBackendKind)
+        raise CacheError(f"unknown cache backend {backend!r} (choose {choices})") from exc
+    return CACHE_BACKENDS[kind](Path(root), max_bytes=max_bytes)
+
+
+def detect_backends(root: Path) -> List[CacheBackendKind]:
+    """Return the backends that have data stored under *root*."""
+
+    return [kind for kind, marker in _MARKERS.items() if (Path(root) / marker).exists()]
+
+
+def open_tiered_cache(
+    cache_dir: Path,
+    *,
+    backend: CacheBackendKind | str | None = None,
+    remote: str | None = None,
+    memory_bytes: int = 0,
+) -> TieredCache:
+    """Assemble the engine's cache: memory → *backend* on disk → *remote*.
+
+    The memory tier is the process-wide one for *cache_dir* and is omitted
+    when *memory_bytes* is ``0``; *backend* defaults to ``file``.
+    """
+
+    tiers: List[Tuple[str, Any]] = []
+    if memory_bytes:
+        tiers.append(("memory", shared_memory_cache(cache_dir, memory_bytes)))
+    tiers.append(("disk", open_cache(backend or CacheBackendKind.FILE, cache_dir)))
+    if remote:
+        tiers.append(("remote", RemoteCache(remote)))
+    return TieredCache(tiers)
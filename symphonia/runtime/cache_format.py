@@ -0,0 +1,173 @@
+"""Versioned on-disk encoding of cache entries.
+
+An encoded entry starts with a six byte header::
+
+    b"SYC" | version (1 byte) | codec (1 byte) | compression (1 byte)
+
+followed by the serialized payload.  The codec is the fastest serializer
+available (``orjson``, then ``msgpack``, then the stdlib ``json`` module)
+and payloads larger than :data:`COMPRESS_THRESHOLD` bytes are compressed
+with ``zstandard`` or ``lz4`` when installed and ``zlib`` otherwise.  The
+header records both choices so entries stay readable by any process that
+has the same libraries, and entries without the header – plain JSON written
+by older versions – are decoded as before.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from enum import IntEnum
+from typing import Any, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None  # type: ignore
+
+MAGIC = b"SYC"
+FORMAT_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 3
+COMPRESS_THRESHOLD = 1024
+
+
+class Codec(IntEnum):
+    JSON = 0
+    ORJSON = 1
+    MSGPACK = 2
+
+
+class Compression(IntEnum):
+    NONE = 0
+    ZLIB = 1
+    ZSTD = 2
+    LZ4 = 3
+
+
+class CacheFormatError(ValueError):
+    """Raised when an entry cannot be decoded (unknown format or corrupt payload)."""
+
+
+def _default_codec() -> Codec:
+    if orjson is not None:
+        return Codec.ORJSON
+    if msgpack is not None:
+        return Codec.MSGPACK
+    return Codec.JSON
+
+
+def _default_compression() -> Compression:
+    if zstandard is not None:
+        return Compression.ZSTD
+    if lz4_frame is not None:
+        return Compression.LZ4
+    return Compression.ZLIB
+
+
+DEFAULT_CODEC = _default_codec()
+DEFAULT_COMPRESSION = _default_compression()
+
+
+def _serialize(data: Any, codec: Codec) -> Tuple[Codec, bytes]:
+    if codec is Codec.ORJSON:
+        try:
+            return codec, orjson.dumps(data)
+        except TypeError:  # e.g. integers beyond 64 bits; fall back below
+            codec = Codec.JSON
+    if codec is Codec.MSGPACK:
+        return codec, msgpack.packb(data, use_bin_type=True)
+    return Codec.JSON, json.dumps(data, separators=(",", ":")).encode()
+
+
+def serialize(data: Any, codec: Codec = DEFAULT_CODEC) -> Tuple[Codec, bytes]:
+    """Serialize *data* without header or compression; returns the codec used."""
+
+    return _serialize(data, codec)
+
+
+def deserialize(payload: bytes, codec: Codec) -> Any:
+    """Inverse of :func:`serialize`."""
+
+    if codec is Codec.ORJSON:
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    if codec is Codec.MSGPACK:
+        if msgpack is None:
+            raise CacheFormatError("msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
+
+def _compress(payload: bytes, compression: Compression) -> bytes:
+    if compression is Compression.ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    if compression is Compression.LZ4:
+        return lz4_frame.compress(payload)
+    return zlib.compress(payload, 1)
+
+
+def _decompress(payload: bytes, compression: Compression) -> bytes:
+    if compression is Compression.NONE:
+        return payload
+    if compression is Compression.ZLIB:
+        return zlib.decompress(payload)
+    if compression is Compression.ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if compression is Compression.LZ4 and lz4_frame is not None:
+        return lz4_frame.decompress(payload)
+    raise CacheFormatError(f"compression {compression.name} is not available")
+
+
+def encode_entry(
+    data: Any,
+    *,
+    codec: Codec = DEFAULT_CODEC,
+    compression: Compression = DEFAULT_COMPRESSION,
+    threshold: int = COMPRESS_THRESHOLD,
+) -> bytes:
+    """Serialize *data* into the versioned binary entry format."""
+
+    codec, payload = _serialize(data, codec)
+    used = Compression.NONE
+    if len(payload) > threshold and compression is not Compression.NONE:
+        compressed = _compress(payload, compression)
+        if len(compressed) < len(payload):
+            payload, used = compressed, compression
+    return MAGIC + bytes((FORMAT_VERSION, codec, used)) + payload
+
+
+def decode_entry(blob: bytes) -> Any:
+    """Decode an entry written by :func:`encode_entry` or a legacy JSON entry."""
+
+    if not blob.startswith(MAGIC):
+        return json.loads(blob)
+    if len(blob) < HEADER_SIZE:
+        raise CacheFormatError("truncated cache entry header")
+    version, codec_id, compression_id = blob[len(MAGIC) : HEADER_SIZE]
+    if version != FORMAT_VERSION:
+        raise CacheFormatError(f"unsupported cache entry version {version}")
+    try:
+        codec = Codec(codec_id)
+        compression = Compression(compression_id)
+    except ValueError as exc:
+        raise CacheFormatError(str(exc)) from exc
+    try:
+        return deserialize(_decompress(blob[HEADER_SIZE:], compression), codec)
+    except CacheFormatError:
+        raise
+    except Exception as exc:  # zlib.error, zstd/lz4/msgpack errors, bad JSON
+        raise CacheFormatError(f"corrupt cache entry: {exc}") from exc
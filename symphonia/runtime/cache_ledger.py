@@ -0,0 +1,164 @@
+"""Persistent per-tool cache statistics and key ownership.
+
+Cache keys are opaque digests, so nothing in a cache backend says which tool
+an entry belongs to.  The ledger (``<cache>/ledger.sqlite``) records the
+owning tool of every key the engine writes, which makes tool-scoped
+invalidation (``cache purge --tool``) possible, and accumulates hits, misses,
+expirations, bytes served and call time saved per tool fqdn across runs.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from . import cache as _cache
+from .cache_backends import RemoteCache, detect_backends, open_cache
+from .db import connect
+
+LEDGER_FILE = "ledger.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keys (
+    key TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keys_tool ON keys(tool);
+CREATE TABLE IF NOT EXISTS tool_stats (
+    tool TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    expired INTEGER NOT NULL DEFAULT 0,
+    writes INTEGER NOT NULL DEFAULT 0,
+    bytes_served INTEGER NOT NULL DEFAULT 0,
+    ms_saved INTEGER NOT NULL DEFAULT 0,
+    canonicalized INTEGER NOT NULL DEFAULT 0,
+    canonical_hits INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+COUNTERS = (
+    "hits",
+    "misses",
+    "expired",
+    "writes",
+    "bytes_served",
+    "ms_saved",
+    "canonicalized",
+    "canonical_hits",
+)
+
+# Counters added after the first release of the ledger; ``_migrate`` adds
+# them to databases created by older versions.
+_ADDED_COLUMNS = ("canonicalized", "canonical_hits")
+
+
+class CacheLedger:
+    """SQLite ledger stored next to the cache entries."""
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+        self._db = connect(self.cache_dir / LEDGER_FILE)
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+
+    # ------------------------------------------------------------------
+    def _migrate(self) -> None:
+        have = {row["name"] for row in self._db.execute("PRAGMA table_info(tool_stats)")}
+        for column in _ADDED_COLUMNS:
+            if column not in have:
+                self._db.execute(
+                    f"ALTER TABLE tool_stats ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                )
+
+    # ------------------------------------------------------------------
+    def record(
+        self, keys: Iterable[Tuple[str, str]], counters: Dict[str, Dict[str, int]]
+    ) -> None:
+        """Add written ``(key, tool)`` pairs and per-tool counter deltas."""
+
+        now = _cache._now()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO keys (key, tool, created_at) VALUES (?, ?, ?)",
+                [(key, tool, now) for key, tool in keys],
+            )
+            for tool, delta in counters.items():
+                self._db.execute("INSERT OR IGNORE INTO tool_stats (tool) VALUES (?)", (tool,))
+                self._db.execute(
+                    "UPDATE tool_stats SET "
+                    + ", ".join(f"{c} = {c} + ?" for c in COUNTERS)
+                    + " WHERE tool = ?",
+                    [int(delta.get(c, 0)) for c in COUNTERS] + [tool],
+                )
+        finally:
+            self._db.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    def keys_for(self, tool: str) -> List[str]:
+        """Keys owned by *tool*: an exact fqdn or a bare name (all versions)."""
+
+        rows = self._db.execute(
+            "SELECT key FROM keys WHERE tool = ? OR tool LIKE ? ESCAPE '\\'",
+            (tool, tool.replace("_", "\\_").replace("%", "\\%") + ".%"),
+        ).fetchall()
+        return [r["key"] for r in rows]
+
+    # ------------------------------------------------------------------
+    def forget(self, keys: List[str]) -> None:
+        self._db.executemany("DELETE FROM keys WHERE key = ?", [(k,) for k in keys])
+
+    # ------------------------------------------------------------------
+    def tool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the accumulated counters per tool plus the hit ratio.
+
+        ``canonical_hits`` are hits on lookups whose key was changed by the
+        tool's canonicalization rules – an upper bound on the hits those
+        rules gained.
+        """
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for row in self._db.execute("SELECT * FROM tool_stats ORDER BY tool"):
+            stats = {c: row[c] for c in COUNTERS}
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+            out[row["tool"]] = stats
+        return out
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self._db.close()
+
+
+def purge_tool(cache_dir: str | Path, tool: str, *, remote: str | None = None) -> int:
+    """Delete every cache entry written for *tool*; return the entry count.
+
+    Entries are removed from all local backends found under *cache_dir*, from
+    this process's shared memory tier and, when given, from the *remote*
+    tier.  Entries written before the ledger existed cannot be attributed to
+    a tool and are left alone.
+    """
+
+    cache_dir = Path(cache_dir)
+    ledger = CacheLedger(cache_dir)
+    try:
+        keys = ledger.keys_for(tool)
+        backends: List[Any] = [open_cache(kind, cache_dir) for kind in detect_backends(cache_dir)]
+        memory = _cache._MEMORY_TIERS.get(str(cache_dir.resolve()))
+        if memory is not None:
+            backends.append(memory)
+        if remote:
+            backends.append(RemoteCache(remote))
+        try:
+            for key in keys:
+                for backend in backends:
+                    backend.delete(key)
+        finally:
+            for backend in backends:
+                backend.close()
+        ledger.forget(keys)
+    finally:
+        ledger.close()
+    return len(keys)
@@ -0,0 +1,82 @@
+"""Input canonicalization rules declared in tool manifests.
+
+A manifest may declare, next to its ``input_schema``, which transformations
+leave the tool's output unchanged::
+
+    "canonicalize": {"text": ["strip", "nfc", "collapse_whitespace"],
+                     "labels": ["lowercase", "sort_array"]}
+
+Keys are top-level input fields (``"*"`` applies to every field).  The
+rules are applied to the inputs before the cache key is computed so inputs
+differing only in those respects share an entry; with
+``canonicalize_invoke`` the tool is also called with the canonical inputs.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import unicodedata
+from typing import Any, Callable, Dict, List
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _sort_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _strings(fn: Callable[[str], str]) -> Callable[[Any], Any]:
+    def apply(value: Any) -> Any:
+        if isinstance(value, str):
+            return fn(value)
+        if isinstance(value, list):
+            return [apply(v) for v in value]
+        if isinstance(value, dict):
+            return {k: apply(v) for k, v in value.items()}
+        return value
+
+    return apply
+
+
+def _sort_array(value: Any) -> Any:
+    if isinstance(value, list):
+        return sorted(value, key=_sort_key)
+    return value
+
+
+RULES: Dict[str, Callable[[Any], Any]] = {
+    "strip": _strings(str.strip),
+    "nfc": _strings(lambda s: unicodedata.normalize("NFC", s)),
+    "lowercase": _strings(str.lower),
+    "collapse_whitespace": _strings(lambda s: _WS_RE.sub(" ", s)),
+    "sort_array": _sort_array,
+}
+
+
+def check_rules(rules: Dict[str, List[str]]) -> None:
+    """Raise ``ValueError`` for rule names that do not exist."""
+
+    for field, names in rules.items():
+        unknown = [n for n in names if n not in RULES]
+        if unknown:
+            raise ValueError(f"unknown canonicalize rules {unknown} for {field}")
+
+
+def canonicalize(inputs: Dict[str, Any], rules: Dict[str, List[str]] | None) -> Dict[str, Any]:
+    """Return *inputs* with *rules* applied; the input mapping is not mutated.
+
+    Rules run in the declared order, ``"*"`` rules before field rules.
+    Values must be resolved: cache keys resolve references to other nodes
+    in ruled fields before calling this (see
+    :func:`~symphonia.runtime.cache.canonical_cache_key`).
+    """
+
+    if not rules:
+        return inputs
+    out = dict(inputs)
+    for field, value in inputs.items():
+        for name in rules.get("*", []) + rules.get(field, []):
+            value = RULES[name](value)
+        out[field] = value
+    return out
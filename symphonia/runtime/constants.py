@@ -42,3 +42,23 @@ STUB_BASE_ID = "stub"
 
 
 STOP_REASON_PREFLIGHT = "error:Preflight"
+
+
+class RunStatus(str, Enum):
+    """Lifecycle states recorded in the run index."""
+
+    RUNNING = "running"
+    OK = "ok"
+    FAILED = "failed"
+    DELETING = "deleting"
+
+
+RUN_INDEX_FILE = "index.sqlite"
+
+
+class CacheBackendKind(str, Enum):
+    """Storage engines available for the node result cache."""
+
+    FILE = "file"
+    SQLITE = "sqlite"
+    MMAP = "mmap"
@@ -0,0 +1,27 @@
+"""Small SQLite helpers shared by the on-disk runtime indexes."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+BUSY_TIMEOUT_S = 30.0
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open *path* configured for concurrent use by several processes.
+
+    WAL journaling lets readers proceed while another process writes and the
+    busy timeout makes writers wait for each other instead of failing.  The
+    connection may be used from several threads; callers that share one
+    serialize access themselves.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(path), timeout=BUSY_TIMEOUT_S, isolation_level=None, check_same_thread=False
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
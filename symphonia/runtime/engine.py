@@ -1,11 +1,12 @@
 """Async execution engine for Symphonia.
 
 This module provides :func:`run_plan` which executes a plan described by the
-:class:`~symphonia.sdk.plan_ir.Plan` dataclass.  The implementation is a
-light-weight orchestrator supporting parallel execution, retries with
-exponential backoff, a tiny on-disk cache and the ability to resume interrupted
-runs.  The goal of the implementation is not to be feature complete but to
-provide the behaviour required by the tests in this kata.
+:class:`~symphonia.sdk.plan_ir.Plan` dataclass.  Ready nodes run concurrently
+with retries and exponential backoff; tool responses go through a tiered cache
+(memory, a pluggable disk backend and an optional remote tier) with TTLs and
+canonical keys; pending calls to batch-capable tools are coalesced; and
+interrupted runs can be resumed from their artifacts.  Everything a run does
+is recorded in its metrics and the run index.
 """
 
 from __future__ import annotations
@@ -21,7 +22,22 @@ from typing import Any, Callable, Dict, List, Tuple
 from ..sdk.plan_ir import Node, Plan, RetryPolicy
 from ..registry.registry import Registry
 from .artifacts import RunArtifacts
-from .cache import SimpleCache, cache_key, _stable_dumps
+from .batching import MicroBatcher
+from .cache import (
+    DEFAULT_CACHE_IO_CONCURRENCY,
+    DEFAULT_MEMORY_CACHE_BYTES,
+    AsyncCache,
+    TieredCache,
+    canonical_cache_key,
+    entry_expired,
+    manifest_hash,
+    pack_entry,
+    unpack_entry,
+    _stable_dumps,
+)
+from .cache_backends import open_tiered_cache
+from .cache_ledger import COUNTERS as LEDGER_COUNTERS, CacheLedger
+from .canonical import canonicalize
 from .concurrency import ConcurrencyManager
 from .errors import (
     BudgetError,
@@ -33,8 +49,12 @@ from .errors import (
 from .retry import RetryMatcher, backoff_delays
 from .state import State, extract_jsonpath, interpolate
 from .tools import Tool, InprocTool
+from . import transport
+from .replicas import replica_counters
+from .validation import validation_counters
 from .model_loader import ModelLoader
-from .preflight import preflight_build_tool_pool
+from .preflight import DEFAULT_PREFLIGHT_CONCURRENCY, preflight_build_tool_pool
+from .retention import RetentionPolicy, collect_garbage
 from .constants import STOP_REASON_PREFLIGHT
 
 
@@ -63,13 +83,32 @@ async def run_plan_async(
     cache_write: bool = True,
     loader: ModelLoader | None = None,
     warmup: bool = True,
+    retention: RetentionPolicy | None = None,
+    cache_memory_bytes: int = DEFAULT_MEMORY_CACHE_BYTES,
+    cache_backend: str | None = None,
+    cache_remote: str | None = None,
+    cache_io_concurrency: int = DEFAULT_CACHE_IO_CONCURRENCY,
+    preflight_concurrency: int = DEFAULT_PREFLIGHT_CONCURRENCY,
 ) -> Tuple[Dict, SymphoniaError | None]:
     """Execute *plan* asynchronously.
 
-    Returns a tuple ``(summary, error)`` where ``summary`` contains basic
-    run information and ``error`` is ``None`` on success or the terminal
-    :class:`SymphoniaError` if the run failed.  The summary and metrics are
-    written to disk regardless of success or failure.
+    Returns ``(summary, error)``; *error* is ``None`` on success or the
+    terminal :class:`SymphoniaError`.  The summary, metrics and timeline are
+    written under *runs_dir* either way (see ``runtime/README.md`` for the
+    recorded metrics).
+
+    *impls* replaces tools by plain callables keyed by fqdn.  *run_id* names
+    the run directory, and an existing run is resumed when *resume* is set.
+    *max_parallel* overrides ``plan.execution.max_parallel``.
+    *cache_read* and *cache_write* switch cache lookups and stores.
+    *cache_memory_bytes* sizes the process-wide memory tier (``0`` disables
+    it).  *cache_backend* and *cache_remote* override
+    ``plan.execution.cache_backend`` and ``cache_remote``.
+    *cache_io_concurrency* caps disk and remote cache operations in flight.
+    In-proc models are loaded through *loader* with *warmup*, building up to
+    *preflight_concurrency* tools at once.  The run's model references are
+    released when it ends.  A *retention* policy garbage-collects older runs
+    and cache entries afterwards.
     """
 
     # ------------------------------------------------------------------
@@ -109,283 +148,388 @@ async def run_plan_async(
 
     start = time.perf_counter()
     loader = loader or ModelLoader()
+    cache: TieredCache | None = None
+    acache: AsyncCache | None = None
+    transport.hold_clients()
     try:
-        tool_pool = preflight_build_tool_pool(plan, registry, loader=loader, warmup=warmup)
-    except SymphoniaError as exc:
-        metrics["stop_reason"] = STOP_REASON_PREFLIGHT
-        artifacts.write_preflight_error(str(exc), exc.__class__.__name__)
-        total_ms = int((time.perf_counter() - start) * 1000)
-        metrics["total_ms"] = total_ms
-        artifacts.write_metrics(metrics)
-        artifacts.write_timeline(timeline)
-        summary = {
-            "run_id": artifacts.run_id,
-            "ok": False,
-            "stop_reason": metrics["stop_reason"],
-            "totals": {
-                "nodes": len(plan.graph),
-                "tool_calls": 0,
-                "cache_hits": 0,
-                "retries": 0,
-                "total_ms": total_ms,
-            },
-            "artifacts": artifacts.paths,
-        }
-        artifacts.write_summary(summary)
-        return summary, exc
-
-    for node in plan.graph:
-        data = artifacts.read_node_response(node.id)
-        if data:
-            response = data.get("data", {})
-            expose = {}
-            if node.out:
-                for k, path in node.out.items():
-                    expose[k] = extract_jsonpath(response, path)
-            else:
-                expose = response
-            state["nodes"][node.id] = expose
-            manifest = tool_pool[node.tool].manifest
-            cache_val: Any = (
-                "bypassed:side_effect" if "side_effecting" in (manifest.tags or []) else False
+        preflight: Dict[str, Dict[str, Any]] = {}
+        metrics["preflight"] = preflight
+        try:
+            tool_pool = preflight_build_tool_pool(
+                plan,
+                registry,
+                loader=loader,
+                warmup=warmup,
+                concurrency=preflight_concurrency,
+                timings=preflight,
             )
-            metrics["per_node"][node.id] = {
-                "ms": data.get("ms", 0),
-                "ok": True,
-                "cache": cache_val,
-                "retries": 0,
+        except SymphoniaError as exc:
+            metrics["stop_reason"] = STOP_REASON_PREFLIGHT
+            artifacts.write_preflight_error(str(exc), exc.__class__.__name__)
+            total_ms = int((time.perf_counter() - start) * 1000)
+            metrics["total_ms"] = total_ms
+            artifacts.write_metrics(metrics)
+            artifacts.write_timeline(timeline)
+            summary = {
+                "run_id": artifacts.run_id,
+                "ok": False,
+                "stop_reason": metrics["stop_reason"],
+                "totals": {
+                    "nodes": len(plan.graph),
+                    "tool_calls": 0,
+                    "cache_hits": 0,
+                    "retries": 0,
+                    "total_ms": total_ms,
+                },
+                "artifacts": artifacts.paths,
             }
-            timeline[node.id] = {"start_ms": 0, "end_ms": data.get("ms", 0)}
+            artifacts.write_summary(summary)
+            return summary, exc
 
-    if impls:
-        for key, func in impls.items():
-            if key in tool_pool:
-                tool_pool[key] = InprocTool(tool_pool[key].manifest, func)
+        for node in plan.graph:
+            data = artifacts.read_node_response(node.id)
+            if data:
+                response = data.get("data", {})
+                expose = {}
+                if node.out:
+                    for k, path in node.out.items():
+                        expose[k] = extract_jsonpath(response, path)
+                else:
+                    expose = response
+                state.set_node(node.id, expose, response=response, out=node.out)
+                manifest = tool_pool[node.tool].manifest
+                cache_val: Any = (
+                    "bypassed:side_effect" if "side_effecting" in (manifest.tags or []) else False
+                )
+                metrics["per_node"][node.id] = {
+                    "tool": node.tool,
+                    "ms": data.get("ms", 0),
+                    "ok": True,
+                    "cache": cache_val,
+                    "retries": 0,
+                    "resumed": True,
+                }
+                timeline[node.id] = {"start_ms": 0, "end_ms": data.get("ms", 0)}
 
-    # ------------------------------------------------------------------
-    max_parallel = (
-        max_parallel
-        or (plan.execution.max_parallel if plan.execution and plan.execution.max_parallel else 1)
-    )
-    mgr = ConcurrencyManager(max_parallel=max_parallel)
+        if impls:
+            for key, func in impls.items():
+                if key in tool_pool:
+                    tool_pool[key] = InprocTool(tool_pool[key].manifest, func)
 
-    cache_dir = Path(runs_dir) / "cache"
-    cache = SimpleCache(cache_dir)
-    cache_default = (
-        plan.execution.cache_default if plan.execution and plan.execution.cache_default is not None else False
-    )
-    retry_default = plan.execution.retry_default if plan.execution else None
-    deadline_at = (
-        start + plan.budget.deadline_ms / 1000.0
-        if plan.budget and plan.budget.deadline_ms
-        else None
-    )
+        # ------------------------------------------------------------------
+        max_parallel = max_parallel or (
+            plan.execution.max_parallel if plan.execution and plan.execution.max_parallel else 1
+        )
+        mgr = ConcurrencyManager(max_parallel=max_parallel)
+        validation_start = validation_counters(tool_pool.values())
+        replica_start = replica_counters(tool_pool.values())
+        batchers: Dict[str, MicroBatcher] = {
+            fqdn: MicroBatcher(tool)
+            for fqdn, tool in tool_pool.items()
+            if getattr(tool.manifest, "batch_endpoint", None) and hasattr(tool, "invoke_batch")
+        }
 
-    # ------------------------------------------------------------------
-    async def run_node(node: Node) -> None:
-        nonlocal metrics
+        cache_dir = Path(runs_dir) / "cache"
+        cache = open_tiered_cache(
+            cache_dir,
+            backend=cache_backend or (plan.execution.cache_backend if plan.execution else None),
+            remote=cache_remote or (plan.execution.cache_remote if plan.execution else None),
+            memory_bytes=cache_memory_bytes,
+        )
+        acache = AsyncCache(cache, cache_io_concurrency)
+        cache_counters: Dict[str, Dict[str, int]] = {}
+        manifest_hashes: Dict[str, str] = {}
+        cache_written: List[Tuple[str, str]] = []
+        cache_default = (
+            plan.execution.cache_default if plan.execution and plan.execution.cache_default is not None else False
+        )
+        retry_default = plan.execution.retry_default if plan.execution else None
+        deadline_at = (
+            start + plan.budget.deadline_ms / 1000.0
+            if plan.budget and plan.budget.deadline_ms
+            else None
+        )
 
-        if node.id in state["nodes"]:
-            return  # already completed via resume
+        # ------------------------------------------------------------------
+        async def run_node(node: Node) -> None:
+            nonlocal metrics
 
-        node_start = time.perf_counter()
-        start_ms = int((node_start - start) * 1000)
-        timeline[node.id] = {"start_ms": start_ms, "attempts": [start_ms]}
+            if node.id in state["nodes"]:
+                return  # already completed via resume
 
-        try:
-            inputs = interpolate(node.inputs, state)
-        except SchemaError as exc:
-            metrics["per_node"][node.id] = {"ms": 0, "ok": False, "retries": 0}
-            artifacts.write_node_error(node.id, str(exc))
-            raise
-
-        manifest = tool_pool[node.tool].manifest
-        side_effect = "side_effecting" in (manifest.tags or [])
-        use_cache = cache_read and (
-            (node.cache if node.cache is not None else cache_default) and not side_effect
-        )
-        cache_status: Any = "bypassed:side_effect" if side_effect else False
-
-        manifest_hash = _hash_blob(manifest.__dict__)
-        ck = cache_key(manifest.name, manifest.version, inputs, manifest_hash)
-        if use_cache:
-            cached = cache.read(ck)
-            if cached is not None:
-                metrics["cache_hits"] += 1
+            node_start = time.perf_counter()
+            start_ms = int((node_start - start) * 1000)
+            timeline[node.id] = {"start_ms": start_ms, "attempts": [start_ms]}
+
+            try:
+                inputs = interpolate(node.inputs, state)
+            except SchemaError as exc:
                 metrics["per_node"][node.id] = {
+                    "tool": node.tool,
                     "ms": 0,
-                    "ok": True,
-                    "cache": True,
+                    "ok": False,
                     "retries": 0,
                 }
-                timeline[node.id]["end_ms"] = timeline[node.id]["start_ms"]
-                expose = {}
-                if node.out:
-                    for k, path in node.out.items():
-                        expose[k] = extract_jsonpath(cached, path)
+                artifacts.write_node_error(node.id, str(exc))
+                raise
+
+            manifest = tool_pool[node.tool].manifest
+            side_effect = "side_effecting" in (manifest.tags or [])
+            use_cache = cache_read and (
+                (node.cache if node.cache is not None else cache_default) and not side_effect
+            )
+            cache_status: Any = "bypassed:side_effect" if side_effect else False
+
+            if use_cache:
+                digest = manifest_hashes.get(manifest.fqdn)
+                if digest is None:
+                    digest = manifest_hashes[manifest.fqdn] = manifest_hash(manifest)
+                ck, canonicalized = canonical_cache_key(manifest, node.inputs, state, digest)
+                counters = cache_counters.setdefault(
+                    manifest.fqdn, dict.fromkeys(LEDGER_COUNTERS, 0)
+                )
+                counters["canonicalized"] += canonicalized
+                ttl = node.cache_ttl_s if node.cache_ttl_s is not None else manifest.cache_ttl_s
+                cached, meta = unpack_entry(await acache.read(ck, ttl_s=ttl))
+                if cached is not None and entry_expired(meta, ttl):
+                    counters["expired"] += 1
+                    cache_status = "expired"
+                    cached = None
+                if cached is None:
+                    counters["misses"] += 1
                 else:
-                    expose = cached
-                state["nodes"][node.id] = expose
-                return
+                    counters["hits"] += 1
+                    counters["canonical_hits"] += canonicalized
+                    counters["bytes_served"] += meta.get("bytes", 0)
+                    counters["ms_saved"] += meta.get("ms", 0)
+                    metrics["cache_hits"] += 1
+                    metrics["per_node"][node.id] = {
+                        "tool": node.tool,
+                        "ms": 0,
+                        "ok": True,
+                        "cache": True,
+                        "retries": 0,
+                    }
+                    timeline[node.id]["end_ms"] = timeline[node.id]["start_ms"]
+                    expose = {}
+                    if node.out:
+                        for k, path in node.out.items():
+                            expose[k] = extract_jsonpath(cached, path)
+                    else:
+                        expose = cached
+                    state.set_node(
+                        node.id,
+                        expose,
+                        response=cached,
+                        response_hash=meta.get("sha256"),
+                        out=node.out,
+                    )
+                    return
 
-        tool: Tool = tool_pool[manifest.fqdn]
+            tool: Tool = tool_pool[manifest.fqdn]
+            if manifest.canonicalize_invoke:
+                inputs = canonicalize(inputs, manifest.canonicalize)
 
-        artifacts.write_node_request(node.id, node.tool, inputs)
+            artifacts.write_node_request(node.id, node.tool, inputs)
 
-        policy: RetryPolicy = node.retry or retry_default or RetryPolicy()
-        matcher = RetryMatcher(policy.retry_on)
-        delays = backoff_delays(policy.retries, policy.backoff_ms, policy.jitter_ms)
-        attempt = 0
+            policy: RetryPolicy = node.retry or retry_default or RetryPolicy()
+            matcher = RetryMatcher(policy.retry_on)
+            delays = backoff_delays(policy.retries, policy.backoff_ms, policy.jitter_ms)
+            attempt = 0
 
-        while True:
-            attempt += 1
-            if attempt > 1:
-                timeline[node.id]["attempts"].append(
-                    int((time.perf_counter() - start) * 1000)
-                )
-            try:
-                # Honour deadline and per-node timeout
-                timeout_ms = node.timeout_ms
-                if deadline_at is not None:
-                    remaining = int((deadline_at - time.perf_counter()) * 1000)
-                    timeout_ms = (
-                        remaining
-                        if timeout_ms is None
-                        else min(timeout_ms, remaining)
+            while True:
+                attempt += 1
+                if attempt > 1:
+                    timeline[node.id]["attempts"].append(
+                        int((time.perf_counter() - start) * 1000)
                     )
-                    if timeout_ms <= 0:
+                try:
+                    # Honour deadline and per-node timeout
+                    timeout_ms = node.timeout_ms
+                    if deadline_at is not None:
+                        remaining = int((deadline_at - time.perf_counter()) * 1000)
+                        timeout_ms = (
+                            remaining
+                            if timeout_ms is None
+                            else min(timeout_ms, remaining)
+                        )
+                        if timeout_ms <= 0:
+                            raise BudgetError("deadline exceeded")
+
+                    async with mgr.slot(manifest.fqdn, node.concurrency):
+                        if manifest.fqdn in batchers:
+                            response = await batchers[manifest.fqdn].invoke(inputs, timeout_ms)
+                        else:
+                            response = await _invoke_tool(tool, inputs, timeout_ms)
+                    if deadline_at is not None and time.perf_counter() > deadline_at:
                         raise BudgetError("deadline exceeded")
+                    break
+                except (ToolCallError, SchemaError) as exc:
+                    if attempt - 1 >= policy.retries or not matcher.matches(exc):
+                        node_ms = int((time.perf_counter() - node_start) * 1000)
+                        timeline[node.id]["end_ms"] = int((time.perf_counter() - start) * 1000)
+                        metrics["per_node"][node.id] = {
+                            "tool": node.tool,
+                            "ms": node_ms,
+                            "ok": False,
+                            "cache": cache_status,
+                            "retries": attempt - 1,
+                        }
+                        artifacts.write_node_error(node.id, str(exc))
+                        raise
+                    metrics["retries"] += 1
+                    delay_ms = delays[attempt - 2]
+                    if deadline_at is not None:
+                        remaining = (deadline_at - time.perf_counter()) * 1000
+                        if remaining <= 0 or delay_ms > remaining:
+                            await asyncio.sleep(max(0, remaining) / 1000)
+                            raise BudgetError("deadline exceeded")
+                    await asyncio.sleep(delay_ms / 1000)
+
+            node_ms = int((time.perf_counter() - node_start) * 1000)
+            artifacts.write_node_response(node.id, node.tool, response, node_ms)
+            metrics["per_node"][node.id] = {
+                "tool": node.tool,
+                "ms": node_ms,
+                "ok": True,
+                "cache": cache_status,
+                "retries": attempt - 1,
+            }
+            metrics["tool_calls"] += 1
+            timeline[node.id]["end_ms"] = int((time.perf_counter() - start) * 1000)
 
-                async with mgr.slot(manifest.fqdn, node.concurrency):
-                    response = await _invoke_tool(tool, inputs, timeout_ms)
-                if deadline_at is not None and time.perf_counter() > deadline_at:
-                    raise BudgetError("deadline exceeded")
+            expose: Dict[str, Any] = {}
+            if node.out:
+                for key, path in node.out.items():
+                    expose[key] = extract_jsonpath(response, path)
+            else:
+                expose = response
+
+            if use_cache and cache_write:
+                entry = pack_entry(response, tool=manifest.fqdn, ms=node_ms)
+                acache.write(ck, entry)
+                cache_written.append((ck, manifest.fqdn))
+                cache_counters[manifest.fqdn]["writes"] += 1
+                state.set_node(node.id, expose, response_hash=entry["sha256"], out=node.out)
+            else:
+                state.set_node(node.id, expose, response=response, out=node.out)
+
+        # ------------------------------------------------------------------
+        # Build dependency graph
+        pending: Dict[str, Node] = {n.id: n for n in plan.graph}
+        deps: Dict[str, List[str]] = {n.id: list(n.needs or []) for n in plan.graph}
+        dependents: Dict[str, List[str]] = {n.id: [] for n in plan.graph}
+        for node in plan.graph:
+            for dep in node.needs or []:
+                dependents.setdefault(dep, []).append(node.id)
+
+        # Skip nodes that already have state (resume)
+        for done_id in list(state["nodes"].keys()):
+            if done_id in deps:
+                for dep in dependents.get(done_id, []):
+                    if dep in deps:
+                        deps[dep].remove(done_id)
+                deps.pop(done_id, None)
+                pending.pop(done_id, None)
+
+        ready = [pending[n_id] for n_id, d in deps.items() if not d]
+        tasks: Dict[asyncio.Task[Any], str] = {}
+        completed: set[str] = set()
+        ok = True
+        stop_exc: Exception | None = None
+
+        while ready or tasks:
+            while ready:
+                node = ready.pop()
+                task = asyncio.create_task(run_node(node))
+                tasks[task] = node.id
+
+            if not tasks:
                 break
-            except (ToolCallError, SchemaError) as exc:
-                if attempt - 1 >= policy.retries or not matcher.matches(exc):
-                    node_ms = int((time.perf_counter() - node_start) * 1000)
-                    timeline[node.id]["end_ms"] = int((time.perf_counter() - start) * 1000)
-                    metrics["per_node"][node.id] = {
-                        "ms": node_ms,
-                        "ok": False,
-                        "cache": cache_status,
-                        "retries": attempt - 1,
-                    }
-                    artifacts.write_node_error(node.id, str(exc))
-                    raise
-                metrics["retries"] += 1
-                delay_ms = delays[attempt - 2]
-                if deadline_at is not None:
-                    remaining = (deadline_at - time.perf_counter()) * 1000
-                    if remaining <= 0 or delay_ms > remaining:
-                        await asyncio.sleep(max(0, remaining) / 1000)
-                        raise BudgetError("deadline exceeded")
-                await asyncio.sleep(delay_ms / 1000)
-
-        node_ms = int((time.perf_counter() - node_start) * 1000)
-        artifacts.write_node_response(node.id, node.tool, response, node_ms)
-        metrics["per_node"][node.id] = {
-            "ms": node_ms,
-            "ok": True,
-            "cache": cache_status,
-            "retries": attempt - 1,
-        }
-        metrics["tool_calls"] += 1
-        timeline[node.id]["end_ms"] = int((time.perf_counter() - start) * 1000)
 
-        expose: Dict[str, Any] = {}
-        if node.out:
-            for key, path in node.out.items():
-                expose[key] = extract_jsonpath(response, path)
-        else:
-            expose = response
-        state["nodes"][node.id] = expose
+            done, _ = await asyncio.wait(tasks.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                node_id = tasks.pop(task)
+                try:
+                    await task
+                    completed.add(node_id)
+                    for dep in dependents.get(node_id, []):
+                        if dep in deps:
+                            deps[dep].remove(node_id)
+                            if not deps[dep]:
+                                ready.append(pending[dep])
+                except Exception as exc:  # pragma: no cover - error path
+                    ok = False
+                    stop_exc = exc
+                    for t in tasks:
+                        t.cancel()
+                    await asyncio.gather(*tasks.keys(), return_exceptions=True)
+                    ready.clear()
+                    break
 
-        if use_cache and cache_write:
-            cache.write(ck, response)
+        total_ms = int((time.perf_counter() - start) * 1000)
+        metrics["total_ms"] = total_ms
 
-    # ------------------------------------------------------------------
-    # Build dependency graph
-    pending: Dict[str, Node] = {n.id: n for n in plan.graph}
-    deps: Dict[str, List[str]] = {n.id: list(n.needs or []) for n in plan.graph}
-    dependents: Dict[str, List[str]] = {n.id: [] for n in plan.graph}
-    for node in plan.graph:
-        for dep in node.needs or []:
-            dependents.setdefault(dep, []).append(node.id)
-
-    # Skip nodes that already have state (resume)
-    for done_id in list(state["nodes"].keys()):
-        if done_id in deps:
-            for dep in dependents.get(done_id, []):
-                if dep in deps:
-                    deps[dep].remove(done_id)
-            deps.pop(done_id, None)
-            pending.pop(done_id, None)
-
-    ready = [pending[n_id] for n_id, d in deps.items() if not d]
-    tasks: Dict[asyncio.Task[Any], str] = {}
-    completed: set[str] = set()
-    ok = True
-    stop_exc: Exception | None = None
-
-    while ready or tasks:
-        while ready:
-            node = ready.pop()
-            task = asyncio.create_task(run_node(node))
-            tasks[task] = node.id
-
-        if not tasks:
-            break
-
-        done, _ = await asyncio.wait(tasks.keys(), return_when=asyncio.FIRST_COMPLETED)
-        for task in done:
-            node_id = tasks.pop(task)
+        stop_reason = None
+        if stop_exc:
+            if isinstance(stop_exc, BudgetError):
+                stop_reason = "deadline"
+            else:
+                stop_reason = f"error:{type(stop_exc).__name__}"
+        metrics["stop_reason"] = stop_reason
+
+        await acache.drain()
+        cache.close()
+        metrics["cache"] = cache.stats()
+        if acache.write_errors:
+            metrics["cache_write_errors"] = acache.write_errors
+        metrics["cache_tools"] = cache_counters
+        metrics["validation"] = validation_counters(tool_pool.values(), since=validation_start)
+        if batchers:
+            metrics["batching"] = {fqdn: b.counters for fqdn, b in batchers.items()}
+        if replica_start:
+            metrics["replicas"] = replica_counters(tool_pool.values(), since=replica_start)
+        models = loader.memory_report()
+        if models:
+            metrics["models"] = models
+            metrics["model_cache"] = dict(
+                loader.counters, size_mb=round(loader.models.size_mb(), 1)
+            )
+        if cache_counters:
+            ledger = CacheLedger(cache_dir)
             try:
-                await task
-                completed.add(node_id)
-                for dep in dependents.get(node_id, []):
-                    if dep in deps:
-                        deps[dep].remove(node_id)
-                        if not deps[dep]:
-                            ready.append(pending[dep])
-            except Exception as exc:  # pragma: no cover - error path
-                ok = False
-                stop_exc = exc
-                for t in tasks:
-                    t.cancel()
-                await asyncio.gather(*tasks.keys(), return_exceptions=True)
-                ready.clear()
-                break
+                ledger.record(cache_written, cache_counters)
+            finally:
+                ledger.close()
+        if retention is not None:
+            report = collect_garbage(runs_dir, retention, exclude={artifacts.run_id})
+            metrics["gc"] = report.to_dict()
 
-    total_ms = int((time.perf_counter() - start) * 1000)
-    metrics["total_ms"] = total_ms
-
-    stop_reason = None
-    if stop_exc:
-        if isinstance(stop_exc, BudgetError):
-            stop_reason = "deadline"
-        else:
-            stop_reason = f"error:{type(stop_exc).__name__}"
-    metrics["stop_reason"] = stop_reason
-
-    artifacts.write_metrics(metrics)
-    artifacts.write_timeline(timeline)
-
-    summary = {
-        "run_id": artifacts.run_id,
-        "ok": ok and not stop_exc,
-        "stop_reason": stop_reason,
-        "totals": {
-            "nodes": len(plan.graph),
-            "tool_calls": metrics["tool_calls"],
-            "cache_hits": metrics["cache_hits"],
-            "retries": metrics["retries"],
-            "total_ms": metrics["total_ms"],
-        },
-        "artifacts": artifacts.paths,
-    }
-    artifacts.write_summary(summary)
-    return summary, stop_exc
+        artifacts.write_metrics(metrics)
+        artifacts.write_timeline(timeline)
+
+        summary = {
+            "run_id": artifacts.run_id,
+            "ok": ok and not stop_exc,
+            "stop_reason": stop_reason,
+            "totals": {
+                "nodes": len(plan.graph),
+                "tool_calls": metrics["tool_calls"],
+                "cache_hits": metrics["cache_hits"],
+                "retries": metrics["retries"],
+                "total_ms": metrics["total_ms"],
+            },
+            "artifacts": artifacts.paths,
+        }
+        artifacts.write_summary(summary)
+        return summary, stop_exc
+    finally:
+        if acache is not None:
+            await acache.drain()
+        if cache is not None:
+            cache.close()
+        loader.release()  # the tools are done; their models stay cached but evictable
+        transport.close_clients()
 
 
 # ---------------------------------------------------------------------------
@@ -402,6 +546,12 @@ def run_plan(
     cache_write: bool = True,
     loader: ModelLoader | None = None,
     warmup: bool = True,
+    retention: RetentionPolicy | None = None,
+    cache_memory_bytes: int = DEFAULT_MEMORY_CACHE_BYTES,
+    cache_backend: str | None = None,
+    cache_remote: str | None = None,
+    cache_io_concurrency: int = DEFAULT_CACHE_IO_CONCURRENCY,
+    preflight_concurrency: int = DEFAULT_PREFLIGHT_CONCURRENCY,
 ) -> Tuple[Dict, SymphoniaError | None]:
     """Synchronous wrapper around :func:`run_plan_async`."""
 
@@ -419,6 +569,12 @@ def run_plan(
             cache_write=cache_write,
             loader=loader,
             warmup=warmup,
+            retention=retention,
+            cache_memory_bytes=cache_memory_bytes,
+            cache_backend=cache_backend,
+            cache_remote=cache_remote,
+            cache_io_concurrency=cache_io_concurrency,
+            preflight_concurrency=preflight_concurrency,
         )
     )
 
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, List
 
 
 class SymphoniaError(Exception):
@@ -53,5 +54,31 @@ class EngineError(SymphoniaError):
     """Raised for unexpected errors within the engine."""
 
 
+class CacheError(SymphoniaError, ValueError):
+    """Raised for invalid cache configuration, e.g. an unknown backend."""
+
+
 class ModelLoadError(SymphoniaError):
     """Raised when model artifacts cannot be resolved or verified."""
+
+
+def copies_of(exc: BaseException, count: int) -> List[BaseException]:
+    """*count* independent copies of *exc*, one per item of a failed batch.
+
+    Futures must not share an exception instance: raising it from several
+    callers concurrently rewrites its traceback and context under them.
+    Copies keep the type, arguments, attributes and cause of *exc*.
+    """
+
+    out: List[BaseException] = []
+    for _ in range(count):
+        try:
+            dup = copy.copy(exc)
+        except TypeError:  # __init__ does not take ``args`` (e.g. dataclasses)
+            dup = type(exc).__new__(type(exc), *exc.args)
+            dup.args = exc.args
+            dup.__dict__.update(getattr(exc, "__dict__", {}))
+        dup.__cause__ = exc.__cause__
+        dup.__suppress_context__ = exc.__suppress_context__
+        out.append(dup.with_traceback(exc.__traceback__))
+    return out
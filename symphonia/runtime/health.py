@@ -0,0 +1,130 @@
+"""Concurrent, cached ``/health`` probes for HTTP tool endpoints.
+
+:func:`check_health` probes many endpoints at once – one shared
+:class:`httpx.AsyncClient` for TCP endpoints and one per Unix socket, with
+at most *concurrency* probes in flight – so a few dead endpoints cost one
+timeout rather than one each.  Every result, including those of the
+single-endpoint :func:`probe`, lands in a process-wide cache;
+:func:`recent_health` lets preflight and replica routing consult a recent
+result instead of probing again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
+import httpx
+
+from . import transport
+
+DEFAULT_HEALTH_TTL_S = 10.0
+DEFAULT_HEALTH_CONCURRENCY = 16
+DEFAULT_HEALTH_TIMEOUT_S = 2.0
+
+_RESULTS: Dict[str, Tuple[bool, float]] = {}
+_LOCK = threading.Lock()
+
+
+def record_health(url: str, ok: bool) -> None:
+    with _LOCK:
+        _RESULTS[url] = (ok, time.monotonic())
+
+
+def recent_health(
+    url: str, max_age_s: float = DEFAULT_HEALTH_TTL_S, *, since: float | None = None
+) -> bool | None:
+    """The cached result for *url* if younger than *max_age_s*, else ``None``.
+
+    With *since* (a ``time.monotonic()`` value) only results checked after
+    that moment count.
+    """
+
+    with _LOCK:
+        hit = _RESULTS.get(url)
+    if hit is None:
+        return None
+    ok, checked_at = hit
+    if time.monotonic() - checked_at > max_age_s or (since is not None and checked_at < since):
+        return None
+    return ok
+
+
+def probe(url: str, timeout_s: float = DEFAULT_HEALTH_TIMEOUT_S) -> bool:
+    """Probe one endpoint now and record the result."""
+
+    try:
+        ok = transport.get(transport.health_url(url), timeout=timeout_s).status_code == 200
+    except Exception:  # noqa: BLE001 - any failure means unhealthy
+        ok = False
+    record_health(url, ok)
+    return ok
+
+
+async def _probe_all(urls: List[str], timeout_s: float, concurrency: int) -> Dict[str, bool]:
+    sem = asyncio.Semaphore(max(1, concurrency))
+    clients: Dict[str | None, httpx.AsyncClient] = {}
+
+    def client_for(url: str) -> Tuple[httpx.AsyncClient, str]:
+        target = transport.health_url(url)
+        if transport.is_unix(target):
+            socket_path, path = transport.parse_unix_endpoint(target)
+            if socket_path not in clients:
+                clients[socket_path] = httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(uds=socket_path)
+                )
+            return clients[socket_path], f"http://localhost{path}"
+        if None not in clients:
+            clients[None] = httpx.AsyncClient()
+        return clients[None], target
+
+    async def probe(url: str) -> bool:
+        client, target = client_for(url)
+        async with sem:
+            try:
+                resp = await client.get(target, timeout=timeout_s)
+                return resp.status_code == 200
+            except Exception:  # noqa: BLE001 - any failure means unhealthy
+                return False
+
+    try:
+        results = await asyncio.gather(*(probe(u) for u in urls))
+    finally:
+        for client in clients.values():
+            await client.aclose()
+    return dict(zip(urls, results, strict=True))
+
+
+def check_health(
+    urls: Iterable[str],
+    *,
+    max_age_s: float = DEFAULT_HEALTH_TTL_S,
+    timeout_s: float = DEFAULT_HEALTH_TIMEOUT_S,
+    concurrency: int = DEFAULT_HEALTH_CONCURRENCY,
+) -> Dict[str, bool]:
+    """Health of each of *urls*, probing those without a recent result."""
+
+    out: Dict[str, bool] = {}
+    stale: List[str] = []
+    for url in dict.fromkeys(urls):
+        ok = recent_health(url, max_age_s)
+        if ok is None:
+            stale.append(url)
+        else:
+            out[url] = ok
+    if stale:
+        coro_args = (stale, timeout_s, concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            probed = asyncio.run(_probe_all(*coro_args))
+        else:  # called from async code: probe on a private loop
+            with ThreadPoolExecutor(1) as pool:
+                probed = pool.submit(asyncio.run, _probe_all(*coro_args)).result()
+        for url, ok in probed.items():
+            record_health(url, ok)
+        out.update(probed)
+    return out
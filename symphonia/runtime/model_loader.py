@@ -6,15 +6,41 @@ their integrity and attaches them to a base model.  A small content addressed
 cache avoids repeated downloads.  For test scenarios the loader understands the
 special ``base_id="stub"`` which returns inexpensive dummy objects instead of
 touching the real ``transformers`` stack.
+
+Tools whose adapters share a base model share one copy of its weights: a
+single base per ``(base_id, quant, device)`` is kept and each further
+adapter is attached to it as a named PEFT adapter.  ``load`` then returns
+an :class:`AdapterModel` view that activates its adapter for each call, and
+:meth:`ModelLoader.memory_report` shows the peak-RSS cost of each base and
+its adapters.  Peak RSS is process-wide, so a figure measured while another
+model was loading (concurrent preflight) also counts that model; such
+bases are reported with ``rss_attributable`` false.
+
+Loaded models live in a process-wide :class:`ModelCache`, so later loads
+of the same ``(base_id, adapter, quant, device)`` – another preflight, a
+second run in the same process – skip downloading, verifying and loading
+altogether.  Each load holds a reference until :meth:`ModelLoader.release`;
+bases nobody holds are evicted least recently used first once the cache
+exceeds its memory budget.
 """
 
 from __future__ import annotations
 
+import functools
+import gc
 import hashlib
+import json
+import logging
 import shutil
+import sys
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
 
 import fsspec
 try:  # pragma: no cover - imported lazily for tests
@@ -24,6 +50,10 @@ try:  # pragma: no cover - imported lazily for tests
 except Exception:  # pragma: no cover - tests may monkeypatch
     snapshot_download = None  # type: ignore
     AutoTokenizer = AutoModelForCausalLM = PeftModel = object  # type: ignore
+try:  # pragma: no cover - POSIX only
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore
 
 from .errors import ModelLoadError
 from .constants import (
@@ -34,15 +64,357 @@ from .constants import (
     STUB_BASE_ID,
 )
 
+logger = logging.getLogger(__name__)
+
+BaseKey = Tuple[str, Union[str, None], str]
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MiB, if known."""
+
+    if resource is None:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _rss_delta(before: float | None) -> float | None:
+    after = _peak_rss_mb()
+    return None if before is None or after is None else round(after - before, 1)
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+_DOWNLOAD_LOCKS: Dict[Path, threading.Lock] = {}
+_DOWNLOAD_LOCKS_LOCK = threading.Lock()
+
+
+def _download_lock(local_dir: Path) -> threading.Lock:
+    with _DOWNLOAD_LOCKS_LOCK:
+        return _DOWNLOAD_LOCKS.setdefault(local_dir, threading.Lock())
+
+
+HASH_CHUNK_BYTES = 1 << 20
+HASH_WORKERS = 8
+# Hidden, so it is not part of the bundle hash itself.
+VERIFIED_SIDECAR = ".symphonia-verified.json"
+
+
+def _bundle_files(directory: Path) -> List[Path]:
+    return sorted(
+        p
+        for p in directory.rglob("*")
+        if p.is_file() and not (p.name.startswith(".") or p.name.endswith(".tmp"))
+    )
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_BYTES), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _bundle_stamp(directory: Path) -> List[List[Any]]:
+    """``[relative path, size, mtime_ns, inode]`` per bundle file."""
+
+    stamp = []
+    for path in _bundle_files(directory):
+        st = path.stat()
+        rel = path.relative_to(directory).as_posix()
+        stamp.append([rel, st.st_size, st.st_mtime_ns, st.st_ino])
+    return stamp
+
+
+def _footprint_mb(model: Any) -> float | None:
+    """Parameter and buffer memory of a ``transformers`` model in MiB."""
+
+    footprint = getattr(model, "get_memory_footprint", None)
+    if not callable(footprint):
+        return None
+    try:
+        return footprint() / (1024 * 1024)
+    except Exception:  # noqa: BLE001 - size is best effort
+        return None
+
+
+class _SharedBase:
+    """A loaded base model and the adapters attached to it."""
+
+    def __init__(self, tokenizer: Any, model: Any, rss_mb: float | None):
+        self.tokenizer = tokenizer
+        self.base = model
+        self.peft: Any = None  # the PeftModel once the first adapter is attached
+        self.adapters: Dict[str, str] = {}  # bundle key -> adapter name
+        self.adapter_rss_mb: List[float | None] = []
+        self.rss_mb = rss_mb
+        self.rss_attributable = True  # False once a measurement overlapped another load
+        self.holds = 0  # outstanding loads, guarded by the cache lock
+        self.lock = threading.RLock()
+
+    @property
+    def size_mb(self) -> float:
+        """Model memory, measured when possible and from peak RSS otherwise."""
+
+        measured = _footprint_mb(self.peft if self.peft is not None else self.base)
+        if measured is not None:
+            return measured
+        return sum(mb or 0.0 for mb in [self.rss_mb, *self.adapter_rss_mb])
+
+
+class AdapterModel:
+    """One named adapter on a base model shared with other tools.
+
+    Calls, ``generate`` and every other method of the underlying PEFT model
+    reached through this wrapper (``forward``, ``score`` ...) activate the
+    adapter under the base's lock, so tools sharing a base may run from
+    different threads.  Plain attributes such as ``config`` are returned
+    as-is; use :meth:`active` to run several operations with the adapter
+    active.  :func:`generate_mixed` batches inputs for different adapters of
+    one base in a single call.
+    """
+
+    def __init__(self, shared: _SharedBase, adapter_name: str):
+        self._shared = shared
+        self.adapter_name = adapter_name
+
+    @property
+    def model(self) -> Any:
+        return self._shared.peft
+
+    @contextmanager
+    def active(self) -> Iterator[Any]:
+        with self._shared.lock:
+            if len(self._shared.adapters) > 1:
+                self._shared.peft.set_adapter(self.adapter_name)
+            yield self._shared.peft
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        with self.active() as model:
+            return model(*args, **kwargs)
+
+    def generate(self, *args: Any, **kwargs: Any) -> Any:
+        with self.active() as model:
+            return model.generate(*args, **kwargs)
+
+    def eval(self) -> "AdapterModel":
+        self._shared.peft.eval()
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._shared.peft, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def with_adapter(*args: Any, **kwargs: Any) -> Any:
+            with self.active() as model:
+                return getattr(model, name)(*args, **kwargs)
+
+        return with_adapter
+
+
+def generate_mixed(views: List[AdapterModel], **kwargs: Any) -> Any:
+    """Generate one batch whose rows use the adapters of *views*.
+
+    Row ``i`` of the inputs in *kwargs* runs with ``views[i]``'s adapter
+    (PEFT's ``adapter_names`` argument); all views must share a base.
+    """
+
+    shared = {id(v._shared): v._shared for v in views}
+    if len(shared) != 1:
+        raise ModelLoadError("generate_mixed needs adapters of a single base model")
+    (base,) = shared.values()
+    with base.lock:
+        return base.peft.generate(adapter_names=[v.adapter_name for v in views], **kwargs)
+
+
+class ModelCache:
+    """Reference-counted base models and adapters with LRU eviction.
+
+    A *budget_mb* of ``None`` keeps every model loaded.
+    """
+
+    def __init__(self, budget_mb: float | None = None):
+        self.budget_mb = budget_mb
+        self.counters: Dict[str, float] = {
+            "hits": 0, "misses": 0, "base_loads": 0, "evictions": 0, "load_ms": 0.0
+        }
+        self._bases: "OrderedDict[BaseKey, _SharedBase]" = OrderedDict()
+        self._base_locks: Dict[BaseKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._measuring = 0  # loads currently measuring peak RSS
+        self._measure_seq = 0
+
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _measure_rss(self, base_holder: List[_SharedBase | None]) -> Iterator[List[Any]]:
+        """Yield ``[rss_mb]``, filled with the block's peak-RSS growth.
+
+        If another load ran during the block, the base in *base_holder* is
+        marked as having unattributable RSS figures.
+        """
+
+        with self._lock:
+            overlapped = self._measuring > 0
+            self._measuring += 1
+            self._measure_seq += 1
+            seq = self._measure_seq
+        result: List[Any] = [None]
+        before = _peak_rss_mb()
+        try:
+            yield result
+        finally:
+            result[0] = _rss_delta(before)
+            with self._lock:
+                self._measuring -= 1
+                overlapped = overlapped or self._measure_seq != seq
+            base = base_holder[0]
+            if overlapped and base is not None:
+                base.rss_attributable = False
+
+    # ------------------------------------------------------------------
+    def lookup(self, key: BaseKey, adapter_key: str) -> Tuple[_SharedBase, str] | None:
+        """Hold and return a cached ``(base, adapter name)``, if loaded."""
+
+        with self._lock:
+            base = self._bases.get(key)
+            name = base.adapters.get(adapter_key) if base is not None else None
+            if name is None:
+                return None
+            base.holds += 1
+            self._bases.move_to_end(key)
+            self.counters["hits"] += 1
+        logger.info("model cache hit: %s adapter %s", key[0], name)
+        return base, name
+
+    # ------------------------------------------------------------------
+    def base(self, key: BaseKey, load: Callable[[], Tuple[Any, Any]]) -> _SharedBase:
+        """Hold the base for *key*, calling *load* for ``(tokenizer, model)`` once."""
+
+        with self._lock:  # one lock per base so different bases load in parallel
+            key_lock = self._base_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                base = self._bases.get(key)
+                if base is not None:
+                    base.holds += 1
+                    self._bases.move_to_end(key)
+                    return base
+            start = time.perf_counter()
+            holder: List[_SharedBase | None] = [None]
+            with self._measure_rss(holder) as rss:
+                tokenizer, model = load()
+                base = holder[0] = _SharedBase(tokenizer, model, None)
+            base.rss_mb = rss[0]
+            ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                base.holds += 1
+                self._bases[key] = base
+                self.counters["base_loads"] += 1
+                self.counters["load_ms"] += ms
+            logger.info("loaded base model %s in %.0f ms", key[0], ms)
+            return base
+
+    # ------------------------------------------------------------------
+    def attach(self, base: _SharedBase, adapter_key: str, directory: Path) -> str:
+        """Attach the adapter in *directory* to the held *base*, once."""
+
+        with base.lock:
+            name = base.adapters.get(adapter_key)
+            if name is not None:
+                return name
+            start = time.perf_counter()
+            with self._measure_rss([base]) as rss:
+                if base.peft is None:
+                    base.peft = PeftModel.from_pretrained(base.base, str(directory))
+                    name = "default"
+                else:
+                    name = f"adapter_{len(base.adapters)}"
+                    base.peft.load_adapter(str(directory), adapter_name=name)
+                base.peft.eval()
+            base.adapters[adapter_key] = name
+            base.adapter_rss_mb.append(rss[0])
+        ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.counters["misses"] += 1
+            self.counters["load_ms"] += ms
+        logger.info("attached adapter %s to %s in %.0f ms", directory.name, name, ms)
+        self._evict()
+        return name
+
+    # ------------------------------------------------------------------
+    def release(self, base: _SharedBase) -> None:
+        with self._lock:
+            base.holds = max(0, base.holds - 1)
+        self._evict()
+
+    # ------------------------------------------------------------------
+    def size_mb(self) -> float:
+        with self._lock:
+            return sum(b.size_mb for b in self._bases.values())
+
+    # ------------------------------------------------------------------
+    def _evict(self) -> None:
+        """Drop idle bases, least recently used first, until within budget."""
+
+        if self.budget_mb is None:
+            return
+        evicted = []
+        with self._lock:
+            total = sum(b.size_mb for b in self._bases.values())
+            for key in list(self._bases):
+                if total <= self.budget_mb:
+                    break
+                base = self._bases[key]
+                if base.holds:
+                    continue
+                del self._bases[key]
+                lock = self._base_locks.get(key)
+                if lock is not None and not lock.locked():  # not mid-load
+                    del self._base_locks[key]
+                total -= base.size_mb
+                self.counters["evictions"] += 1
+                evicted.append((key, base.size_mb))
+        for key, mb in evicted:
+            logger.info("evicted base model %s (%.0f MiB) from the model cache", key[0], mb)
+        if evicted:
+            gc.collect()
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        with self._lock:
+            self._bases.clear()
+            self._base_locks.clear()
+            for name in self.counters:
+                self.counters[name] = 0
+
+
+_MODEL_CACHE = ModelCache()
+
+
+def model_cache() -> ModelCache:
+    """Return the process-wide model cache."""
+
+    return _MODEL_CACHE
+
 
 class ModelLoader:
     """Resolve model adapter URIs and attach adapters."""
 
-    def __init__(self, cache_dir: Path | None = None) -> None:
+    def __init__(self, cache_dir: Path | None = None, models: ModelCache | None = None) -> None:
         if cache_dir is None:
             cache_dir = Path.home() / ".symphonia" / "model-cache"
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.models = models or model_cache()
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._held: List[Tuple[BaseKey, _SharedBase]] = []
+        self._lock = threading.Lock()
 
     # ------------------------------------------------------------------
     def _bundle_hash(self, directory: Path) -> str:
@@ -52,19 +424,46 @@ class ModelLoader:
         before hashing again. Hidden files (``.*``) and temporary files
         (``*.tmp``) are ignored so platform artefacts such as ``.DS_Store`` do
         not affect the bundle hash. The algorithm is stable across platforms and
-        orderings.
+        orderings.  Files are streamed in chunks and hashed in parallel.
         """
 
-        digests = []
-        for path in sorted(
-            p
-            for p in directory.rglob("*")
-            if p.is_file() and not (p.name.startswith(".") or p.name.endswith(".tmp"))
-        ):
-            digests.append(hashlib.sha256(path.read_bytes()).hexdigest())
+        files = _bundle_files(directory)
+        if len(files) > 1:
+            with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(files))) as pool:
+                digests = list(pool.map(_file_digest, files))
+        else:
+            digests = [_file_digest(p) for p in files]
         blob = "".join(digests)
         return hashlib.sha256(blob.encode()).hexdigest()
 
+    # ------------------------------------------------------------------
+    def _verify_bundle(self, directory: Path, sha256: str) -> bool:
+        """Check *directory* against *sha256*, hashing only when it changed.
+
+        A successful check is recorded in a hidden sidecar together with
+        each file's size, ``mtime_ns`` and inode; while those are unchanged
+        the bundle verifies from ``stat`` calls alone.  Returns whether the
+        sidecar was used.
+        """
+
+        sidecar = directory / VERIFIED_SIDECAR
+        stamp = _bundle_stamp(directory)
+        try:
+            recorded = json.loads(sidecar.read_text())
+        except (OSError, ValueError):
+            recorded = None
+        if recorded == {"sha256": sha256, "files": stamp}:
+            return True
+        if self._bundle_hash(directory) != sha256:
+            raise ModelLoadError("SHA mismatch")
+        tmp = sidecar.with_name(sidecar.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps({"sha256": sha256, "files": stamp}))
+            tmp.replace(sidecar)
+        except OSError:  # read-only cache: verify by hashing next time
+            pass
+        return False
+
     # ------------------------------------------------------------------
     def _resolve_hf(self, uri: str, revision: str | None, dest: Path) -> Path:
         """Resolve a Hugging Face ``hf://`` URI to a local directory."""
@@ -104,8 +503,16 @@ class ModelLoader:
         loader: Union[LoaderType, str] = LoaderType.PEFT_LORA,
         quant: Union[Quantization, str, None] = None,
         device_hint: Union[DeviceHint, str] = DeviceHint.AUTO,
+        timings: Dict[str, Any] | None = None,
     ) -> Tuple[AutoTokenizer, AutoModelForCausalLM]:
-        """Resolve, verify, cache, and load a model."""
+        """Resolve, verify, cache, and load a model.
+
+        The model is an :class:`AdapterModel` on the shared base for
+        ``(base_id, quant, device_hint)``.  *timings*, when given, receives
+        ``download_ms``, ``hash_ms`` and ``model_ms`` and whether the model
+        cache was hit and the bundle verified from its sidecar.
+        """
+        timings = timings if timings is not None else {}
         loader_enum = LoaderType(loader)
         if loader_enum is not LoaderType.PEFT_LORA:
             raise ModelLoadError(f"Unsupported loader: {loader}")
@@ -118,44 +525,117 @@ class ModelLoader:
             return Dummy(), Dummy()
 
         key = sha256 or hashlib.sha256(f"{adapter_uri}@{revision}".encode()).hexdigest()
+        quant_enum = Quantization(quant) if quant is not None else None
+        device_enum = DeviceHint(device_hint)
+        base_key: BaseKey = (base_id, quant_enum.value if quant_enum else None, device_enum.value)
+        cached = self.models.lookup(base_key, key)
+        timings["cache_hit"] = cached is not None
+        if cached is not None:
+            base, name = cached
+            self._hold(base_key, base, hit=True)
+            return base.tokenizer, AdapterModel(base, name)
+
         local_dir = self.cache_dir / key
-        if not local_dir.exists():
-            tmp_dir = local_dir.with_suffix(".tmp")
-            tmp_dir.mkdir(parents=True, exist_ok=True)
-            if adapter_uri.startswith(AdapterScheme.HF.value):
-                src = self._resolve_hf(adapter_uri, revision, tmp_dir)
-                if src != tmp_dir:
-                    shutil.copytree(src, tmp_dir, dirs_exist_ok=True)
-            else:
-                self._resolve_fs(adapter_uri, tmp_dir)
-            tmp_dir.replace(local_dir)
+        start = time.perf_counter()
+        with _download_lock(local_dir):  # tools sharing an adapter download it once
+            if not local_dir.exists():
+                tmp_dir = local_dir.with_suffix(".tmp")
+                tmp_dir.mkdir(parents=True, exist_ok=True)
+                if adapter_uri.startswith(AdapterScheme.HF.value):
+                    src = self._resolve_hf(adapter_uri, revision, tmp_dir)
+                    if src != tmp_dir:
+                        shutil.copytree(src, tmp_dir, dirs_exist_ok=True)
+                else:
+                    self._resolve_fs(adapter_uri, tmp_dir)
+                tmp_dir.replace(local_dir)
+        timings["download_ms"] = _ms_since(start)
         if sha256:
-            digest = self._bundle_hash(local_dir)
-            if digest != sha256:
-                raise ModelLoadError("SHA mismatch")
+            start = time.perf_counter()
+            timings["hash_cached"] = self._verify_bundle(local_dir, sha256)
+            timings["hash_ms"] = _ms_since(start)
 
-        tokenizer = AutoTokenizer.from_pretrained(base_id)
-        quant_enum = Quantization(quant) if quant is not None else None
-        device_enum = DeviceHint(device_hint)
+        start = time.perf_counter()
+        base = self.models.base(
+            base_key,
+            lambda: (
+                AutoTokenizer.from_pretrained(base_id),
+                self._load_base_model(base_id, quant_enum, device_enum),
+            ),
+        )
         try:
-            model = AutoModelForCausalLM.from_pretrained(
+            name = self.models.attach(base, key, local_dir)
+        except Exception:
+            self.models.release(base)
+            raise
+        timings["model_ms"] = _ms_since(start)
+        self._hold(base_key, base, hit=False)
+        return base.tokenizer, AdapterModel(base, name)
+
+    # ------------------------------------------------------------------
+    def _hold(self, key: BaseKey, base: _SharedBase, *, hit: bool) -> None:
+        with self._lock:
+            self._held.append((key, base))
+            self.counters["hits" if hit else "misses"] += 1
+
+    # ------------------------------------------------------------------
+    def release(self) -> None:
+        """Release every model this loader loaded back to the model cache.
+
+        The models stay cached for later loads but may now be evicted.
+        """
+
+        with self._lock:
+            held, self._held = self._held, []
+        for _, base in held:
+            self.models.release(base)
+
+    # ------------------------------------------------------------------
+    def _load_base_model(
+        self, base_id: str, quant: Quantization | None, device: DeviceHint
+    ) -> AutoModelForCausalLM:
+        try:
+            return AutoModelForCausalLM.from_pretrained(
                 base_id,
-                device_map="auto" if device_enum is DeviceHint.AUTO else None,
-                load_in_4bit=quant_enum is Quantization.BITS4,
-                load_in_8bit=quant_enum is Quantization.BITS8,
+                device_map="auto" if device is DeviceHint.AUTO else None,
+                load_in_4bit=quant is Quantization.BITS4,
+                load_in_8bit=quant is Quantization.BITS8,
             )
         except Exception as exc:
-            if quant_enum and "bitsandbytes" in str(exc).lower():
+            if quant and "bitsandbytes" in str(exc).lower():
                 warnings.warn(
                     "bitsandbytes not available; falling back to full precision",
                     RuntimeWarning,
                 )
-                model = AutoModelForCausalLM.from_pretrained(
+                return AutoModelForCausalLM.from_pretrained(
                     base_id,
-                    device_map="auto" if device_enum is DeviceHint.AUTO else None,
+                    device_map="auto" if device is DeviceHint.AUTO else None,
                 )
-            else:
-                raise
-        model = PeftModel.from_pretrained(model, str(local_dir))
-        model.eval()
-        return tokenizer, model
+            raise
+
+    # ------------------------------------------------------------------
+    def memory_report(self) -> Dict[str, Dict[str, Any]]:
+        """Peak-RSS growth (MiB) per shared base this loader holds.
+
+        ``saved_mb`` estimates the memory a separate base copy per adapter
+        would have cost on top.  When ``rss_attributable`` is false the
+        figures also count models loaded at the same time, so they are
+        upper bounds and must not be summed across bases.
+        """
+
+        report: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            bases = dict(self._held)
+        for (base_id, quant, device), base in bases.items():
+            adapters = len(base.adapters)
+            report[f"{base_id}|{quant or 'none'}|{device}"] = {
+                "adapters": adapters,
+                "base_rss_mb": base.rss_mb,
+                "adapter_rss_mb": base.adapter_rss_mb,
+                "rss_attributable": base.rss_attributable,
+                "saved_mb": (
+                    round(base.rss_mb * (adapters - 1), 1)
+                    if base.rss_mb is not None and adapters > 1
+                    else 0.0
+                ),
+            }
+        return report
@@ -1,15 +1,38 @@
-"""Pre-flight resolution of tools and model loading."""
+"""Pre-flight resolution of tools and model loading.
+
+Tools are built concurrently on up to ``concurrency`` threads, so adapter
+downloads, bundle hashing and model loading of different tools overlap.
+Each tool's phases are timed in milliseconds: ``resolve_ms`` and, from
+the model loader, ``download_ms``, ``hash_ms`` and ``model_ms``, then
+``import_ms``, ``instantiate_ms``, ``warmup_ms`` and ``total_ms``.
+"""
 
 from __future__ import annotations
 
 import importlib
-from typing import Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
 
 from .tools import HttpTool, Tool
 from .model_loader import ModelLoader
+from ..registry.manifest import ToolManifest
 from ..registry.registry import Registry
 from ..sdk.plan_ir import Plan
 from .errors import EngineError, ModelLoadError, RegistryError
+from .health import recent_health
+
+DEFAULT_PREFLIGHT_CONCURRENCY = 4
+
+
+@contextmanager
+def _timed(timings: Dict[str, Any], phase: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = round((time.perf_counter() - start) * 1000, 1)
 
 
 def _import_entrypoint(path: str):
@@ -20,41 +43,88 @@ def _import_entrypoint(path: str):
     return getattr(mod, func)
 
 
-def preflight_build_tool_pool(
-    plan: Plan,
-    registry: Registry,
+def build_tool(
+    manifest: ToolManifest,
     *,
     loader: ModelLoader,
     warmup: bool = True,
-) -> Dict[str, Tool]:
-    """Resolve all tools referenced by *plan* and return a tool pool."""
-
-    tools = {node.tool for node in plan.graph}
-    pool: Dict[str, Tool] = {}
-    for namever in tools:
-        manifest = registry.resolve(namever)
-        if manifest.kind == "http":
-            pool[namever] = HttpTool(manifest)
-            continue
-        if not manifest.model:
-            raise RegistryError("manifest.model missing")
-        try:
-            tok, model = loader.load(**manifest.model)
-        except ModelLoadError:
-            raise
-        factory = None
-        try:
+    timings: Dict[str, Any] | None = None,
+) -> Tool:
+    """Instantiate the tool described by *manifest*, loading its model.
+
+    Phase timings are recorded into *timings* when given.
+    """
+
+    timings = timings if timings is not None else {}
+
+    if manifest.kind == "http":
+        # Fail fast on tools whose every endpoint just failed a health check.
+        urls = manifest.endpoints or [manifest.endpoint]
+        if all(recent_health(u) is False for u in urls):
+            raise EngineError(f"{manifest.fqdn} failed its last health check")
+        return HttpTool(manifest)
+    if not manifest.model:
+        raise RegistryError("manifest.model missing")
+    try:
+        tok, model = loader.load(**manifest.model, timings=timings)
+    except ModelLoadError:
+        raise
+    factory = None
+    try:
+        with _timed(timings, "import_ms"):
             factory = _import_entrypoint(manifest.entrypoint)
-        except Exception as exc:
-            raise EngineError(f"Cannot import {manifest.entrypoint}") from exc
-        try:
+    except Exception as exc:
+        raise EngineError(f"Cannot import {manifest.entrypoint}") from exc
+    try:
+        with _timed(timings, "instantiate_ms"):
             tool = factory(manifest, loader, preloaded=(tok, model))
-        except Exception as exc:
-            raise EngineError(f"Error instantiating tool {namever}") from exc
-        pool[namever] = tool
-        if warmup and hasattr(tool, "warmup"):
+    except Exception as exc:
+        raise EngineError(f"Error instantiating tool {manifest.fqdn}") from exc
+    if warmup and hasattr(tool, "warmup"):
+        with _timed(timings, "warmup_ms"):
             try:
                 tool.warmup()  # pragma: no cover - optional
             except Exception:
                 pass
-    return pool
+    return tool
+
+
+def preflight_build_tool_pool(
+    plan: Plan,
+    registry: Registry,
+    *,
+    loader: ModelLoader,
+    warmup: bool = True,
+    concurrency: int = DEFAULT_PREFLIGHT_CONCURRENCY,
+    timings: Dict[str, Dict[str, Any]] | None = None,
+) -> Dict[str, Tool]:
+    """Resolve all tools referenced by *plan* and return a tool pool.
+
+    Up to *concurrency* tools are built at once.  Per-tool phase timings
+    are recorded into *timings* (keyed like the pool) when given.  If
+    several tools fail, the error of the first in plan order is raised.
+    """
+
+    tools = list(dict.fromkeys(node.tool for node in plan.graph))
+    timings = timings if timings is not None else {}
+
+    def build(namever: str) -> Tool:
+        t = timings[namever] = {}
+        start = time.perf_counter()
+        try:
+            with _timed(t, "resolve_ms"):
+                manifest = registry.resolve(namever)
+            return build_tool(manifest, loader=loader, warmup=warmup, timings=t)
+        finally:
+            t["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    if concurrency <= 1 or len(tools) <= 1:
+        return {namever: build(namever) for namever in tools}
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(tools))) as pool:
+        futures = {namever: pool.submit(build, namever) for namever in tools}
+        try:
+            return {namever: future.result() for namever, future in futures.items()}
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
@@ -0,0 +1,169 @@
+"""Client-side routing across HTTP tool replicas.
+
+A manifest may list several equivalent endpoints::
+
+    "endpoints": ["http://10.0.0.5:8002", "http://10.0.0.6:8002",
+                  "unix:///run/symphonia/linker.sock"]
+
+Calls go to the replica with the fewest outstanding requests (ties rotate).
+A replica failing :data:`EJECT_AFTER` consecutive calls – connection errors
+or ``5xx`` responses – is ejected for :data:`EJECT_S` seconds and re-admitted
+only once its ``/health`` probe (the one :meth:`Registry.health` uses)
+answers.  Replicas whose recent health check (see
+:mod:`symphonia.runtime.health`) failed are skipped as well.  If every
+replica is out, the one due back soonest is tried anyway.
+
+Replica sets are shared process-wide per tool, so every :class:`HttpTool`
+instance sees the same load, and their counters feed ``metrics["replicas"]``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from . import transport
+from .health import probe, recent_health
+
+EJECT_AFTER = 3
+EJECT_S = 10.0
+
+_COUNTERS = ("calls", "errors", "retries", "ejections", "total_ms")
+
+
+class Replica:
+    """One endpoint and its load and outcome counters."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_at = 0.0
+        self.ejected_until = 0.0
+        self.counters: Dict[str, float] = dict.fromkeys(_COUNTERS, 0)
+
+    def endpoint(self, path: str | None = None) -> str:
+        """The replica URL, or *path* resolved against it."""
+
+        return self.url if path is None else transport.join(self.url, path)
+
+
+class ReplicaSet:
+    """Least-outstanding-requests routing with health-aware ejection."""
+
+    def __init__(
+        self, urls: List[str], *, eject_after: int = EJECT_AFTER, eject_s: float = EJECT_S
+    ):
+        self.replicas = [Replica(u) for u in urls]
+        self.eject_after = eject_after
+        self.eject_s = eject_s
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    # ------------------------------------------------------------------
+    def _readmit(self) -> None:
+        """Probe replicas whose ejection expired; re-admit the healthy ones."""
+
+        now = time.monotonic()
+        with self._lock:
+            due = [r for r in self.replicas if 0 < r.ejected_until <= now]
+            for r in due:  # claim the probe so concurrent callers skip it
+                r.ejected_until = now + self.eject_s
+        for r in due:
+            # A health check newer than the ejection saves a probe.
+            ok = recent_health(r.url, since=r.ejected_at)
+            if ok is None:
+                ok = probe(r.url)
+            if ok:
+                with self._lock:
+                    r.ejected_until = 0.0
+                    r.failures = 0
+
+    # ------------------------------------------------------------------
+    def acquire(self, exclude: Iterable[Replica] = ()) -> Replica:
+        """Pick a replica (not in *exclude* when possible) and count it busy."""
+
+        self._readmit()
+        skip = set(map(id, exclude))
+        with self._lock:
+            n = len(self.replicas)
+            order = [self.replicas[(self._next + i) % n] for i in range(n)]
+            self._next = (self._next + 1) % n
+            pool = [r for r in order if id(r) not in skip] or order
+            candidates = [
+                r for r in pool if r.ejected_until <= 0 and recent_health(r.url) is not False
+            ]
+            if not candidates:
+                candidates = [min(pool, key=lambda r: r.ejected_until)]
+            replica = min(candidates, key=lambda r: r.outstanding)
+            replica.outstanding += 1
+        return replica
+
+    # ------------------------------------------------------------------
+    def release(self, replica: Replica, ms: float, ok: bool, *, retried: bool = False) -> None:
+        with self._lock:
+            replica.outstanding -= 1
+            c = replica.counters
+            c["calls"] += 1
+            c["total_ms"] += ms
+            c["retries"] += int(retried)
+            if ok:
+                replica.failures = 0
+                return
+            c["errors"] += 1
+            replica.failures += 1
+            if replica.failures >= self.eject_after and replica.ejected_until <= 0:
+                replica.ejected_at = time.monotonic()
+                replica.ejected_until = replica.ejected_at + self.eject_s
+                c["ejections"] += 1
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                r.url: dict(r.counters, ejected=r.ejected_until > 0) for r in self.replicas
+            }
+
+
+_SETS: Dict[Tuple[str, Tuple[str, ...]], ReplicaSet] = {}
+_LOCK = threading.Lock()
+
+
+def replica_set(manifest: Any) -> ReplicaSet:
+    """Return the process-wide replica set for *manifest*'s ``endpoints``."""
+
+    key = (manifest.fqdn, tuple(manifest.endpoints))
+    with _LOCK:
+        if key not in _SETS:
+            _SETS[key] = ReplicaSet(list(manifest.endpoints))
+        return _SETS[key]
+
+
+def replica_counters(
+    tools: Iterable[Any], since: Dict[str, Dict[str, Dict[str, Any]]] | None = None
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Per-replica counters of *tools* keyed by fqdn and URL.
+
+    With *since* (an earlier snapshot) the counters are deltas and include
+    the mean latency over the interval.
+    """
+
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for tool in tools:
+        replicas = getattr(tool, "_replicas", None)
+        if not isinstance(replicas, ReplicaSet):
+            continue
+        fqdn = tool.manifest.fqdn
+        snap = replicas.snapshot()
+        if since is not None:
+            for url, stats in snap.items():
+                before = since.get(fqdn, {}).get(url, {})
+                for c in _COUNTERS:
+                    stats[c] -= before.get(c, 0)
+                stats["mean_ms"] = stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0
+        out[fqdn] = snap
+    return out
@@ -0,0 +1,166 @@
+"""Retention policies and garbage collection for the runs directory.
+
+Runs and the engine cache accumulate under ``runs/`` forever unless something
+deletes them.  :func:`collect_garbage` applies a :class:`RetentionPolicy`
+using the :class:`~symphonia.runtime.run_index.RunIndex`, so selecting victims
+never walks the tree.  Runs that are still executing are never removed:
+a run is considered active while its index status is ``running`` and the
+owning process is alive (runs owned by another host are always treated as
+active); runs still marked running whose process died count as failed.
+Victims are claimed with a compare-and-set on their status, registering a
+claimed run is refused, and the status is checked again in the transaction
+that deletes the directory, so a run resumed concurrently is left alone.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import shutil
+import socket
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .cache_backends import detect_backends, open_cache
+from .constants import RunStatus
+from .run_index import RunIndex, dir_bytes
+
+
+@dataclass
+class RetentionPolicy:
+    """Budgets applied by :func:`collect_garbage`.
+
+    Every budget is optional; ``None`` disables it.  Runs that are pinned,
+    still executing or (with ``keep_failed``) failed are never deleted but
+    still count towards ``max_bytes`` and ``max_runs``.
+    """
+
+    max_age_days: float | None = None
+    max_bytes: int | None = None
+    max_runs: int | None = None
+    keep_failed: bool = True
+    pinned: List[str] = field(default_factory=list)
+    cache_max_bytes: int | None = None
+    cache_max_age_days: float | None = None
+
+
+@dataclass
+class GCReport:
+    """Outcome of a garbage collection pass."""
+
+    removed: List[str] = field(default_factory=list)
+    reclaimed_bytes: int = 0
+    cache_reclaimed_bytes: int = 0
+    skipped_active: List[str] = field(default_factory=list)
+    dry_run: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # pragma: no cover - owned by another user
+        return True
+    return True
+
+
+def _is_active(row: Dict[str, Any]) -> bool:
+    if row["status"] not in (RunStatus.RUNNING.value, RunStatus.DELETING.value):
+        return False
+    if row.get("host") != socket.gethostname() or row.get("pid") is None:
+        return True
+    return _pid_alive(int(row["pid"]))
+
+
+def _parse_ts(value: str) -> _dt.datetime:
+    ts = _dt.datetime.fromisoformat(value)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=_dt.timezone.utc)
+    return ts
+
+
+def collect_garbage(
+    runs_dir: str | Path,
+    policy: RetentionPolicy,
+    *,
+    dry_run: bool = False,
+    exclude: set[str] | None = None,
+) -> GCReport:
+    """Delete runs and cache entries that fall outside *policy*.
+
+    ``exclude`` lists run ids that must be kept in addition to
+    ``policy.pinned`` (the engine passes the run it is executing).
+    """
+
+    runs_dir = Path(runs_dir)
+    index = RunIndex(runs_dir)
+    report = GCReport(dry_run=dry_run)
+    keep = set(policy.pinned) | set(exclude or ())
+
+    rows = index.query()  # newest first
+    for row in rows:
+        if row["bytes"] is None:
+            row["bytes"] = dir_bytes(Path(row["path"]))
+            if not dry_run and not _is_active(row):  # finished runs no longer grow
+                index.update(row["run_id"], bytes=row["bytes"])
+
+    def protected(row: Dict[str, Any]) -> bool:
+        if row["run_id"] in keep:
+            return True
+        if _is_active(row):
+            report.skipped_active.append(row["run_id"])
+            return True
+        # A run still marked running whose process died has crashed: it failed.
+        failed = row["status"] in (RunStatus.FAILED.value, RunStatus.RUNNING.value)
+        return policy.keep_failed and failed
+
+    now = _dt.datetime.now(_dt.timezone.utc)
+    cutoff = (
+        now - _dt.timedelta(days=policy.max_age_days)
+        if policy.max_age_days is not None
+        else None
+    )
+    total_bytes = sum(r["bytes"] for r in rows)
+    count = len(rows)
+
+    # Oldest first so count/byte budgets evict the least recent runs.
+    for row in reversed(rows):
+        expired = cutoff is not None and _parse_ts(row["created_at"]) < cutoff
+        over_count = policy.max_runs is not None and count > policy.max_runs
+        over_bytes = policy.max_bytes is not None and total_bytes > policy.max_bytes
+        if not (expired or over_count or over_bytes) or protected(row):
+            continue
+        if not dry_run:
+            if not index.claim(row["run_id"], row["status"], RunStatus.DELETING.value):
+                continue
+            path = row["path"]
+            if not index.delete_claimed(
+                row["run_id"], lambda: shutil.rmtree(path, ignore_errors=True)
+            ):
+                continue
+        report.removed.append(row["run_id"])
+        report.reclaimed_bytes += row["bytes"]
+        total_bytes -= row["bytes"]
+        count -= 1
+
+    cache_dir = runs_dir / "cache"
+    max_age_s = (
+        policy.cache_max_age_days * 86400 if policy.cache_max_age_days is not None else None
+    )
+    if not dry_run and cache_dir.exists() and (
+        policy.cache_max_bytes is not None or max_age_s is not None
+    ):
+        for kind in detect_backends(cache_dir):
+            cache = open_cache(kind, cache_dir)
+            try:
+                report.cache_reclaimed_bytes += cache.prune(
+                    max_bytes=policy.cache_max_bytes, max_age_s=max_age_s
+                )
+            finally:
+                cache.close()
+    return report
@@ -0,0 +1,287 @@
+"""Persistent index of runs stored under a runs root.
+
+Runs live in ``<root>/<date>/<run_id>`` directories.  Locating a run by id
+used to require globbing every date directory; the index maps ``run_id`` to
+its directory together with status, timestamps and hashes so lookups and
+listings are a single SQLite query regardless of how much history exists.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import os
+import socket
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .constants import RUN_INDEX_FILE, RunStatus
+from .db import connect
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    inputs_hash TEXT,
+    registry_hash TEXT,
+    stop_reason TEXT,
+    total_ms INTEGER,
+    pid INTEGER,
+    host TEXT,
+    bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_created_at ON runs(created_at);
+"""
+
+_UPDATABLE = {
+    "status",
+    "created_at",
+    "inputs_hash",
+    "registry_hash",
+    "stop_reason",
+    "total_ms",
+    "bytes",
+}
+
+# Columns added after the first release of the index; ``_migrate`` adds them
+# to databases created by older versions.
+_ADDED_COLUMNS = {"bytes": "INTEGER"}
+
+
+def _now() -> str:
+    return _dt.datetime.now(_dt.timezone.utc).isoformat()
+
+
+def dir_bytes(path: Path) -> int:
+    """Return the total size of regular files below *path*."""
+
+    total = 0
+    for dirpath, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(dirpath, name)).st_size
+            except FileNotFoundError:  # pragma: no cover - race safe
+                pass
+    return total
+
+
+class RunIndex:
+    """SQLite-backed ``run_id`` → run directory mapping.
+
+    Paths are stored relative to the runs root so the whole tree can be moved
+    without invalidating the index.  The first time an index is created for an
+    existing runs root it is backfilled from the ``run.json``/``summary.json``
+    files already on disk; afterwards the tree is never walked.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.path = self.root / RUN_INDEX_FILE
+        fresh = not self.path.exists()
+        with closing(connect(self.path)) as conn:
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+        if fresh:
+            self._backfill()
+
+    # ------------------------------------------------------------------
+    def _migrate(self, conn: Any) -> None:
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(runs)")}
+        for name, decl in _ADDED_COLUMNS.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE runs ADD COLUMN {name} {decl}")
+
+    # ------------------------------------------------------------------
+    def _backfill(self) -> None:
+        rows = []
+        for info_path in self.root.glob("*/*/run.json"):
+            run_dir = info_path.parent
+            try:
+                info = json.loads(info_path.read_text())
+            except (OSError, ValueError):
+                continue
+            summary_path = run_dir / "summary.json"
+            status = RunStatus.FAILED.value
+            stop_reason = total_ms = None
+            if summary_path.exists():
+                try:
+                    summary = json.loads(summary_path.read_text())
+                except (OSError, ValueError):
+                    summary = {}
+                if summary.get("ok"):
+                    status = RunStatus.OK.value
+                stop_reason = summary.get("stop_reason")
+                total_ms = summary.get("totals", {}).get("total_ms")
+            created_at = info.get("created_at") or _now()
+            rows.append(
+                (
+                    run_dir.name,
+                    str(run_dir.relative_to(self.root)),
+                    status,
+                    created_at,
+                    created_at,
+                    info.get("inputs_hash"),
+                    info.get("registry_hash"),
+                    stop_reason,
+                    total_ms,
+                )
+            )
+        if not rows:
+            return
+        with closing(connect(self.path)) as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO runs (run_id, path, status, created_at,"
+                " updated_at, inputs_hash, registry_hash, stop_reason, total_ms)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    # ------------------------------------------------------------------
+    def _row(self, row: Any) -> Dict[str, Any]:
+        data = dict(row)
+        data["path"] = str(self.root / data["path"])
+        return data
+
+    # ------------------------------------------------------------------
+    def lookup(self, run_id: str) -> Path | None:
+        """Return the directory of *run_id* or ``None`` when unknown."""
+
+        with closing(connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT path FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return self.root / row["path"] if row else None
+
+    # ------------------------------------------------------------------
+    def get(self, run_id: str) -> Dict[str, Any] | None:
+        with closing(connect(self.path)) as conn:
+            row = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return self._row(row) if row else None
+
+    # ------------------------------------------------------------------
+    def register(self, run_id: str, path: Path) -> bool:
+        """Record that *run_id* at *path* is being executed by this process.
+
+        Returns ``False`` (and changes nothing) while garbage collection is
+        deleting the run.
+        """
+
+        now = _now()
+        with closing(connect(self.path)) as conn:
+            cur = conn.execute(
+                "INSERT INTO runs (run_id, path, status, created_at, updated_at, pid, host)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(run_id) DO UPDATE SET status = excluded.status,"
+                " updated_at = excluded.updated_at, pid = excluded.pid,"
+                " host = excluded.host WHERE runs.status != ?",
+                (
+                    run_id,
+                    str(Path(path).relative_to(self.root)),
+                    RunStatus.RUNNING.value,
+                    now,
+                    now,
+                    os.getpid(),
+                    socket.gethostname(),
+                    RunStatus.DELETING.value,
+                ),
+            )
+        return cur.rowcount == 1
+
+    # ------------------------------------------------------------------
+    def update(self, run_id: str, **fields: Any) -> None:
+        unknown = set(fields) - _UPDATABLE
+        if unknown:
+            raise ValueError(f"unknown run index fields: {sorted(unknown)}")
+        fields["updated_at"] = _now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with closing(connect(self.path)) as conn:
+            conn.execute(
+                f"UPDATE runs SET {assignments} WHERE run_id = ?",
+                (*fields.values(), run_id),
+            )
+
+    # ------------------------------------------------------------------
+    def claim(self, run_id: str, status: str, new_status: str) -> bool:
+        """Atomically move *run_id* from *status* to *new_status*.
+
+        Returns ``False`` when another process changed the run in the
+        meantime, e.g. because it was resumed.
+        """
+
+        with closing(connect(self.path)) as conn:
+            cur = conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ? AND status = ?",
+                (new_status, _now(), run_id, status),
+            )
+        return cur.rowcount == 1
+
+    # ------------------------------------------------------------------
+    def delete_claimed(self, run_id: str, delete: Callable[[], None]) -> bool:
+        """Run *delete* and drop *run_id* if it is still claimed for deletion.
+
+        The status check, *delete* and the row removal happen in one write
+        transaction, so a concurrent :meth:`register` waits for them.
+        """
+
+        with closing(connect(self.path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT status FROM runs WHERE run_id = ?", (run_id,)
+                ).fetchone()
+                if row is None or row["status"] != RunStatus.DELETING.value:
+                    conn.execute("ROLLBACK")
+                    return False
+                delete()
+                conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    # ------------------------------------------------------------------
+    def remove(self, run_id: str) -> None:
+        with closing(connect(self.path)) as conn:
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        *,
+        status: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return runs newest first, optionally filtered by status and time.
+
+        ``since``/``until`` are ISO-8601 timestamps compared against
+        ``created_at``.
+        """
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row(r) for r in rows]
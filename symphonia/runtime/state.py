@@ -2,22 +2,81 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import re
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from .errors import SchemaError
 
 REF_RE = re.compile(r"\$\{([^}]+)\}")
 
 
+def content_hash(value: Any) -> str:
+    """SHA-256 of the canonical JSON form of *value*."""
+
+    blob = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
 class State(Dict[str, Any]):
-    """Runtime state used for interpolation."""
+    """Runtime state used for interpolation.
+
+    Besides the node outputs, the state carries a content hash per output
+    (:meth:`node_hash`) so that cache keys of downstream nodes can refer to
+    an upstream value by digest instead of serializing it again.
+    """
 
     def __init__(self, context: Dict[str, Any], vars: Dict[str, Any]):
         super().__init__()
         self["context"] = context
         self["vars"] = vars
         self["nodes"] = {}
+        self.hashes: Dict[str, str] = {}
+        self._pending: Dict[str, Tuple[Any, Dict[str, str]]] = {}
+
+    def set_node(
+        self,
+        node_id: str,
+        value: Any,
+        *,
+        response: Any = None,
+        response_hash: str | None = None,
+        out: Dict[str, str] | None = None,
+    ) -> None:
+        """Store a node output.
+
+        A node mapped through ``out`` is hashed Merkle style from the digest
+        of its raw tool response and the mapping, otherwise by the value
+        itself.  *response_hash* is that digest when already known (e.g.
+        recorded with a cache entry); without it the digest is computed
+        lazily from *response*.  Fresh, cached and resumed outputs must
+        therefore pass the same *out* to get the same hash.
+        """
+
+        self["nodes"][node_id] = value
+        self.hashes.pop(node_id, None)
+        self._pending.pop(node_id, None)
+        if not out:
+            if response_hash is not None:
+                self.hashes[node_id] = response_hash
+            return
+        if response_hash is not None:
+            self.hashes[node_id] = content_hash({"response": response_hash, "out": out})
+        else:
+            self._pending[node_id] = (response, out)
+
+    def node_hash(self, node_id: str) -> str:
+        digest = self.hashes.get(node_id)
+        if digest is None:
+            pending = self._pending.pop(node_id, None)
+            if pending is not None:
+                response, out = pending
+                value = {"response": content_hash(response), "out": out}
+            else:
+                value = self["nodes"][node_id]
+            digest = self.hashes[node_id] = content_hash(value)
+        return digest
 
 
 def _resolve_expr(expr: str, state: State) -> Any:
@@ -60,6 +119,39 @@ def interpolate(value: Any, state: State) -> Any:
     return value
 
 
+def _key_ref(expr: str, state: State) -> Any:
+    parts = expr.split(".")
+    if parts[0] in ("context", "vars"):
+        return _resolve_expr(expr, state)
+    _resolve_expr(expr, state)  # validate the reference
+    return {"$node": state.node_hash(parts[0]), "$path": ".".join(parts[1:])}
+
+
+def key_view(value: Any, state: State) -> Any:
+    """Like :func:`interpolate`, but for computing cache keys.
+
+    References to other nodes' outputs are replaced by ``{"$node": digest,
+    "$path": ...}`` tokens built from :meth:`State.node_hash`, so large
+    upstream values are never re-serialized; ``context``/``vars`` references
+    resolve to their values.  Inputs without node references therefore map
+    to exactly the resolved inputs.
+    """
+
+    if isinstance(value, dict):
+        return {k: key_view(v, state) for k, v in value.items()}
+    if isinstance(value, list):
+        return [key_view(v, state) for v in value]
+    if isinstance(value, str):
+        match = REF_RE.fullmatch(value)
+        if match:
+            return _key_ref(match.group(1), state)
+        refs = REF_RE.findall(value)
+        if any(r.split(".")[0] not in ("context", "vars") for r in refs):
+            return {"$template": value, "$refs": [_key_ref(r, state) for r in refs]}
+        return interpolate(value, state)
+    return value
+
+
 def extract_jsonpath(data: Dict[str, Any], path: str) -> Any:
     """Very small subset of JSONPath used in plan ``out`` mappings."""
 
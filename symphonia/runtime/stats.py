@@ -0,0 +1,221 @@
+"""Cross-run performance analytics built from run history.
+
+:func:`collect_stats` streams through the runs recorded in the
+:class:`~symphonia.runtime.run_index.RunIndex` (newest first, filtered by
+time window) and aggregates the ``per_node`` entries of every run's
+``metrics.json`` into per-tool and per-node latency percentiles, cache hit
+ratios, retry and error rates, plus per-window throughput.  Only one run's
+metrics are held in memory at a time; the aggregates keep the observed
+latencies so percentiles are exact.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .run_index import RunIndex
+
+PERCENTILES = (50, 90, 95, 99)
+
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_BUCKETS = {"hour": 3600, "day": 86400, "week": 604800}
+
+
+def parse_since(value: str, now: _dt.datetime | None = None) -> str:
+    """Turn ``"7d"``/``"12h"``-style durations into an ISO timestamp.
+
+    Values that are not relative durations are returned unchanged and are
+    expected to already be ISO-8601 timestamps.
+    """
+
+    match = _DURATION_RE.match(value.strip())
+    if not match:
+        return value
+    now = now or _dt.datetime.now(_dt.timezone.utc)
+    seconds = float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+    return (now - _dt.timedelta(seconds=seconds)).isoformat()
+
+
+def percentile(values: List[float], pct: float) -> float | None:
+    """Linear-interpolated percentile of *values* (which must be sorted)."""
+
+    if not values:
+        return None
+    rank = (len(values) - 1) * pct / 100.0
+    lo = math.floor(rank)
+    hi = math.ceil(rank)
+    return values[lo] + (values[hi] - values[lo]) * (rank - lo)
+
+
+@dataclass
+class _Series:
+    """Running aggregate for one tool or node."""
+
+    executions: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+    errors: int = 0
+    latencies: List[int] = field(default_factory=list)
+
+    def observe(self, entry: Dict[str, Any]) -> None:
+        self.executions += 1
+        if entry.get("cache") is True:
+            self.cache_hits += 1
+        else:
+            self.latencies.append(int(entry.get("ms", 0)))
+        self.retries += int(entry.get("retries", 0))
+        if not entry.get("ok", False):
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies)
+        calls = len(lat)
+        out: Dict[str, Any] = {
+            "executions": self.executions,
+            "calls": calls,
+            "cache_hit_ratio": self.cache_hits / self.executions if self.executions else 0.0,
+            "retry_rate": self.retries / calls if calls else 0.0,
+            "error_rate": self.errors / self.executions if self.executions else 0.0,
+            "mean_ms": sum(lat) / calls if calls else None,
+            "max_ms": lat[-1] if lat else None,
+        }
+        for pct in PERCENTILES:
+            out[f"p{pct}_ms"] = percentile(lat, pct)
+        return out
+
+
+def _bucket_start(created_at: str, seconds: int) -> str:
+    ts = _dt.datetime.fromisoformat(created_at)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=_dt.timezone.utc)
+    epoch = int(ts.timestamp()) // seconds * seconds
+    return _dt.datetime.fromtimestamp(epoch, _dt.timezone.utc).isoformat()
+
+
+def iter_run_metrics(
+    runs_dir: str | Path, *, since: str | None = None, until: str | None = None
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Yield ``(index_row, metrics)`` for runs in the window, newest first."""
+
+    for row in RunIndex(runs_dir).query(since=since, until=until):
+        path = Path(row["path"]) / "metrics.json"
+        try:
+            metrics = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        per_node = metrics.get("per_node", {})
+        if any("tool" not in e for e in per_node.values()):
+            # Runs recorded before per-node tool names were tracked.
+            try:
+                plan = json.loads((Path(row["path"]) / "plan.json").read_text())
+            except (OSError, ValueError):
+                plan = {"graph": []}
+            tools = {n["id"]: n["tool"] for n in plan.get("graph", [])}
+            for node_id, entry in per_node.items():
+                entry.setdefault("tool", tools.get(node_id, "?"))
+        yield row, metrics
+
+
+def collect_stats(
+    runs_dir: str | Path,
+    *,
+    since: str | None = None,
+    until: str | None = None,
+    tool: str | None = None,
+    bucket: str = "day",
+) -> Dict[str, Any]:
+    """Aggregate per-tool/per-node performance over run history.
+
+    ``tool`` restricts the aggregation to one tool fqdn and ``bucket``
+    (``hour``, ``day`` or ``week``) sets the throughput window size.
+    Nodes restored from a previous attempt of a resumed run are skipped so
+    their latency is not counted twice.
+    """
+
+    if bucket not in _BUCKETS:
+        raise ValueError(f"unknown bucket {bucket}; expected one of {sorted(_BUCKETS)}")
+    width = _BUCKETS[bucket]
+    tools: Dict[str, _Series] = {}
+    nodes: Dict[str, _Series] = {}
+    windows: Dict[str, Dict[str, Any]] = {}
+    runs = 0
+    for row, metrics in iter_run_metrics(runs_dir, since=since, until=until):
+        runs += 1
+        win = windows.setdefault(
+            _bucket_start(row["created_at"], width),
+            {"runs": 0, "failed_runs": 0, "tool_calls": 0, "cache_hits": 0},
+        )
+        win["runs"] += 1
+        if row["status"] == "failed":
+            win["failed_runs"] += 1
+        for node_id, entry in metrics.get("per_node", {}).items():
+            if entry.get("resumed") or (tool is not None and entry["tool"] != tool):
+                continue
+            tools.setdefault(entry["tool"], _Series()).observe(entry)
+            nodes.setdefault(node_id, _Series()).observe(entry)
+            if entry.get("cache") is True:
+                win["cache_hits"] += 1
+            else:
+                win["tool_calls"] += 1
+
+    window_rows = []
+    for start in sorted(windows):
+        win = windows[start]
+        win["start"] = start
+        win["calls_per_min"] = win["tool_calls"] / (width / 60)
+        window_rows.append(win)
+    return {
+        "runs": runs,
+        "since": since,
+        "until": until,
+        "bucket": bucket,
+        "tools": {k: v.summary() for k, v in sorted(tools.items())},
+        "nodes": {k: v.summary() for k, v in sorted(nodes.items())},
+        "windows": window_rows,
+    }
+
+
+def format_stats_table(stats: Dict[str, Any]) -> str:
+    """Render the output of :func:`collect_stats` as a plain-text table."""
+
+    def fmt(value: Any) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:.1f}"
+        return str(value)
+
+    header = ["name", "calls", "p50", "p95", "p99", "max", "hit%", "retry%", "err%"]
+    lines = [f"runs: {stats['runs']}"]
+    for section in ("tools", "nodes"):
+        lines.append("")
+        lines.append(f"[{section}]")
+        lines.append("  ".join(f"{h:>8}" if i else f"{h:<24}" for i, h in enumerate(header)))
+        for name, s in stats[section].items():
+            cells = [
+                s["calls"],
+                s["p50_ms"],
+                s["p95_ms"],
+                s["p99_ms"],
+                s["max_ms"],
+                s["cache_hit_ratio"] * 100,
+                s["retry_rate"] * 100,
+                s["error_rate"] * 100,
+            ]
+            lines.append(f"{name:<24}  " + "  ".join(f"{fmt(c):>8}" for c in cells))
+    lines.append("")
+    lines.append(f"[windows: {stats['bucket']}]")
+    for win in stats["windows"]:
+        lines.append(
+            f"{win['start']:<26} runs={win['runs']} failed={win['failed_runs']} "
+            f"calls={win['tool_calls']} hits={win['cache_hits']} "
+            f"calls/min={win['calls_per_min']:.2f}"
+        )
+    return "\n".join(lines)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Callable, Protocol
+import time
+from typing import Any, Callable, List, Protocol
 
 import httpx
-from jsonschema import Draft7Validator, ValidationError
 
 from ..registry.manifest import ToolManifest
-from .errors import SchemaError, ToolCallError
+from . import transport, wire
+from .errors import SchemaError, ToolCallError, copies_of
+from .replicas import Replica, replica_set
+from .validation import SchemaViolation, validation_policy
 
 
 class Tool(Protocol):
@@ -18,51 +21,205 @@ class Tool(Protocol):
 
 
 class HttpTool:
-    """Invoke tools exposed over HTTP."""
+    """Invoke tools exposed over HTTP.
+
+    Manifests with a ``batch_endpoint`` also accept :meth:`invoke_batch`:
+    the endpoint receives a JSON array of payloads and answers with an array
+    of the same length whose items are ``{"output": {...}}`` or
+    ``{"error": {"message": ..., "status": ...}}``.
+
+    ``wire_format: "msgpack"`` switches both calls to negotiated binary
+    bodies (see :mod:`symphonia.runtime.wire`); JSON is used otherwise.
+    Endpoints may be ``unix://`` sockets (see :mod:`symphonia.runtime.transport`).
+    With ``endpoints`` calls are routed across replicas (see
+    :mod:`symphonia.runtime.replicas`); a ``batch_endpoint`` given as a path
+    is then resolved against the chosen replica.  Calls to tools not tagged
+    ``side_effecting`` are retried on another replica after a connection
+    error or ``5xx`` response.
+    """
 
     def __init__(self, manifest: ToolManifest):
         self.manifest = manifest
-        self._in_validator = Draft7Validator(manifest.input_schema)
-        self._out_validator = Draft7Validator(manifest.output_schema)
-
+        self._in_validator = validation_policy(manifest, "input")
+        self._out_validator = validation_policy(manifest, "output")
+        kind = wire.WIRE_FORMATS.get(manifest.wire_format or "json", wire.JSON)
+        self._wire: str | None = kind if kind != wire.JSON and wire.supported(kind) else None
+        self._replicas = replica_set(manifest) if manifest.endpoints else None
+        self._idempotent = "side_effecting" not in (manifest.tags or [])
+
+    # ------------------------------------------------------------------
+    def _post(self, url: str, data: Any, timeout_s: float | None) -> httpx.Response:
+        if self._wire is None:
+            return transport.post(url, json=data, timeout=timeout_s)
+        body, headers = wire.request_body(data, self._wire, compress=self.manifest.wire_compress)
+        resp = transport.post(url, content=body, headers=headers, timeout=timeout_s)
+        if resp.status_code == 415:
+            # The server does not take binary bodies: use JSON from now on.
+            self._wire = None
+            return transport.post(url, json=data, timeout=timeout_s)
+        return resp
+
+    def _decode(self, resp: httpx.Response) -> Any:
+        if self._wire is None:
+            return resp.json()
+        try:
+            return wire.decode(resp.content, wire.media_type(resp.headers.get("content-type")))
+        except wire.WireFormatError as exc:
+            raise ToolCallError(status=resp.status_code, message=str(exc)) from exc
+
+    def _send(self, url: str | None, data: Any, timeout_s: float | None) -> httpx.Response:
+        """POST *data* to *url* (default: the endpoint), routed across replicas."""
+
+        if self._replicas is None or (url and not url.startswith("/")):
+            return self._post(url or self.manifest.endpoint, data, timeout_s)
+        tried: List[Replica] = []
+        while True:
+            replica = self._replicas.acquire(exclude=tried)
+            t0 = time.perf_counter()
+            error: httpx.HTTPError | None = None
+            try:
+                resp = self._post(replica.endpoint(url), data, timeout_s)
+                ok = resp.status_code < 500
+            except httpx.HTTPError as exc:
+                error, ok = exc, False
+            ms = (time.perf_counter() - t0) * 1000
+            self._replicas.release(replica, ms, ok, retried=bool(tried))
+            tried.append(replica)
+            if ok or not self._idempotent or len(tried) >= len(self._replicas):
+                if error is not None:
+                    raise error
+                return resp
+
+    # ------------------------------------------------------------------
     def invoke(self, payload: dict, timeout_s: float | None = None) -> dict:
         try:
-            self._in_validator.validate(payload)
-        except ValidationError as exc:
+            self._in_validator(payload)
+        except SchemaViolation as exc:
             raise SchemaError(f"input schema error: {exc.message}") from exc
 
         try:
-            resp = httpx.post(self.manifest.endpoint, json=payload, timeout=timeout_s)
+            resp = self._send(None, payload, timeout_s)
         except httpx.HTTPError as exc:
             raise ToolCallError(status=None, message=str(exc)) from exc
         if resp.status_code >= 400:
             raise ToolCallError(status=resp.status_code, body=resp.text)
 
-        data = resp.json()
+        data = self._decode(resp)
         try:
-            self._out_validator.validate(data)
-        except ValidationError as exc:
+            self._out_validator(data)
+        except SchemaViolation as exc:
             raise SchemaError(f"output schema error: {exc.message}") from exc
         return data
 
+    def invoke_batch(self, payloads: List[dict], timeout_s: float | None = None) -> List[Any]:
+        """Invoke the batch endpoint with *payloads* in one request.
+
+        Returns one entry per payload: the validated output, or the
+        :class:`SchemaError` / :class:`ToolCallError` for that item.
+        """
+
+        results: List[Any] = [None] * len(payloads)
+        send: List[int] = []
+        for i, payload in enumerate(payloads):
+            try:
+                self._in_validator(payload)
+                send.append(i)
+            except SchemaViolation as exc:
+                results[i] = SchemaError(f"input schema error: {exc.message}")
+        if not send:
+            return results
+
+        try:
+            resp = self._send(self.manifest.batch_endpoint, [payloads[i] for i in send], timeout_s)
+            if resp.status_code >= 400:
+                raise ToolCallError(status=resp.status_code, body=resp.text)
+            items = self._decode(resp)
+            if not isinstance(items, list) or len(items) != len(send):
+                raise ToolCallError(
+                    status=resp.status_code, message="batch response does not match request"
+                )
+        except httpx.HTTPError as exc:
+            items = [ToolCallError(status=None, message=str(exc)) for _ in send]
+        except ToolCallError as exc:
+            items = copies_of(exc, len(send))
+
+        for i, item in zip(send, items, strict=True):
+            if isinstance(item, ToolCallError):
+                results[i] = item
+            elif isinstance(item, dict) and "output" in item:
+                try:
+                    self._out_validator(item["output"])
+                    results[i] = item["output"]
+                except SchemaViolation as exc:
+                    results[i] = SchemaError(f"output schema error: {exc.message}")
+            else:
+                error = item.get("error") if isinstance(item, dict) else None
+                error = error if isinstance(error, dict) else {"message": str(error or item)}
+                results[i] = ToolCallError(
+                    status=error.get("status"), body=error, message=error.get("message")
+                )
+        return results
 
-class InprocTool:
-    """Wrap a Python callable as a tool."""
 
-    def __init__(self, manifest: ToolManifest, func: Callable[[dict], dict]):
+class InprocTool:
+    """Wrap a Python callable as a tool.
+
+    A factory may also pass *batch_func*, which takes a list of payloads and
+    returns one output per payload in order – e.g. a single padded forward
+    pass.  :meth:`invoke_batch` then validates each item, runs the valid
+    ones through *batch_func* in one call and returns an output or an
+    exception per payload; without it the items are invoked one by one.
+    """
+
+    def __init__(
+        self,
+        manifest: ToolManifest,
+        func: Callable[[dict], dict],
+        batch_func: Callable[[List[dict]], List[dict]] | None = None,
+    ):
         self.manifest = manifest
         self.func = func
-        self._in_validator = Draft7Validator(manifest.input_schema)
-        self._out_validator = Draft7Validator(manifest.output_schema)
+        self.batch_func = batch_func
+        self._in_validator = validation_policy(manifest, "input")
+        self._out_validator = validation_policy(manifest, "output")
 
     def invoke(self, payload: dict, timeout_s: float | None = None) -> dict:  # pragma: no cover - timeout unused
         try:
-            self._in_validator.validate(payload)
-        except ValidationError as exc:
+            self._in_validator(payload)
+        except SchemaViolation as exc:
             raise SchemaError(f"input schema error: {exc.message}") from exc
         data = self.func(payload)
         try:
-            self._out_validator.validate(data)
-        except ValidationError as exc:
+            self._out_validator(data)
+        except SchemaViolation as exc:
             raise SchemaError(f"output schema error: {exc.message}") from exc
         return data
+
+    def invoke_batch(self, payloads: List[dict], timeout_s: float | None = None) -> List[Any]:
+        results: List[Any] = [None] * len(payloads)
+        if self.batch_func is None:
+            for i, payload in enumerate(payloads):
+                try:
+                    results[i] = self.invoke(payload, timeout_s)
+                except Exception as exc:  # noqa: BLE001 - reported per item
+                    results[i] = exc
+            return results
+        send: List[int] = []
+        for i, payload in enumerate(payloads):
+            try:
+                self._in_validator(payload)
+                send.append(i)
+            except SchemaViolation as exc:
+                results[i] = SchemaError(f"input schema error: {exc.message}")
+        if not send:
+            return results
+        outputs = self.batch_func([payloads[i] for i in send])
+        if len(outputs) != len(send):
+            raise ToolCallError(status=None, message="batch output does not match request")
+        for i, data in zip(send, outputs, strict=True):
+            try:
+                self._out_validator(data)
+                results[i] = data
+            except SchemaViolation as exc:
+                results[i] = SchemaError(f"output schema error: {exc.message}")
+        return results
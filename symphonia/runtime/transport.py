@@ -0,0 +1,119 @@
+"""HTTP transport selection for tool endpoints.
+
+Besides ``http(s)://`` URLs, tool endpoints may name a Unix domain socket
+for sidecars running on the same host::
+
+    unix:///run/symphonia/linker.sock           # POST /
+    unix:///run/symphonia/linker.sock:/batch    # POST /batch
+
+Requests to a socket go through one keep-alive :class:`httpx.Client` per
+socket path, shared by every tool in the process; ``http`` URLs keep using
+the module-level ``httpx`` functions.  Runs bracket their use of the clients
+with :func:`hold_clients` and :func:`close_clients`, which closes them once
+no run holds them any more.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Tuple
+
+import httpx
+
+UNIX_SCHEME = "unix://"
+
+_CLIENTS: Dict[str, httpx.Client] = {}
+_LOCK = threading.Lock()
+_HOLDERS = 0
+
+
+def is_unix(url: str | None) -> bool:
+    return bool(url) and url.startswith(UNIX_SCHEME)
+
+
+def valid_endpoint(url: str | None) -> bool:
+    """``True`` for ``http(s)://`` URLs and ``unix://`` socket endpoints."""
+
+    if not url:
+        return False
+    if is_unix(url):
+        return parse_unix_endpoint(url)[0].startswith("/")
+    return url.startswith("http")
+
+
+def parse_unix_endpoint(url: str) -> Tuple[str, str]:
+    """Split ``unix://<socket>[:<path>]`` into the socket and request path."""
+
+    rest = url[len(UNIX_SCHEME):]
+    socket_path, sep, path = rest.partition(":")
+    return socket_path, (path if sep and path.startswith("/") else "/")
+
+
+def _client(socket_path: str) -> httpx.Client:
+    client = _CLIENTS.get(socket_path)
+    if client is None:
+        with _LOCK:
+            client = _CLIENTS.get(socket_path)
+            if client is None:
+                client = _CLIENTS[socket_path] = httpx.Client(
+                    transport=httpx.HTTPTransport(uds=socket_path)
+                )
+    return client
+
+
+def hold_clients() -> None:
+    """Keep the socket clients open until the matching :func:`close_clients`."""
+
+    global _HOLDERS
+    with _LOCK:
+        _HOLDERS += 1
+
+
+def close_clients() -> None:
+    """Release a hold and close every socket client once nobody holds them.
+
+    Also safe to call without a hold, e.g. at interpreter shutdown; clients
+    are recreated on the next request.
+    """
+
+    global _HOLDERS
+    with _LOCK:
+        _HOLDERS = max(0, _HOLDERS - 1)
+        if _HOLDERS:
+            return
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+def request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send an HTTP request to an ``http`` or ``unix`` endpoint."""
+
+    if is_unix(url):
+        socket_path, path = parse_unix_endpoint(url)
+        return _client(socket_path).request(method, f"http://localhost{path}", **kwargs)
+    return httpx.post(url, **kwargs) if method == "POST" else httpx.get(url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> httpx.Response:
+    return request("POST", url, **kwargs)
+
+
+def get(url: str, **kwargs: Any) -> httpx.Response:
+    return request("GET", url, **kwargs)
+
+
+def join(url: str, path: str) -> str:
+    """Append the request *path* to an ``http`` or ``unix`` endpoint."""
+
+    if is_unix(url):
+        socket_path, base = parse_unix_endpoint(url)
+        return f"{UNIX_SCHEME}{socket_path}:{base.rstrip('/')}{path}"
+    return f"{url.rstrip('/')}{path}"
+
+
+def health_url(url: str) -> str:
+    """The ``/health`` URL next to a tool endpoint."""
+
+    return join(url, "/health")
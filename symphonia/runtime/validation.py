@@ -0,0 +1,412 @@
+"""Compiled JSON-schema validators shared across tools.
+
+Validating every tool input and output with the interpretive
+:class:`jsonschema.Draft7Validator` can cost more than a call to a small
+specialist.  :func:`get_validator` compiles a schema once into a plain
+Python function and caches it by the schema's content hash, so tools with
+identical schemas – and every run in a long-lived process – share it:
+
+* with ``fastjsonschema`` installed its code generator is used;
+* otherwise schemas using the common keywords (``type``, ``properties``,
+  ``required``, ``additionalProperties``, ``items``, ``enum``, ``const``,
+  numeric and length bounds, ``pattern``) are compiled by a small code
+  generator here;
+* anything else falls back to a cached ``Draft7Validator``.
+
+All validators raise :class:`SchemaViolation` with a readable message.
+
+Tools call their validators through a :class:`ValidationPolicy`, set per
+manifest and direction with ``validate_input`` / ``validate_output``:
+``always`` (the default), ``sample:<rate>`` or ``first:<n>`` (the first *n*
+calls in this process).  A violation switches the policy back to
+``always`` for the rest of the process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from jsonschema import Draft7Validator, ValidationError
+
+try:  # pragma: no cover - optional dependency
+    import fastjsonschema
+except ImportError:  # pragma: no cover
+    fastjsonschema = None  # type: ignore
+
+Validator = Callable[[Any], None]
+
+ENGINES = ("fastjsonschema", "codegen", "jsonschema")
+
+_SUPPORTED = {
+    "$schema",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "type",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "enum",
+    "const",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "minItems",
+    "maxItems",
+    "pattern",
+}
+
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": (
+        "((isinstance({v}, int) and not isinstance({v}, bool))"
+        " or (isinstance({v}, float) and {v}.is_integer()))"
+    ),
+}
+
+
+class SchemaViolation(ValueError):
+    """Raised by compiled validators; ``message`` describes the failure."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    return hashlib.sha256(
+        json.dumps(schema, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+
+
+def _at(path: str) -> str:
+    return f" at ${path}" if path else ""
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """JSON equality as in ``enum``/``const``: booleans never equal numbers."""
+
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a is b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b, strict=True))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    return a == b
+
+
+class _CodeGen:
+    """Translate a schema subset into the source of one Python function."""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.consts: Dict[str, Any] = {}
+        self._n = 0
+
+    def _var(self) -> str:
+        self._n += 1
+        return f"v{self._n}"
+
+    def _const(self, value: Any) -> str:
+        name = f"c{len(self.consts)}"
+        self.consts[name] = value
+        return name
+
+    def _fail(self, ind: str, message: str, path: str) -> None:
+        self.lines.append(f"{ind}    raise SchemaViolation({message!r} + _at({path}))")
+
+    def emit(self, schema: Any, var: str, path: str, depth: int) -> None:
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            ind = "    " * depth
+            self.lines.append(f"{ind}raise SchemaViolation('no value allowed' + _at({path}))")
+            return
+        unknown = set(schema) - _SUPPORTED
+        if unknown:
+            raise NotImplementedError(sorted(unknown))
+        ind = "    " * depth
+        at = path
+
+        types = schema.get("type")
+        if types is not None:
+            names = [types] if isinstance(types, str) else list(types)
+            check = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in names)
+            self.lines.append(f"{ind}if not ({check}):")
+            self._fail(ind, f"value is not of type {' or '.join(names)}", at)
+
+        if "enum" in schema:
+            options = self._const(schema["enum"])
+            self.lines.append(f"{ind}if not any(_equal({var}, o) for o in {options}):")
+            self._fail(ind, f"value is not one of {schema['enum']!r}", at)
+        if "const" in schema:
+            self.lines.append(f"{ind}if not _equal({var}, {self._const(schema['const'])}):")
+            self._fail(ind, f"value must be {schema['const']!r}", at)
+
+        num = "(isinstance({v}, (int, float)) and not isinstance({v}, bool))".format(v=var)
+        for key, op in (
+            ("minimum", "<"),
+            ("maximum", ">"),
+            ("exclusiveMinimum", "<="),
+            ("exclusiveMaximum", ">="),
+        ):
+            if key in schema:
+                self.lines.append(f"{ind}if {num} and {var} {op} {schema[key]!r}:")
+                self._fail(ind, f"value violates {key} {schema[key]}", at)
+
+        for key, kind, op in (
+            ("minLength", "str", "<"),
+            ("maxLength", "str", ">"),
+            ("minItems", "list", "<"),
+            ("maxItems", "list", ">"),
+        ):
+            if key in schema:
+                self.lines.append(
+                    f"{ind}if isinstance({var}, {kind}) and len({var}) {op} {schema[key]!r}:"
+                )
+                self._fail(ind, f"value violates {key} {schema[key]}", at)
+        if "pattern" in schema:
+            rx = self._const(re.compile(schema["pattern"]))
+            self.lines.append(f"{ind}if isinstance({var}, str) and not {rx}.search({var}):")
+            self._fail(ind, f"value does not match {schema['pattern']!r}", at)
+
+        props = schema.get("properties", {})
+        required = schema.get("required", [])
+        additional = schema.get("additionalProperties", True)
+        if props or required or additional is not True:
+            self.lines.append(f"{ind}if isinstance({var}, dict):")
+            inner = ind + "    "
+            for name in required:
+                self.lines.append(f"{inner}if {name!r} not in {var}:")
+                self._fail(inner, f"{name!r} is a required property", at)
+            for name, sub in props.items():
+                item = self._var()
+                self.lines.append(f"{inner}if {name!r} in {var}:")
+                self.lines.append(f"{inner}    {item} = {var}[{name!r}]")
+                before = len(self.lines)
+                self.emit(sub, item, f"{path} + {('.' + name)!r}", depth + 2)
+                if len(self.lines) == before:
+                    self.lines.append(f"{inner}    pass")
+            if additional is not True:
+                known = self._const(frozenset(props))
+                key = self._var()
+                self.lines.append(f"{inner}for {key} in {var}:")
+                self.lines.append(f"{inner}    if {key} not in {known}:")
+                if additional is False:
+                    self.lines.append(
+                        f"{inner}        raise SchemaViolation("
+                        f"'additional property ' + repr({key}) + ' is not allowed' + _at({path}))"
+                    )
+                else:
+                    before = len(self.lines)
+                    self.emit(additional, f"{var}[{key}]", f"{path} + '.' + {key}", depth + 3)
+                    if len(self.lines) == before:
+                        self.lines.append(f"{inner}        pass")
+
+        items = schema.get("items")
+        if isinstance(items, dict) and items:
+            item = self._var()
+            idx = self._var()
+            self.lines.append(f"{ind}if isinstance({var}, list):")
+            self.lines.append(f"{ind}    for {idx}, {item} in enumerate({var}):")
+            before = len(self.lines)
+            self.emit(items, item, f"{path} + '[' + str({idx}) + ']'", depth + 2)
+            if len(self.lines) == before:
+                self.lines.append(f"{ind}        pass")
+        elif items is not None and not isinstance(items, dict):
+            raise NotImplementedError(["items (tuple form)"])
+
+
+def _compile_codegen(schema: Dict[str, Any]) -> Validator:
+    gen = _CodeGen()
+    gen.emit(schema, "data", "''", 1)
+    body = "\n".join(gen.lines) or "    pass"
+    source = f"def validate(data):\n{body}\n    return None\n"
+    namespace: Dict[str, Any] = dict(
+        gen.consts, SchemaViolation=SchemaViolation, _at=_at, _equal=_equal
+    )
+    exec(compile(source, "<schema>", "exec"), namespace)
+    fn = namespace["validate"]
+    fn.__source__ = source  # type: ignore[attr-defined]
+    return fn
+
+
+def _compile_fast(schema: Dict[str, Any]) -> Validator:
+    compiled = fastjsonschema.compile(schema)
+
+    def validate(data: Any) -> None:
+        try:
+            compiled(data)
+        except fastjsonschema.JsonSchemaException as exc:
+            raise SchemaViolation(exc.message) from exc
+
+    return validate
+
+
+def _compile_interpreted(schema: Dict[str, Any]) -> Validator:
+    validator = Draft7Validator(schema)
+
+    def validate(data: Any) -> None:
+        try:
+            validator.validate(data)
+        except ValidationError as exc:
+            raise SchemaViolation(exc.message) from exc
+
+    return validate
+
+
+def compile_schema(schema: Dict[str, Any], engine: str | None = None) -> Validator:
+    """Compile *schema* with *engine* (default: the fastest available).
+
+    Without an explicit engine, schemas the code generator cannot handle
+    fall back to the interpretive validator.
+    """
+
+    if engine == "fastjsonschema" or (engine is None and fastjsonschema is not None):
+        if fastjsonschema is None:
+            raise ValueError("fastjsonschema is not installed")
+        return _compile_fast(schema)
+    if engine in (None, "codegen"):
+        try:
+            return _compile_codegen(schema)
+        except NotImplementedError:
+            if engine == "codegen":
+                raise
+    elif engine != "jsonschema":
+        raise ValueError(f"unknown validation engine {engine}; expected one of {ENGINES}")
+    return _compile_interpreted(schema)
+
+
+_VALIDATORS: Dict[str, Validator] = {}
+_LOCK = threading.Lock()
+
+
+def get_validator(schema: Dict[str, Any]) -> Validator:
+    """Return the process-wide compiled validator for *schema*."""
+
+    key = schema_hash(schema)
+    validator = _VALIDATORS.get(key)
+    if validator is None:
+        with _LOCK:
+            validator = _VALIDATORS.get(key)
+            if validator is None:
+                validator = _VALIDATORS[key] = compile_schema(schema)
+    return validator
+
+
+# ----------------------------------------------------------------------
+VALIDATION_MODES = ("always", "sample:<rate>", "first:<n>")
+_COUNTERS = ("validated", "skipped", "violations")
+
+
+def parse_mode(mode: str) -> Tuple[str, float]:
+    """Split a validation mode into ``(kind, parameter)``.
+
+    Raises ``ValueError`` for anything but the forms in ``VALIDATION_MODES``.
+    """
+
+    kind, _, arg = mode.partition(":")
+    try:
+        if kind == "always" and not arg:
+            return kind, 0.0
+        if kind == "sample" and 0.0 <= float(arg) <= 1.0:
+            return kind, float(arg)
+        if kind == "first" and int(arg) >= 0:
+            return kind, float(int(arg))
+    except ValueError:
+        pass
+    raise ValueError(f"invalid validation mode {mode!r}; expected one of {VALIDATION_MODES}")
+
+
+class ValidationPolicy:
+    """Apply *validate* to all, a sample or the first calls of a tool."""
+
+    def __init__(self, validate: Validator, mode: str = "always"):
+        self.validate = validate
+        self.mode = mode
+        self.kind, self.param = parse_mode(mode)
+        self.counters: Dict[str, int] = dict.fromkeys(_COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def _due(self) -> bool:
+        if self.kind == "always":
+            return True
+        if self.kind == "sample":
+            return random.random() < self.param
+        return self.counters["validated"] < self.param
+
+    # ------------------------------------------------------------------
+    def __call__(self, data: Any) -> None:
+        with self._lock:
+            due = self._due()
+            self.counters["validated" if due else "skipped"] += 1
+        if not due:
+            return
+        try:
+            self.validate(data)
+        except SchemaViolation:
+            with self._lock:
+                self.counters["violations"] += 1
+                self.kind = "always"
+            raise
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters, mode=self.mode, active=self.kind)
+
+
+_POLICIES: Dict[Tuple[str, str, str, str], ValidationPolicy] = {}
+
+
+def validation_policy(manifest: Any, direction: str) -> ValidationPolicy:
+    """Return the process-wide policy for *manifest*'s ``input`` or ``output``."""
+
+    schema = getattr(manifest, f"{direction}_schema")
+    mode = getattr(manifest, f"validate_{direction}", "always") or "always"
+    key = (manifest.fqdn, direction, mode, schema_hash(schema))
+    policy = _POLICIES.get(key)
+    if policy is None:
+        validate = get_validator(schema)
+        with _LOCK:
+            policy = _POLICIES.setdefault(key, ValidationPolicy(validate, mode))
+    return policy
+
+
+def validation_counters(
+    tools: Iterable[Any], since: Dict[str, Dict[str, Dict[str, Any]]] | None = None
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Snapshot the policy counters of *tools* keyed by fqdn and direction.
+
+    With *since* (an earlier snapshot) the counters are returned as deltas.
+    """
+
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for tool in tools:
+        fqdn = tool.manifest.fqdn
+        for direction, attr in (("input", "_in_validator"), ("output", "_out_validator")):
+            policy = getattr(tool, attr, None)
+            if not isinstance(policy, ValidationPolicy):
+                continue
+            snap = policy.snapshot()
+            before = (since or {}).get(fqdn, {}).get(direction, {})
+            for c in _COUNTERS:
+                snap[c] -= before.get(c, 0)
+            out.setdefault(fqdn, {})[direction] = snap
+    return out
@@ -0,0 +1,316 @@
+"""Bulk pre-population of the engine cache for a corpus of contexts.
+
+:func:`warm_cache` runs a subset of a plan's nodes – typically the cheap,
+deterministic upstream ones – for every context of a corpus and writes the
+responses into the same cache, under the same keys, that
+:func:`~symphonia.runtime.engine.run_plan` would use.  A later backfill can
+then run the expensive phase with full parallelism and no cold misses.
+
+Contexts are processed in batches: within a batch every node level is
+dispatched to a thread pool at once, keys already present in the cache (or
+repeated within the batch) are skipped, and each finished batch is reported
+to an optional progress callback.  Calls to a tool with a batch endpoint
+are grouped into :meth:`~symphonia.runtime.tools.HttpTool.invoke_batch`
+requests of up to ``max_batch_size`` items.
+
+Only nodes the engine would cache are written: nodes with caching turned
+off are run solely to feed cached nodes that need them, and left out
+otherwise.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from ..registry.registry import Registry
+from ..sdk.plan_ir import Node, Plan
+from .cache import (
+    TieredCache,
+    entry_expired,
+    manifest_hash,
+    node_cache_key,
+    pack_entry,
+    unpack_entry,
+)
+from .cache_backends import open_tiered_cache
+from .cache_ledger import CacheLedger
+from .canonical import canonicalize
+from .errors import EngineError, SymphoniaError
+from .model_loader import ModelLoader
+from .preflight import preflight_build_tool_pool
+from .state import State, extract_jsonpath, interpolate
+from .tools import InprocTool, Tool
+from . import transport
+
+
+@dataclass
+class WarmReport:
+    """Outcome of a :func:`warm_cache` call."""
+
+    contexts: int = 0
+    computed: int = 0
+    skipped: int = 0
+    errors: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Contexts processed per second."""
+
+        return self.contexts / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(asdict(self), rate=self.rate)
+
+
+def _batches(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _levels(plan: Plan, nodes: List[str]) -> List[List[Node]]:
+    """Topologically grouped nodes of the selected subset."""
+
+    by_id = {n.id: n for n in plan.graph}
+    unknown = [n for n in nodes if n not in by_id]
+    if unknown:
+        raise EngineError(f"unknown nodes {unknown}")
+    selected = set(nodes)
+    for node_id in nodes:
+        missing = [d for d in by_id[node_id].needs or [] if d not in selected]
+        if missing:
+            raise EngineError(f"node {node_id} needs {missing}, which are not being warmed")
+    levels: List[List[Node]] = []
+    done: set = set()
+    while len(done) < len(selected):
+        level = [
+            by_id[n]
+            for n in nodes
+            if n not in done and all(d in done for d in by_id[n].needs or [])
+        ]
+        if not level:
+            raise EngineError("cycle in selected nodes")
+        levels.append(level)
+        done.update(n.id for n in level)
+    return levels
+
+
+def _cached_levels(
+    levels: List[List[Node]], use_cache: Callable[[Node], bool]
+) -> List[List[Node]]:
+    """*levels* without uncached nodes that no cached node depends on."""
+
+    by_id = {n.id: n for level in levels for n in level}
+    needed: set = set()
+    stack = [n.id for n in by_id.values() if use_cache(n)]
+    while stack:
+        node_id = stack.pop()
+        if node_id not in needed:
+            needed.add(node_id)
+            stack.extend(by_id[node_id].needs or [])
+    pruned = [[n for n in level if n.id in needed] for level in levels]
+    return [level for level in pruned if level]
+
+
+def warm_cache(
+    plan: Plan,
+    registry: Registry,
+    contexts: Iterable[Dict[str, Any]],
+    *,
+    nodes: List[str] | None = None,
+    runs_dir: str | Path = "runs",
+    batch_size: int = 32,
+    max_parallel: int = 8,
+    impls: Dict[str, Callable[[dict], dict]] | None = None,
+    loader: ModelLoader | None = None,
+    cache_backend: str | None = None,
+    cache_remote: str | None = None,
+    progress: Callable[[WarmReport], None] | None = None,
+) -> WarmReport:
+    """Populate the cache for *nodes* of *plan* over *contexts*.
+
+    *nodes* defaults to every node that is not side-effecting; a selected
+    node may only depend on other selected nodes.  Nodes with caching
+    turned off (``cache: false``, or no ``cache_default`` in the plan) are
+    not written.  Each tool call is a single attempt – failures are counted
+    and the context's dependent nodes are skipped.
+    """
+
+    side_effecting = {
+        n.id for n in plan.graph if "side_effecting" in (registry.resolve(n.tool).tags or [])
+    }
+    if nodes is None:
+        nodes = [n.id for n in plan.graph if n.id not in side_effecting]
+    elif side_effecting & set(nodes):
+        raise EngineError(f"cannot warm side-effecting nodes {sorted(side_effecting & set(nodes))}")
+    cache_default = bool(plan.execution and plan.execution.cache_default)
+
+    def use_cache(node: Node) -> bool:
+        return node.cache if node.cache is not None else cache_default
+
+    levels = _cached_levels(_levels(plan, nodes), use_cache)
+
+    sub_plan = Plan(version=plan.version, graph=[n for lvl in levels for n in lvl], vars=plan.vars)
+    loader = loader or ModelLoader()
+    transport.hold_clients()
+    try:
+        pool: Dict[str, Tool] = preflight_build_tool_pool(
+            sub_plan, registry, loader=loader, warmup=True
+        )
+    except Exception:
+        loader.release()
+        transport.close_clients()
+        raise
+    for key, func in (impls or {}).items():
+        if key in pool:
+            pool[key] = InprocTool(pool[key].manifest, func)
+    digests = {fqdn: manifest_hash(tool.manifest) for fqdn, tool in pool.items()}
+
+    cache_dir = Path(runs_dir) / "cache"
+    cache: TieredCache | None = None
+    written: List[Tuple[str, str]] = []
+    counters: Dict[str, Dict[str, int]] = {}
+    report = WarmReport()
+    start = time.perf_counter()
+
+    def call(items: List[Tuple[Node, Dict[str, Any]]]) -> List[Dict[str, Any] | None]:
+        """Responses for *items* of one tool, in one batch request if several."""
+
+        tool = pool[items[0][0].tool]
+        timeouts = [n.timeout_ms for n, _ in items if n.timeout_ms]
+        timeout_s = min(timeouts) / 1000.0 if timeouts else None
+        try:
+            if len(items) == 1:
+                return [tool.invoke(items[0][1], timeout_s)]
+            responses = tool.invoke_batch([p for _, p in items], timeout_s)
+        except SymphoniaError:
+            return [None] * len(items)
+        if len(responses) != len(items):
+            return [None] * len(items)
+        return [None if isinstance(r, BaseException) else r for r in responses]
+
+    def timed(items: List[Tuple[Node, Dict[str, Any]]]) -> Tuple[List[Any], int]:
+        t0 = time.perf_counter()
+        responses = call(items)
+        return responses, int((time.perf_counter() - t0) * 1000)
+
+    def chunk_size(tool: Tool) -> int:
+        if getattr(tool.manifest, "batch_endpoint", None) and hasattr(tool, "invoke_batch"):
+            return max(1, tool.manifest.max_batch_size or 1)
+        return 1
+
+    try:
+        cache = open_tiered_cache(
+            cache_dir,
+            backend=cache_backend or (plan.execution.cache_backend if plan.execution else None),
+            remote=cache_remote or (plan.execution.cache_remote if plan.execution else None),
+        )
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            for batch in _batches(contexts, batch_size):
+                states = [State(ctx, plan.vars) for ctx in batch]
+                alive = list(range(len(states)))
+                for level in levels:
+                    results: Dict[str, Tuple[Any, str | None]] = {}
+                    misses: Dict[str, Tuple[Node, Dict[str, Any]]] = {}
+                    targets: List[Tuple[int, Node, str]] = []
+                    failed: set = set()
+                    for idx in alive:
+                        state = states[idx]
+                        for node in level:
+                            manifest = pool[node.tool].manifest
+                            try:
+                                payload = interpolate(node.inputs, state)
+                                if manifest.canonicalize_invoke:
+                                    payload = canonicalize(payload, manifest.canonicalize)
+                                ck = node_cache_key(manifest, node.inputs, state, digests[node.tool])
+                            except SymphoniaError:
+                                report.errors += 1
+                                failed.add(idx)
+                                continue
+                            targets.append((idx, node, ck))
+                            if ck in results or ck in misses:
+                                continue
+                            if not use_cache(node):
+                                misses[ck] = (node, payload)
+                                continue
+                            stats = counters.setdefault(
+                                manifest.fqdn, {"hits": 0, "misses": 0, "writes": 0}
+                            )
+                            ttl = node.cache_ttl_s if node.cache_ttl_s is not None else manifest.cache_ttl_s
+                            cached, meta = unpack_entry(cache.read(ck, ttl_s=ttl))
+                            if cached is not None and not entry_expired(meta, ttl):
+                                stats["hits"] += 1
+                                report.skipped += 1
+                                results[ck] = (cached, meta.get("sha256"))
+                            else:
+                                stats["misses"] += 1
+                                misses[ck] = (node, payload)
+                    by_tool: Dict[str, List[str]] = {}
+                    for ck, (node, _) in misses.items():
+                        by_tool.setdefault(node.tool, []).append(ck)
+                    futures: List[Tuple[List[str], Future]] = []
+                    for tool_ref, cks in by_tool.items():
+                        size = chunk_size(pool[tool_ref])
+                        for i in range(0, len(cks), size):
+                            chunk = cks[i : i + size]
+                            items = [misses[ck] for ck in chunk]
+                            futures.append((chunk, executor.submit(timed, items)))
+                    for chunk, future in futures:
+                        responses, ms = future.result()
+                        for ck, response in zip(chunk, responses, strict=True):
+                            node = misses[ck][0]
+                            if response is None:
+                                report.errors += 1
+                                results[ck] = (None, None)
+                                continue
+                            if not use_cache(node):
+                                results[ck] = (response, None)
+                                continue
+                            fqdn = pool[node.tool].manifest.fqdn
+                            entry = pack_entry(response, tool=fqdn, ms=ms)
+                            cache.write(ck, entry)
+                            written.append((ck, fqdn))
+                            counters[fqdn]["writes"] += 1
+                            report.computed += 1
+                            results[ck] = (response, entry["sha256"])
+                    for idx, node, ck in targets:
+                        response, digest = results[ck]
+                        if response is None:
+                            failed.add(idx)
+                            continue
+                        expose = (
+                            {k: extract_jsonpath(response, p) for k, p in node.out.items()}
+                            if node.out
+                            else response
+                        )
+                        states[idx].set_node(
+                            node.id, expose, response=response, response_hash=digest, out=node.out
+                        )
+                    alive = [i for i in alive if i not in failed]
+                report.contexts += len(batch)
+                report.elapsed_s = time.perf_counter() - start
+                if progress is not None:
+                    progress(report)
+    finally:
+        if cache is not None:
+            cache.close()
+        loader.release()  # keep the warmed models cached but evictable
+        transport.close_clients()
+        if counters:
+            ledger = CacheLedger(cache_dir)
+            try:
+                ledger.record(written, counters)
+            finally:
+                ledger.close()
+    report.elapsed_s = time.perf_counter() - start
+    return report
@@ -0,0 +1,104 @@
+"""Content negotiation for the HTTP tool protocol.
+
+JSON stays the default and the fallback.  A manifest with
+``"wire_format": "msgpack"`` makes :class:`~symphonia.runtime.tools.HttpTool`
+send ``application/msgpack`` bodies (gzip-compressed above
+:data:`COMPRESS_THRESHOLD` bytes when ``"wire_compress": true``) and ask for
+the same back via ``Accept``.  Servers answer in whichever listed type they
+support, so a tool that only speaks JSON keeps working; one that rejects the
+request body with ``415`` is retried as JSON and remembered as JSON-only.
+
+The helpers here are shared by the client and by the reference server in
+:mod:`symphonia.tools.server`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any, Dict, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+WIRE_FORMATS = {"json": JSON, "msgpack": MSGPACK}
+COMPRESS_THRESHOLD = 1024
+
+_ALIASES = {"application/x-msgpack": MSGPACK}
+
+
+class WireFormatError(ValueError):
+    """Raised for bodies in an unsupported or undecodable content type."""
+
+
+def media_type(header: str | None) -> str:
+    """Normalise a ``Content-Type`` header to a bare media type."""
+
+    kind = (header or JSON).split(";")[0].strip().lower()
+    return _ALIASES.get(kind, kind)
+
+
+def supported(kind: str) -> bool:
+    return kind == JSON or (kind == MSGPACK and msgpack is not None)
+
+
+def encode(data: Any, kind: str) -> bytes:
+    if kind == MSGPACK and msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True)
+    if kind == JSON:
+        return json.dumps(data, separators=(",", ":")).encode()
+    raise WireFormatError(f"unsupported content type {kind}")
+
+
+def decode(body: bytes, kind: str, encoding: str | None = None) -> Any:
+    """Decode *body* sent as *kind* with optional ``Content-Encoding``."""
+
+    try:
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding not in (None, "", "identity"):
+            raise WireFormatError(f"unsupported content encoding {encoding}")
+        if kind == MSGPACK and msgpack is not None:
+            return msgpack.unpackb(body, raw=False)
+        if kind == JSON:
+            return json.loads(body or b"null")
+    except (ValueError, OSError) as exc:
+        raise WireFormatError(f"cannot decode {kind} body: {exc}") from exc
+    raise WireFormatError(f"unsupported content type {kind}")
+
+
+def accept(header: str | None) -> str:
+    """Pick the response type for an ``Accept`` header (JSON if none fits)."""
+
+    best, best_q = JSON, -1.0
+    for part in (header or "").split(","):
+        kind, *params = part.split(";")
+        kind = media_type(kind)
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if supported(kind) and q > best_q:
+            best, best_q = kind, q
+    return best
+
+
+def request_body(
+    data: Any, kind: str, *, compress: bool = False
+) -> Tuple[bytes, Dict[str, str]]:
+    """Encode a request body; return it with its headers."""
+
+    body = encode(data, kind)
+    headers = {"Content-Type": kind, "Accept": f"{kind}, {JSON};q=0.5"}
+    if compress and len(body) > COMPRESS_THRESHOLD:
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
@@ -10,9 +10,17 @@ import typer
 
 from .validate import load_plan, validate_plan
 from ..registry.registry import Registry
+from ..runtime.cache import DEFAULT_MEMORY_CACHE_BYTES
+from ..runtime.cache_ledger import CacheLedger, purge_tool
+from ..runtime.constants import CacheBackendKind
 from ..runtime.engine import run_plan
-from ..runtime.preflight import preflight_build_tool_pool
-from ..runtime.model_loader import ModelLoader
+from ..runtime.model_loader import ModelLoader, model_cache
+from ..runtime.preflight import DEFAULT_PREFLIGHT_CONCURRENCY, preflight_build_tool_pool
+from ..runtime.retention import RetentionPolicy, collect_garbage
+from ..runtime.run_index import RunIndex
+from ..runtime.stats import collect_stats, format_stats_table, parse_since
+from ..runtime.warm import WarmReport, warm_cache
+from ..tools.serve import DEFAULT_MAX_WAIT_MS, DEFAULT_TIMEOUT_S, serve_tool
 from ..runtime.errors import (
     BudgetError,
     EngineError,
@@ -28,8 +36,12 @@ from symphonia.training.train import main as train_command
 app = typer.Typer()
 plan_app = typer.Typer()
 registry_app = typer.Typer()
+runs_app = typer.Typer()
+cache_app = typer.Typer()
 app.add_typer(plan_app, name="plan")
 app.add_typer(registry_app, name="registry")
+app.add_typer(runs_app, name="runs")
+app.add_typer(cache_app, name="cache")
 app.command("train")(train_command)
 
 
@@ -80,9 +92,33 @@ def plan_run(
     max_parallel: int | None = typer.Option(None, help="Override plan max_parallel"),
     cache_read: bool = typer.Option(True, help="Enable cache reads"),
     cache_write: bool = typer.Option(True, help="Enable cache writes"),
+    cache_memory_bytes: int = typer.Option(
+        DEFAULT_MEMORY_CACHE_BYTES, help="In-memory cache tier budget (0 disables)"
+    ),
+    cache_backend: CacheBackendKind | None = typer.Option(
+        None, help="Disk cache backend (overrides the plan)"
+    ),
+    cache_remote: str | None = typer.Option(
+        None, help="Shared fsspec cache URL, e.g. s3://bucket/cache (overrides the plan)"
+    ),
     no_warmup: bool = typer.Option(False, help="Skip model warmup"),
+    preflight_concurrency: int = typer.Option(
+        DEFAULT_PREFLIGHT_CONCURRENCY, help="Tools to resolve and load at once during preflight"
+    ),
+    model_cache_mb: float | None = typer.Option(
+        None, help="Model cache budget in MiB; idle models beyond it are evicted"
+    ),
     emit_summary: bool = typer.Option(False, help="Emit one-line summary"),
+    gc_max_age_days: float | None = typer.Option(None, help="After the run, delete runs older than this"),
+    gc_max_bytes: int | None = typer.Option(None, help="After the run, keep runs under this many bytes"),
+    gc_max_runs: int | None = typer.Option(None, help="After the run, keep at most this many runs"),
 ) -> None:
+    retention = None
+    if gc_max_age_days is not None or gc_max_bytes is not None or gc_max_runs is not None:
+        retention = RetentionPolicy(
+            max_age_days=gc_max_age_days, max_bytes=gc_max_bytes, max_runs=gc_max_runs
+        )
+    model_cache().budget_mb = model_cache_mb
     try:
         reg = Registry(registry)
         p = load_plan(plan)
@@ -100,6 +136,11 @@ def plan_run(
             cache_write=cache_write,
             loader=ModelLoader(),
             warmup=not no_warmup,
+            retention=retention,
+            cache_memory_bytes=cache_memory_bytes,
+            cache_backend=cache_backend,
+            cache_remote=cache_remote,
+            preflight_concurrency=preflight_concurrency,
         )
     except SymphoniaError as exc:
         _exit_err(exc)
@@ -117,23 +158,255 @@ def plan_check_models(
     plan: Path,
     registry: Path,
     no_warmup: bool = typer.Option(False, help="Skip model warmup"),
+    concurrency: int = typer.Option(
+        DEFAULT_PREFLIGHT_CONCURRENCY, help="Tools to resolve and load at once"
+    ),
 ) -> None:
     try:
         reg = Registry(registry)
         p = load_plan(plan)
         validate_plan(p, reg)
-        preflight_build_tool_pool(p, reg, loader=ModelLoader(), warmup=not no_warmup)
+        loader = ModelLoader()
+        preflight_build_tool_pool(
+            p, reg, loader=loader, warmup=not no_warmup, concurrency=concurrency
+        )
+        loader.release()  # keep the models cached for a later run in this process
     except SymphoniaError as exc:
         _exit_err(exc)
     typer.echo("ok")
 
 
 @registry_app.command("health")
-def registry_health(registry: Path, base_url: str | None = None) -> None:
+def registry_health(
+    registry: Path,
+    base_url: str | None = None,
+    concurrency: int = typer.Option(16, help="Probes in flight at once"),
+    timeout: float = typer.Option(2.0, help="Per-probe timeout in seconds"),
+    max_age: float = typer.Option(0.0, help="Reuse results younger than this (seconds)"),
+) -> None:
     reg = Registry(registry)
-    result = reg.health(base_url)
+    result = reg.health(base_url, max_age_s=max_age, timeout_s=timeout, concurrency=concurrency)
     typer.echo(json.dumps(result, indent=2))
 
 
+@app.command("serve-tool")
+def serve_tool_command(
+    fqdn: str,
+    registry: Path,
+    host: str = typer.Option("127.0.0.1", help="TCP host to bind"),
+    port: int = typer.Option(0, help="TCP port to bind (0 picks a free port)"),
+    uds: Path | None = typer.Option(None, help="Serve on this Unix socket instead of TCP"),
+    max_batch_size: int = typer.Option(32, help="Largest batch passed to the tool"),
+    max_wait_ms: float = typer.Option(DEFAULT_MAX_WAIT_MS, help="Batching window"),
+    timeout: float = typer.Option(DEFAULT_TIMEOUT_S, help="Per-request timeout in seconds"),
+    manifest_out: Path | None = typer.Option(
+        None, help="Write the equivalent http manifest here (a file or registry directory)"
+    ),
+    no_warmup: bool = typer.Option(False, help="Skip model warmup"),
+) -> None:
+    """Load an in-proc tool once and serve it to engine processes."""
+
+    try:
+        server, batcher, manifest = serve_tool(
+            Registry(registry),
+            fqdn,
+            host=host,
+            port=port,
+            uds=uds,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            timeout_s=timeout,
+            loader=ModelLoader(),
+            warmup=not no_warmup,
+        )
+    except SymphoniaError as exc:
+        _exit_err(exc)
+        return
+    if manifest_out is not None:
+        path = manifest_out / f"{fqdn}.json" if manifest_out.is_dir() else manifest_out
+        path.write_text(json.dumps(manifest, indent=2))
+        typer.echo(f"wrote {path}", err=True)
+    else:
+        typer.echo(json.dumps(manifest, indent=2))
+    typer.echo(f"serving {fqdn} on {server.url}", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover - interactive
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+def _require_dir(path: Path, what: str) -> None:
+    """Exit instead of letting a read-only command create *path*."""
+
+    if not path.is_dir():
+        typer.echo(f"no {what} at {path}", err=True)
+        raise typer.Exit(1)
+
+
+@runs_app.command("ls")
+def runs_ls(
+    runs: Path = Path("runs"),
+    status: str | None = typer.Option(None, help="Only list runs with this status"),
+    limit: int = typer.Option(20, help="Maximum number of runs to list"),
+    as_json: bool = typer.Option(False, "--json", help="Emit JSON instead of a table"),
+) -> None:
+    # Listing must not create the runs root or its index.
+    rows = RunIndex(runs).query(status=status, limit=limit) if runs.is_dir() else []
+    if as_json:
+        typer.echo(json.dumps(rows, indent=2))
+        return
+    for row in rows:
+        total = "-" if row["total_ms"] is None else f"{row['total_ms']}ms"
+        typer.echo(
+            f"{row['run_id']:<12} {row['status']:<8} {row['created_at']:<32} "
+            f"{total:>10}  {row['stop_reason'] or ''}"
+        )
+
+
+@runs_app.command("show")
+def runs_show(run_id: str, runs: Path = Path("runs")) -> None:
+    row = RunIndex(runs).get(run_id) if runs.is_dir() else None
+    if row is None:
+        typer.echo(f"unknown run {run_id}", err=True)
+        raise typer.Exit(1)
+    typer.echo(json.dumps(row, indent=2))
+
+
+@runs_app.command("gc")
+def runs_gc(
+    runs: Path = Path("runs"),
+    max_age_days: float | None = typer.Option(None, help="Delete runs older than this"),
+    max_bytes: int | None = typer.Option(None, help="Total bytes budget for runs"),
+    max_runs: int | None = typer.Option(None, help="Maximum number of runs to keep"),
+    keep_failed: bool = typer.Option(True, help="Never delete failed runs"),
+    pin: list[str] = typer.Option([], help="Run id that must be kept (repeatable)"),
+    cache_max_bytes: int | None = typer.Option(None, help="Bytes budget for runs/cache"),
+    cache_max_age_days: float | None = typer.Option(None, help="Delete cache entries older than this"),
+    dry_run: bool = typer.Option(False, help="Report what would be deleted"),
+) -> None:
+    _require_dir(runs, "runs")
+    policy = RetentionPolicy(
+        max_age_days=max_age_days,
+        max_bytes=max_bytes,
+        max_runs=max_runs,
+        keep_failed=keep_failed,
+        pinned=pin,
+        cache_max_bytes=cache_max_bytes,
+        cache_max_age_days=cache_max_age_days,
+    )
+    report = collect_garbage(runs, policy, dry_run=dry_run)
+    typer.echo(json.dumps(report.to_dict(), indent=2))
+
+
+@runs_app.command("stats")
+def runs_stats(
+    runs: Path = Path("runs"),
+    since: str | None = typer.Option(None, help="Window start: ISO timestamp or 7d/12h/30m"),
+    until: str | None = typer.Option(None, help="Window end: ISO timestamp or 7d/12h/30m"),
+    tool: str | None = typer.Option(None, help="Only aggregate this tool fqdn"),
+    bucket: str = typer.Option("day", help="Throughput window: hour, day or week"),
+    as_json: bool = typer.Option(False, "--json", help="Emit JSON instead of a table"),
+) -> None:
+    _require_dir(runs, "runs")
+    try:
+        stats = collect_stats(
+            runs,
+            since=parse_since(since) if since else None,
+            until=parse_since(until) if until else None,
+            tool=tool,
+            bucket=bucket,
+        )
+    except ValueError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1)
+    if as_json:
+        typer.echo(json.dumps(stats, indent=2))
+    else:
+        typer.echo(format_stats_table(stats))
+
+
+@cache_app.command("purge")
+def cache_purge(
+    tool: str = typer.Option(..., help="Tool fqdn, or bare name for all versions"),
+    runs: Path = Path("runs"),
+    remote: str | None = typer.Option(None, help="Also purge this fsspec cache URL"),
+) -> None:
+    removed = purge_tool(runs / "cache", tool, remote=remote)
+    typer.echo(json.dumps({"tool": tool, "removed": removed}))
+
+
+@cache_app.command("warm")
+def cache_warm(
+    plan: Path,
+    registry: Path,
+    corpus: Path = typer.Option(..., help="JSONL file with one context object per line"),
+    node: list[str] = typer.Option([], help="Node to warm (repeatable; default: all cacheable)"),
+    runs: Path = Path("runs"),
+    batch_size: int = typer.Option(32, help="Contexts per batch"),
+    max_parallel: int = typer.Option(8, help="Concurrent tool calls"),
+    cache_backend: CacheBackendKind | None = typer.Option(
+        None, help="Disk cache backend (overrides the plan)"
+    ),
+    cache_remote: str | None = typer.Option(None, help="Shared fsspec cache URL (overrides the plan)"),
+) -> None:
+    def contexts():
+        with corpus.open() as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+    def progress(report: WarmReport) -> None:
+        typer.echo(
+            f"{report.contexts} contexts  computed={report.computed} "
+            f"skipped={report.skipped} errors={report.errors}  {report.rate:.1f} ctx/s",
+            err=True,
+        )
+
+    try:
+        reg = Registry(registry)
+        p = load_plan(plan)
+        validate_plan(p, reg)
+        report = warm_cache(
+            p,
+            reg,
+            contexts(),
+            nodes=node or None,
+            runs_dir=runs,
+            batch_size=batch_size,
+            max_parallel=max_parallel,
+            loader=ModelLoader(),
+            cache_backend=cache_backend,
+            cache_remote=cache_remote,
+            progress=progress,
+        )
+    except SymphoniaError as exc:
+        _exit_err(exc)
+        return
+    typer.echo(json.dumps(report.to_dict()))
+
+
+@cache_app.command("stats")
+def cache_stats(
+    runs: Path = Path("runs"),
+    as_json: bool = typer.Option(False, "--json", help="Emit JSON instead of a table"),
+) -> None:
+    _require_dir(runs / "cache", "cache")
+    ledger = CacheLedger(runs / "cache")
+    stats = ledger.tool_stats()
+    ledger.close()
+    if as_json:
+        typer.echo(json.dumps(stats, indent=2))
+        return
+    typer.echo(f"{'tool':<24} {'hits':>8} {'misses':>8} {'hit%':>6} {'bytes':>12} {'saved_ms':>10}")
+    for name, s in stats.items():
+        typer.echo(
+            f"{name:<24} {s['hits']:>8} {s['misses']:>8} {s['hit_ratio'] * 100:>6.1f} "
+            f"{s['bytes_served']:>12} {s['ms_saved']:>10}"
+        )
+
+
 if __name__ == "__main__":  # pragma: no cover
     app()
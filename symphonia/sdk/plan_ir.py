@@ -24,6 +24,7 @@ class Node:
     needs: List[str] | None = None
     out: Dict[str, str] | None = None
     cache: Optional[bool] = None
+    cache_ttl_s: Optional[float] = None
     timeout_ms: Optional[int] = None
     retry: Optional["RetryPolicy"] = None
     concurrency: Optional[int] = None
@@ -42,6 +43,8 @@ class Execution:
     max_parallel: Optional[int] = None
     cache_default: Optional[bool] = None
     retry_default: Optional[RetryPolicy] = None
+    cache_backend: Optional[str] = None
+    cache_remote: Optional[str] = None
 
 
 @dataclass
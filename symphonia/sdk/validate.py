@@ -45,6 +45,8 @@ def _from_dict(data: Dict) -> Plan:
             max_parallel=execution.get("max_parallel"),
             cache_default=execution.get("cache_default"),
             retry_default=retry_def_obj,
+            cache_backend=execution.get("cache_backend"),
+            cache_remote=execution.get("cache_remote"),
         )
     else:
         execution_obj = None
@@ -59,6 +61,7 @@ def _from_dict(data: Dict) -> Plan:
             needs=n.get("needs"),
             out=n.get("out"),
             cache=n.get("cache"),
+            cache_ttl_s=n.get("cache_ttl_s"),
             timeout_ms=n.get("timeout_ms"),
             retry=retry_obj,
             concurrency=n.get("concurrency"),
@@ -0,0 +1,214 @@
+"""Serve a registry in-proc tool to many engine processes.
+
+Every engine process that runs an ``inproc`` tool loads its own copy of the
+model.  :func:`serve_tool` loads it once and exposes it through the
+reference servers in :mod:`symphonia.tools.server`, over TCP or a Unix
+socket.  :func:`http_manifest` builds the equivalent ``kind: http``
+manifest that engine processes then resolve instead of the in-proc one.
+
+Requests are batched dynamically: handler threads queue their payloads and
+a single worker thread runs whatever has accumulated – up to
+``max_batch_size`` items, waiting at most ``max_wait_ms`` for more once the
+first arrives – through the tool's ``invoke_batch`` when it has one and item by item
+otherwise.  The model is therefore only ever used from one thread.  An
+in-proc tool gets ``invoke_batch`` by passing a batch function to
+:class:`~symphonia.runtime.tools.InprocTool` from its factory (see
+:mod:`symphonia.tools.stubs.entity_linker`).  Callers wait at most
+``timeout_s`` for their result; a request still queued by then is dropped.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..registry.manifest import ToolManifest
+from ..registry.registry import Registry
+from ..runtime.errors import RegistryError, ToolCallError, copies_of
+from ..runtime.model_loader import ModelLoader
+from ..runtime.preflight import build_tool
+from ..runtime.transport import is_unix
+from .server import ToolServer, UnixToolServer, error_body
+
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_TIMEOUT_S = 60.0
+
+
+class DynamicBatcher:
+    """Run queued payloads through *tool* in batches on one worker thread."""
+
+    def __init__(
+        self,
+        tool: Any,
+        *,
+        max_batch_size: int = 32,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        timeout_s: float | None = DEFAULT_TIMEOUT_S,
+    ):
+        self.tool = tool
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.timeout_s = timeout_s
+        self.counters: Dict[str, int] = {"batches": 0, "items": 0, "max_batch": 0}
+        self._queue: "queue.Queue[Tuple[dict, Future] | None]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    # ------------------------------------------------------------------
+    def submit(self, payload: dict) -> Future:
+        future: Future = Future()
+        self._queue.put((payload, future))
+        return future
+
+    # ------------------------------------------------------------------
+    def _result(self, future: Future, deadline: float | None) -> dict:
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise ToolCallError(
+                status=504, message=f"no result within {self.timeout_s}s"
+            ) from None
+
+    # ------------------------------------------------------------------
+    def _deadline(self) -> float | None:
+        return None if self.timeout_s is None else time.monotonic() + self.timeout_s
+
+    # ------------------------------------------------------------------
+    def invoke(self, payload: dict) -> dict:
+        """Blocking single call; raises the tool's error or a 504 on timeout."""
+
+        return self._result(self.submit(payload), self._deadline())
+
+    # ------------------------------------------------------------------
+    def invoke_batch(self, payloads: List[dict]) -> List[Dict[str, Any]]:
+        """Blocking batch call returning batch-endpoint items."""
+
+        deadline = self._deadline()
+        out: List[Dict[str, Any]] = []
+        for future in [self.submit(p) for p in payloads]:
+            try:
+                out.append({"output": self._result(future, deadline)})
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                out.append({"error": error_body(exc)})
+        return out
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    # ------------------------------------------------------------------
+    def _collect(self, first: Tuple[dict, Future]) -> Tuple[List[Tuple[dict, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(timeout, 0.0))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self.counters["batches"] += 1
+            self.counters["items"] += len(batch)
+            self.counters["max_batch"] = max(self.counters["max_batch"], len(batch))
+            payloads = [p for p, _ in batch]
+            results: List[Any]
+            if len(batch) > 1 and hasattr(self.tool, "invoke_batch"):
+                try:
+                    results = self.tool.invoke_batch(payloads)
+                except Exception as exc:  # noqa: BLE001 - delivered to every caller
+                    results = copies_of(exc, len(batch))
+            else:
+                results = []
+                for payload in payloads:
+                    try:
+                        results.append(self.tool.invoke(payload))
+                    except Exception as exc:  # noqa: BLE001 - delivered to its caller
+                        results.append(exc)
+            if len(results) != len(batch):
+                mismatch = ToolCallError(
+                    status=500,
+                    message=f"batch returned {len(results)} results for {len(batch)} calls",
+                )
+                results = copies_of(mismatch, len(batch))
+            for (_, future), result in zip(batch, results, strict=True):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+def http_manifest(
+    manifest: ToolManifest, endpoint: str, *, max_batch_size: int = 32
+) -> Dict[str, Any]:
+    """Return the ``kind: http`` manifest serving *manifest* at *endpoint*."""
+
+    data = asdict(manifest)
+    data.update(
+        kind="http",
+        endpoint=endpoint,
+        batch_endpoint=f"{endpoint}:/batch" if is_unix(endpoint) else f"{endpoint}/batch",
+        max_batch_size=max_batch_size,
+        entrypoint=None,
+        model=None,
+    )
+    return {k: v for k, v in data.items() if v is not None}
+
+
+def serve_tool(
+    registry: Registry,
+    fqdn: str,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    uds: str | Path | None = None,
+    max_batch_size: int = 32,
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    timeout_s: float | None = DEFAULT_TIMEOUT_S,
+    loader: ModelLoader | None = None,
+    warmup: bool = True,
+) -> Tuple[ToolServer | UnixToolServer, DynamicBatcher, Dict[str, Any]]:
+    """Load *fqdn* once and return ``(server, batcher, http manifest)``.
+
+    The server is not started: call ``serve_forever()`` or use it as a
+    context manager to serve from a background thread.
+    """
+
+    manifest = registry.resolve(fqdn)
+    if manifest.kind != "inproc":
+        raise RegistryError(f"{fqdn} is a {manifest.kind} tool; only inproc tools can be served")
+    tool = build_tool(manifest, loader=loader or ModelLoader(), warmup=warmup)
+    batcher = DynamicBatcher(
+        tool, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, timeout_s=timeout_s
+    )
+    if uds is not None:
+        server: ToolServer | UnixToolServer = UnixToolServer(
+            batcher.invoke, uds, batch_handler=batcher.invoke_batch
+        )
+    else:
+        server = ToolServer(
+            batcher.invoke, host=host, port=port, batch_handler=batcher.invoke_batch
+        )
+    return server, batcher, http_manifest(manifest, server.url, max_batch_size=max_batch_size)
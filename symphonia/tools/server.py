@@ -0,0 +1,221 @@
+"""Reference HTTP server for the tool protocol.
+
+:class:`ToolServer` exposes a Python callable the way an HTTP specialist
+would: ``POST /`` runs one payload, ``POST /batch`` runs a JSON array of
+payloads (see :meth:`~symphonia.runtime.tools.HttpTool.invoke_batch`) and
+``GET /health`` answers ``200``.  Request and response bodies are negotiated
+with :mod:`symphonia.runtime.wire`, so the same server handles JSON clients
+and ``wire_format: msgpack`` clients.  :class:`UnixToolServer` serves the
+same protocol on a Unix domain socket for ``unix://`` endpoints.  Both use
+only the standard library and are meant as local stand-ins for tests,
+benchmarks and development::
+
+    with ToolServer(run) as server:
+        manifest.endpoint = server.url
+"""
+
+from __future__ import annotations
+
+import gzip
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Callable, Dict, List
+
+from ..runtime import wire
+from ..runtime.transport import UNIX_SCHEME
+from ..runtime.errors import SchemaError, ToolCallError
+
+Handler = Callable[[dict], dict]
+BatchHandler = Callable[[List[dict]], List[Dict[str, Any]]]
+
+BATCH_PATH = "/batch"
+HEALTH_PATH = "/health"
+
+
+def error_body(exc: Exception) -> Dict[str, Any]:
+    """The ``error`` object reported for *exc*."""
+
+    status = exc.status if isinstance(exc, ToolCallError) else None
+    if status is None:
+        status = 400 if isinstance(exc, SchemaError) else 500
+    return {"message": str(exc), "status": status}
+
+
+def map_batch(handler: Handler) -> BatchHandler:
+    """Build a batch handler that calls *handler* once per item."""
+
+    def run(payloads: List[dict]) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for payload in payloads:
+            try:
+                out.append({"output": handler(payload)})
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                out.append({"error": error_body(exc)})
+        return out
+
+    return run
+
+
+class ToolRequestHandler(BaseHTTPRequestHandler):
+    """Serve one tool; the callables live on the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        if self.connection.family in (socket.AF_INET, socket.AF_INET6):
+            # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls.
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    # ------------------------------------------------------------------
+    def _reply(self, status: int, data: Any, kind: str = wire.JSON) -> None:
+        body = wire.encode(data, kind)
+        self.send_response(status)
+        self.send_header("Content-Type", kind)
+        if len(body) > wire.COMPRESS_THRESHOLD and "gzip" in self.headers.get(
+            "Accept-Encoding", ""
+        ):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # ------------------------------------------------------------------
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.rstrip("/").endswith(HEALTH_PATH):
+            self._reply(200, {"status": "ok"})
+        else:
+            self._reply(404, {"error": {"message": "not found", "status": 404}})
+
+    # ------------------------------------------------------------------
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        kind = wire.media_type(self.headers.get("Content-Type"))
+        if not wire.supported(kind):
+            self._reply(415, {"error": {"message": f"unsupported {kind}", "status": 415}})
+            return
+        reply = wire.accept(self.headers.get("Accept"))
+        try:
+            data = wire.decode(raw, kind, self.headers.get("Content-Encoding"))
+        except wire.WireFormatError as exc:
+            self._reply(400, {"error": {"message": str(exc), "status": 400}}, reply)
+            return
+
+        server: _ToolServing = self.server  # type: ignore[assignment]
+        if self.path.rstrip("/").endswith(BATCH_PATH):
+            if not isinstance(data, list):
+                self._reply(400, {"error": {"message": "expected an array", "status": 400}}, reply)
+                return
+            self._reply(200, server.batch_handler(data), reply)
+            return
+        try:
+            self._reply(200, server.handler(data), reply)
+        except Exception as exc:  # noqa: BLE001 - reported to the client
+            error = error_body(exc)
+            self._reply(error["status"], {"error": error}, reply)
+
+
+class _ToolServing:
+    """Handler storage and background-thread lifecycle for tool servers."""
+
+    handler: Handler
+    batch_handler: BatchHandler
+    _thread: threading.Thread | None = None
+
+    def _init_tool(self, handler: Handler, batch_handler: BatchHandler | None) -> None:
+        self.handler = handler
+        self.batch_handler = batch_handler or map_batch(handler)
+        self._connections: set = set()
+
+    def finish_request(self, request: Any, client_address: Any) -> None:
+        self._connections.add(request)
+        try:
+            super().finish_request(request, client_address)  # type: ignore[misc]
+        finally:
+            self._connections.discard(request)
+
+    # ------------------------------------------------------------------
+    def start(self):
+        """Serve from a daemon thread; returns ``self``."""
+
+        serve = self.serve_forever  # type: ignore[attr-defined]
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        return self
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        if self._thread is not None:
+            self.shutdown()  # type: ignore[attr-defined]
+            self._thread.join()
+            self._thread = None
+        # Drop keep-alive connections so clients see the server go away.
+        for conn in list(self._connections):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.server_close()  # type: ignore[attr-defined]
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class ToolServer(_ToolServing, ThreadingHTTPServer):
+    """Threaded TCP server running *handler* (and *batch_handler*) per request."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        handler: Handler,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        batch_handler: BatchHandler | None = None,
+    ):
+        super().__init__((host, port), ToolRequestHandler)
+        self._init_tool(handler, batch_handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class UnixToolServer(_ToolServing, ThreadingMixIn, UnixStreamServer):
+    """Like :class:`ToolServer`, listening on the Unix socket *path*."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, handler: Handler, path: str | Path, *, batch_handler: BatchHandler | None = None
+    ):
+        self.path = Path(path)
+        if self.path.is_socket():
+            self.path.unlink()
+        super().__init__(str(self.path), ToolRequestHandler)
+        self._init_tool(handler, batch_handler)
+
+    @property
+    def url(self) -> str:
+        return f"{UNIX_SCHEME}{self.path}"
+
+    def close(self) -> None:
+        super().close()
+        self.path.unlink(missing_ok=True)
@@ -1,5 +1,7 @@
 """Stub entity linker mapping mentions to lowercase identifiers."""
 
+from typing import List
+
 from symphonia.runtime.tools import InprocTool
 
 
@@ -10,5 +12,13 @@ def run(payload: dict) -> dict:
     return {"entities": entities}
 
 
+def run_batch(payloads: List[dict]) -> List[dict]:
+    """Link several payloads in one pass, as a model would in one forward call."""
+
+    mentions = [m for p in payloads for m in p["mentions"]]
+    linked = iter({"mention": m, "entity": m.lower()} for m in mentions)
+    return [{"entities": [next(linked) for _ in p["mentions"]]} for p in payloads]
+
+
 def factory(manifest, loader, preloaded=None):  # pragma: no cover - simple stub
-    return InprocTool(manifest, run)
+    return InprocTool(manifest, run, run_batch)
@@ -1,4 +1,26 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from symphonia.runtime import transport  # noqa: E402
+from symphonia.runtime.model_loader import model_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_model_cache():
+    """Tests monkeypatch the model classes, so cached models must not leak."""
+
+    model_cache().clear()
+    yield
+    model_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def _close_socket_clients():
+    """Socket clients are process-wide but the servers they talk to are not."""
+
+    yield
+    transport.close_clients()
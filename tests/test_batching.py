@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import types
+
+import httpx
+import pytest
+
+from symphonia.registry.manifest import ToolManifest
+from symphonia.registry.registry import Registry
+from symphonia.runtime.batching import MicroBatcher
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.errors import SchemaError, ToolCallError
+from symphonia.runtime.model_loader import ModelLoader
+from symphonia.runtime.tools import HttpTool
+from symphonia.sdk.plan_ir import Node, Plan
+
+MANIFEST = {
+    "name": "linker",
+    "version": "v1",
+    "kind": "http",
+    "endpoint": "http://server/link",
+    "batch_endpoint": "http://server/link/batch",
+    "max_batch_size": 8,
+    "input_schema": {"type": "object", "required": ["m"]},
+    "output_schema": {"type": "object", "required": ["id"]},
+}
+
+
+class FakeServer:
+    def __init__(self) -> None:
+        self.calls = []
+
+    @staticmethod
+    def item(mention):
+        if mention == "?":
+            return {"error": {"message": "unknown", "status": 404}}
+        return {"output": {} if mention == "bad" else {"id": mention.upper()}}
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append((url, json))
+        if url.endswith("/batch"):
+            body = [self.item(p["m"]) for p in json]
+        else:
+            body = {"id": json["m"].upper()}
+        return httpx.Response(200, json=body, request=httpx.Request("POST", url))
+
+
+def test_invoke_batch_maps_items(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = FakeServer()
+    monkeypatch.setattr(httpx, "post", server.post)
+    tool = HttpTool(ToolManifest(**MANIFEST))
+
+    out = tool.invoke_batch([{"m": "a"}, {}, {"m": "?"}, {"m": "bad"}, {"m": "b"}])
+    assert out[0] == {"id": "A"} and out[4] == {"id": "B"}
+    assert isinstance(out[1], SchemaError) and "input" in str(out[1])
+    assert isinstance(out[2], ToolCallError) and out[2].status == 404
+    assert isinstance(out[3], SchemaError) and "output" in str(out[3])
+    # the invalid input was never sent
+    sent = [{"m": "a"}, {"m": "?"}, {"m": "bad"}, {"m": "b"}]
+    assert server.calls == [(MANIFEST["batch_endpoint"], sent)]
+
+
+def test_engine_batches_pending_calls(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    (reg_dir / "linker.v1.json").write_text(json.dumps(MANIFEST))
+    server = FakeServer()
+    monkeypatch.setattr(httpx, "post", server.post)
+
+    plan = Plan(
+        version="0.1",
+        graph=[Node(id=f"n{i}", tool="linker.v1", inputs={"m": f"x{i}"}) for i in range(5)],
+    )
+    summary, err = run_plan(
+        plan,
+        {},
+        Registry(reg_dir),
+        runs_dir=tmp_path / "runs",
+        max_parallel=8,
+        loader=ModelLoader(),
+        warmup=False,
+        cache_read=False,
+    )
+    assert err is None
+    assert [url for url, _ in server.calls] == [MANIFEST["batch_endpoint"]]
+    assert sorted(p["m"] for p in server.calls[0][1]) == [f"x{i}" for i in range(5)]
+    metrics_path = next((tmp_path / "runs").glob("*/*/metrics.json"))
+    metrics = json.loads(metrics_path.read_text())
+    assert metrics["batching"]["linker.v1"]["batched_calls"] == 5
+
+
+def test_failed_batches_give_each_caller_its_own_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    def down(url, json=None, timeout=None):
+        return httpx.Response(503, text="busy", request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx, "post", down)
+    out = HttpTool(ToolManifest(**MANIFEST)).invoke_batch([{"m": "a"}, {"m": "b"}])
+    assert all(isinstance(e, ToolCallError) and e.status == 503 for e in out)
+    assert out[0] is not out[1]
+
+    def invoke_batch(payloads, timeout_s):
+        raise ToolCallError(status=500, message="boom")
+
+    tool = types.SimpleNamespace(
+        manifest=types.SimpleNamespace(max_batch_size=2), invoke_batch=invoke_batch
+    )
+
+    async def main():
+        batcher = MicroBatcher(tool)
+        return await asyncio.gather(
+            batcher.invoke({"m": "a"}), batcher.invoke({"m": "b"}), return_exceptions=True
+        )
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, ToolCallError) and str(first) == str(second) == "boom (status=500)"
+    assert first is not second
+
+
+def test_short_batch_results_fail_every_caller() -> None:
+    def invoke_batch(payloads, timeout_s):
+        return [{"id": "A"}]  # one result for two calls
+
+    tool = types.SimpleNamespace(
+        manifest=types.SimpleNamespace(max_batch_size=2), invoke_batch=invoke_batch
+    )
+
+    async def main():
+        batcher = MicroBatcher(tool)
+        return await asyncio.gather(
+            batcher.invoke({"m": "a"}), batcher.invoke({"m": "b"}), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ToolCallError) for r in results)
+    assert "1 results for 2 calls" in str(results[0])
+
+
+def test_batch_response_of_wrong_length_fails_every_item(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def short(url, json=None, timeout=None):
+        body = [{"output": {"id": "A"}}]
+        return httpx.Response(200, json=body, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx, "post", short)
+    out = HttpTool(ToolManifest(**MANIFEST)).invoke_batch([{"m": "a"}, {"m": "b"}])
+    assert all(isinstance(e, ToolCallError) for e in out)
+    assert "does not match" in str(out[1])
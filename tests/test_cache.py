@@ -1,5 +1,21 @@
+import asyncio
+import json
+import threading
 import time
-from symphonia.runtime.cache import cache_key, SimpleCache
+
+import pytest
+
+from symphonia.runtime.cache import AsyncCache, MemoryCache, SimpleCache, TieredCache, cache_key
+from symphonia.runtime.cache_format import (
+    CacheFormatError,
+    Compression,
+    HEADER_SIZE,
+    decode_entry,
+    encode_entry,
+)
+
+# Budget that holds exactly two of the small entries used below.
+TWO_ENTRIES = 2 * len(encode_entry({"v": "a"}))
 
 
 def test_cache_key_stability() -> None:
@@ -13,12 +29,163 @@ def test_cache_key_stability() -> None:
 
 
 def test_cache_eviction(tmp_path) -> None:
-    cache = SimpleCache(tmp_path, max_bytes=20)
+    cache = SimpleCache(tmp_path, max_bytes=TWO_ENTRIES)
     cache.write("a", {"v": "a"})
     time.sleep(0.01)
     cache.write("b", {"v": "b"})
     time.sleep(0.01)
     cache.write("c", {"v": "c"})
-    files = {p.name for p in tmp_path.glob("*.json")}
+    files = {p.name for p in tmp_path.rglob("*.json")}
     assert "a.json" not in files  # oldest evicted
     assert "b.json" in files and "c.json" in files
+    assert cache.total_bytes() <= TWO_ENTRIES
+
+
+def test_write_and_concurrent_eviction_keep_index_consistent(tmp_path, monkeypatch) -> None:
+    writer = SimpleCache(tmp_path)
+    evictor = SimpleCache(tmp_path)
+    writer.write("a", {"v": "old"})
+    threads = []
+    replace = type(tmp_path).replace
+
+    def replace_then_evict(self, target):
+        result = replace(self, target)
+        if not threads:  # another process evicts right after the rename
+            threads.append(threading.Thread(target=evictor.prune, kwargs={"max_bytes": 0}))
+            threads[0].start()
+            threads[0].join(0.2)
+        return result
+
+    monkeypatch.setattr(type(tmp_path), "replace", replace_then_evict)
+    writer.write("a", {"v": "new"})
+    threads[0].join()
+    indexed = writer._db.execute("SELECT key FROM entries").fetchall()
+    assert bool(indexed) == writer._path("a").exists()
+    assert writer.total_bytes() == sum(p.stat().st_size for p in tmp_path.rglob("*.json"))
+
+
+def test_prune_drops_rows_of_missing_files(tmp_path) -> None:
+    cache = SimpleCache(tmp_path)
+    cache.write("a", {"v": "a"})
+    cache.write("b", {"v": "b"})
+    cache._path("a").unlink()
+    cache.prune()
+    assert [r["key"] for r in cache._db.execute("SELECT key FROM entries")] == ["b"]
+    assert cache.total_bytes() == cache._path("b").stat().st_size
+
+
+def test_cache_eviction_is_lru_by_access(tmp_path) -> None:
+    cache = SimpleCache(tmp_path, max_bytes=TWO_ENTRIES)
+    cache.write("aa", {"v": "a"})
+    time.sleep(0.01)
+    cache.write("bb", {"v": "b"})
+    time.sleep(0.01)
+    assert cache.read("aa") == {"v": "a"}  # aa is now more recent than bb
+    time.sleep(0.01)
+    cache.write("cc", {"v": "c"})
+    assert cache.read("bb") is None
+    assert cache.read("aa") is not None
+    assert (tmp_path / "cc" / "cc.json").exists()  # sharded by key prefix
+
+
+def test_cache_adopts_flat_legacy_entries(tmp_path) -> None:
+    (tmp_path / "abcdef.json").write_text('{"v":1}')
+    cache = SimpleCache(tmp_path)
+    assert cache.read("abcdef") == {"v": 1}
+    assert not (tmp_path / "abcdef.json").exists()
+    assert cache.total_bytes() == 7
+
+
+def test_memory_cache_byte_budget() -> None:
+    mem = MemoryCache(max_bytes=20)
+    mem.write("a", {"v": "a"})  # 9 bytes serialized
+    mem.write("b", {"v": "b"})
+    assert mem.read("a") == {"v": "a"}  # refresh a; b is now least recent
+    mem.write("c", {"v": "c"})
+    assert mem.read("b") is None
+    assert mem.read("a") is not None and mem.read("c") is not None
+    assert mem.bytes <= 20
+
+
+def test_memory_cache_readers_get_copies() -> None:
+    mem = MemoryCache()
+    mem.write("k", {"mentions": ["a"]})
+    mem.read("k")["mentions"].append("mutated")
+    assert mem.read("k") == {"mentions": ["a"]}
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path, monkeypatch) -> None:
+    disk = SimpleCache(tmp_path)
+    disk.write("k", {"v": 1})
+    cache = TieredCache([("memory", MemoryCache()), ("disk", disk)])
+    assert cache.read("k") == {"v": 1}
+
+    def no_disk(key):
+        raise AssertionError("disk touched")
+
+    monkeypatch.setattr(disk, "read", no_disk)
+    assert cache.read("k") == {"v": 1}
+    stats = cache.stats()
+    assert stats["memory"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+    assert stats["disk"]["hits"] == 1
+
+    cache.write("w", {"v": 2})
+    assert (tmp_path / "w" / "w.json").exists()
+
+
+def test_entry_format_compresses_and_reads_legacy_json() -> None:
+    big = {"triples": [["subject", "predicate", f"object {i}"] for i in range(200)]}
+    blob = encode_entry(big)
+    assert blob.startswith(b"SYC")
+    assert len(blob) < len(json.dumps(big)) // 2
+    assert decode_entry(blob) == big
+    assert decode_entry(b'{"v": 1}') == {"v": 1}
+
+
+def test_corrupt_entries_raise_format_errors(tmp_path) -> None:
+    big = {"triples": [["subject", "predicate", f"object {i}"] for i in range(200)]}
+    blob = encode_entry(big, compression=Compression.ZLIB)
+    corrupt = blob[:HEADER_SIZE] + bytes(b ^ 0xFF for b in blob[HEADER_SIZE:])
+    for bad in (corrupt, blob[: HEADER_SIZE + 10], blob[:4]):
+        with pytest.raises(CacheFormatError):
+            decode_entry(bad)
+
+    # backends treat a corrupt entry as a miss instead of failing the node
+    cache = SimpleCache(tmp_path)
+    cache.write("big", big)
+    (tmp_path / "bi" / "big.json").write_bytes(corrupt)
+    assert cache.read("big") is None
+
+
+def test_async_cache_offloads_slow_tiers() -> None:
+    backing = MemoryCache(1024)
+    both_reading = threading.Barrier(2, timeout=5)
+    loop_ran = threading.Event()
+
+    class SlowTier:
+        def read(self, key):
+            both_reading.wait()  # breaks unless the two reads overlap
+            assert loop_ran.wait(5)  # set by a coroutine while the read blocks
+            return backing.read(key)
+
+        def write(self, key, data):
+            backing.write(key, data)
+
+    memory = MemoryCache(1024)
+    backing.write("k1", {"v": 1})
+    backing.write("k2", {"v": 2})
+    acache = AsyncCache(TieredCache([("memory", memory), ("disk", SlowTier())]))
+
+    async def mark_loop_ran():
+        loop_ran.set()
+
+    async def main():
+        r1, r2, _ = await asyncio.gather(acache.read("k1"), acache.read("k2"), mark_loop_ran())
+        acache.write("k3", {"v": 3})
+        assert memory.read("k3") == {"v": 3}  # in-process tiers update inline
+        await acache.drain()
+        return r1, r2
+
+    assert asyncio.run(main()) == ({"v": 1}, {"v": 2})
+    assert memory.read("k1") == {"v": 1}  # promoted
+    assert backing.read("k3") == {"v": 3}
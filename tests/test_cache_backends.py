@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime import cache_backends
+from symphonia.runtime.cache import pack_entry
+from symphonia.runtime.cache_backends import MmapCache, detect_backends, open_cache
+from symphonia.runtime.errors import CacheError
+from symphonia.runtime.engine import run_plan
+from symphonia.sdk.cli import app
+from symphonia.sdk.plan_ir import Execution, Node, Plan
+from symphonia.tools.stubs import extractor_A
+
+REG_DIR = Path("registry/manifests")
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite", "mmap"])
+def test_backend_roundtrip_and_prune(tmp_path: Path, backend: str) -> None:
+    cache = open_cache(backend, tmp_path)
+    for i in range(20):
+        cache.write(f"k{i:02d}", {"i": i, "pad": "x" * 50})
+    assert cache.read("k03") == {"i": 3, "pad": "x" * 50}
+    assert cache.read("missing") is None
+    cache.flush()
+
+    other = open_cache(backend, tmp_path)
+    assert other.read("k19")["i"] == 19
+    reclaimed = other.prune(max_bytes=500)
+    assert reclaimed > 0
+    assert sum(other.read(f"k{i:02d}") is not None for i in range(20)) < 20
+    other.close()
+    cache.close()
+    assert backend in detect_backends(tmp_path)
+
+    with pytest.raises(ValueError):
+        open_cache("nope", tmp_path)
+
+
+def test_mmap_sees_appends_from_other_instance(tmp_path: Path) -> None:
+    a = MmapCache(tmp_path)
+    b = MmapCache(tmp_path)
+    a.write("k", {"v": 1})
+    assert b.read("k") == {"v": 1}
+    b.write("k", {"v": 2})
+    assert a.read("k") == {"v": 2}
+    b.prune()
+    b.write("k2", {"v": 3})
+    assert a.read("k2") == {"v": 3}  # compaction replaced the file; index rebuilt
+    assert a.read("k") == {"v": 2}
+
+
+def test_mmap_close_and_write_racing_prune(tmp_path: Path, monkeypatch) -> None:
+    writer, pruner = MmapCache(tmp_path), MmapCache(tmp_path)
+    writer.write("old", {"v": 0})
+    real_flock = cache_backends.fcntl.flock
+    raced = []
+
+    def flock(fh, op):
+        # The first time the writer waits for the lock, a prune replaces the file.
+        if op == cache_backends.fcntl.LOCK_EX and not raced:
+            raced.append(True)
+            pruner.prune(max_bytes=0)
+        real_flock(fh, op)
+
+    monkeypatch.setattr(cache_backends.fcntl, "flock", flock)
+    writer.write("new", {"v": 1})
+    assert raced and MmapCache(tmp_path).read("new") == {"v": 1}
+
+    writer.close()
+    assert writer.read("new") is None
+
+
+def test_mmap_skips_torn_records(tmp_path: Path) -> None:
+    writer, reader = MmapCache(tmp_path), MmapCache(tmp_path)
+    writer.write("a", {"v": 1})
+    assert reader.read("a") == {"v": 1}
+
+    # a writer crashed half-way through a header ...
+    torn = cache_backends._REC.pack(cache_backends._MAGIC, 2, 40, 0, 0.0)[:16]
+    with (tmp_path / cache_backends.MMAP_FILE).open("ab") as fh:
+        fh.write(torn)
+    assert reader.read("missing") is None
+    size = (tmp_path / cache_backends.MMAP_FILE).stat().st_size
+    assert reader._scanned == size  # the dead tail is skipped, not rescanned on every miss
+
+    # ... and later appends land after the garbage
+    writer.write("b", {"v": 2})
+    assert reader.read("b") == {"v": 2}
+    fresh = MmapCache(tmp_path)
+    assert (fresh.read("a"), fresh.read("b")) == ({"v": 1}, {"v": 2})
+
+    # a record whose value does not match its CRC is not served
+    path = tmp_path / cache_backends.MMAP_FILE
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert MmapCache(tmp_path).read("b") is None
+
+
+def test_unknown_backend_is_a_clean_error(tmp_path: Path) -> None:
+    with pytest.raises(CacheError):
+        open_cache("bogus", tmp_path)
+    result = CliRunner().invoke(
+        app, ["plan", "run", "p.json", "c.json", "reg", "--cache-backend", "bogus"]
+    )
+    assert result.exit_code == 2 and "bogus" in result.output
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "mmap"])
+def test_engine_uses_plan_backend(tmp_path: Path, backend: str) -> None:
+    plan = Plan(
+        version="0.1",
+        execution=Execution(cache_default=True, cache_backend=backend),
+        graph=[Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"})],
+    )
+    impls = {"extractor_A.v1": extractor_A}
+    reg = Registry(REG_DIR)
+    run_plan(plan, {}, reg, impls=impls, runs_dir=tmp_path, cache_memory_bytes=0)
+    summary, err = run_plan(plan, {}, reg, impls=impls, runs_dir=tmp_path, cache_memory_bytes=0)
+    assert err is None
+    assert detect_backends(tmp_path / "cache") == [backend]
+    metrics = json.loads(Path(summary["artifacts"]["metrics"]).read_text())
+    assert metrics["per_node"]["extract"]["cache"] is True
+
+
+def test_remote_tier_shared_between_workers(tmp_path: Path) -> None:
+    url = f"memory://symphonia-test/{tmp_path.name}"
+    plan = Plan(
+        version="0.1",
+        execution=Execution(cache_default=True, cache_remote=url),
+        graph=[Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"})],
+    )
+    impls = {"extractor_A.v1": extractor_A}
+    reg = Registry(REG_DIR)
+    first, _ = run_plan(plan, {}, reg, impls=impls, runs_dir=tmp_path / "w1", cache_memory_bytes=0)
+    m1 = json.loads(Path(first["artifacts"]["metrics"]).read_text())
+    assert m1["cache"]["remote"]["uploads"] == 1
+
+    # A second worker with an empty local cache is served by the remote tier
+    # and promotes the entry to its own disk.
+    second, _ = run_plan(plan, {}, reg, impls=impls, runs_dir=tmp_path / "w2", cache_memory_bytes=0)
+    m2 = json.loads(Path(second["artifacts"]["metrics"]).read_text())
+    assert m2["per_node"]["extract"]["cache"] is True
+    assert m2["cache"]["remote"]["hits"] == 1
+    assert m2["cache"]["remote"]["uploads"] == 0
+    assert list((tmp_path / "w2" / "cache").rglob("*.json"))
+
+
+def test_remote_uploads_check_metadata_not_contents(tmp_path: Path, monkeypatch) -> None:
+    remote = cache_backends.RemoteCache(f"memory://symphonia-test/{tmp_path.name}")
+
+    def no_download(path):
+        raise AssertionError(f"downloaded {path}")
+
+    monkeypatch.setattr(remote.fs, "cat_file", no_download)
+    remote.write("ab12", pack_entry({"v": 1}, tool="t", ms=1))
+    remote.flush()
+    # an entry created before the stored object does not replace it
+    older = pack_entry({"v": 2}, tool="t", ms=1)
+    older["created_at"] -= 60
+    remote.write("ab12", older)
+    remote.flush()
+    newer = pack_entry({"v": 3}, tool="t", ms=1)
+    newer["created_at"] += 60
+    remote.write("ab12", newer)
+    remote.close()
+    assert remote.counters == {"uploads": 2, "upload_errors": 0, "read_errors": 0}
+
+
+def test_expired_remote_entries_are_refreshed_not_promoted(tmp_path: Path, monkeypatch) -> None:
+    url = f"memory://symphonia-test/{tmp_path.name}"
+
+    def plan(ttl: float | None) -> Plan:
+        node = Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"}, cache_ttl_s=ttl)
+        return Plan(
+            version="0.1",
+            execution=Execution(cache_default=True, cache_remote=url),
+            graph=[node],
+        )
+
+    def run(worker: str, ttl: float | None) -> dict:
+        summary, _ = run_plan(
+            plan(ttl), {}, Registry(REG_DIR), impls={"extractor_A.v1": extractor_A},
+            runs_dir=tmp_path / worker, cache_memory_bytes=0,
+        )
+        return json.loads(Path(summary["artifacts"]["metrics"]).read_text())
+
+    earlier = time.time() - 120
+    monkeypatch.setattr("symphonia.runtime.cache._now", lambda: earlier)
+    run("w1", None)
+    monkeypatch.undo()
+
+    # The stale remote entry is not copied into the new worker's disk tier,
+    # and the recomputed entry replaces it remotely.
+    tiered = cache_backends.open_tiered_cache(tmp_path / "w2" / "cache", remote=url)
+    remote = tiered.tiers[-1][1]
+    [path] = remote.fs.find(remote.base)
+    key = Path(path).stem
+    assert tiered.read(key, ttl_s=60) is not None
+    assert tiered.tiers[0][1].read(key) is None
+    tiered.close()
+
+    m2 = run("w2", 60)
+    assert m2["per_node"]["extract"]["cache"] == "expired"
+    assert m2["cache"]["remote"]["uploads"] == 1
+
+    m3 = run("w3", 60)
+    assert m3["per_node"]["extract"]["cache"] is True
+    assert m3["cache"]["remote"]["hits"] == 1
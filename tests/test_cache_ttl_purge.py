@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.cache_ledger import CacheLedger
+from symphonia.runtime.engine import run_plan
+from symphonia.sdk.cli import app
+from symphonia.sdk.plan_ir import Execution, Node, Plan
+from symphonia.tools.stubs import entity_linker, extractor_A
+
+REG_DIR = Path("registry/manifests")
+IMPLS = {"extractor_A.v1": extractor_A, "entity_linker.v1": entity_linker}
+
+
+def _plan(ttl: float | None = None) -> Plan:
+    return Plan(
+        version="0.1",
+        execution=Execution(cache_default=True),
+        graph=[
+            Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"}, cache_ttl_s=ttl),
+            Node(
+                id="link",
+                tool="entity_linker.v1",
+                needs=["extract"],
+                inputs={"mentions": "${extract.mentions}"},
+            ),
+        ],
+    )
+
+
+def _metrics(summary) -> dict:
+    return json.loads(Path(summary["artifacts"]["metrics"]).read_text())
+
+
+def test_node_ttl_expires_entries(tmp_path: Path, monkeypatch) -> None:
+    reg = Registry(REG_DIR)
+    earlier = time.time() - 120
+    monkeypatch.setattr("symphonia.runtime.cache._now", lambda: earlier)
+    run_plan(_plan(), {}, reg, impls=IMPLS, runs_dir=tmp_path, cache_memory_bytes=0)
+    monkeypatch.undo()
+    summary, err = run_plan(_plan(ttl=60), {}, reg, impls=IMPLS, runs_dir=tmp_path, cache_memory_bytes=0)
+    assert err is None
+    m = _metrics(summary)
+    assert m["per_node"]["extract"]["cache"] == "expired"
+    assert m["per_node"]["link"]["cache"] is True
+    assert m["cache_tools"]["extractor_A.v1"]["expired"] == 1
+    assert m["cache_tools"]["entity_linker.v1"]["ms_saved"] >= 0
+
+
+def test_downstream_key_ignores_how_upstream_was_produced(tmp_path: Path) -> None:
+    def plan(cache_extract: bool) -> Plan:
+        return Plan(
+            version="0.1",
+            execution=Execution(cache_default=True),
+            graph=[
+                Node(
+                    id="extract",
+                    tool="extractor_A.v1",
+                    inputs={"text": "hi"},
+                    cache=cache_extract,
+                    out={"mentions": "$.mentions"},
+                ),
+                Node(
+                    id="link",
+                    tool="entity_linker.v1",
+                    needs=["extract"],
+                    inputs={"mentions": "${extract.mentions}"},
+                ),
+            ],
+        )
+
+    reg = Registry(REG_DIR)
+    run_plan(plan(True), {}, reg, impls=IMPLS, runs_dir=tmp_path)
+    for cache_extract in (True, False):  # upstream served from cache, then fresh
+        summary, _ = run_plan(plan(cache_extract), {}, reg, impls=IMPLS, runs_dir=tmp_path)
+        assert _metrics(summary)["per_node"]["link"]["cache"] is True
+
+
+def test_purge_by_tool_and_persistent_stats(tmp_path: Path) -> None:
+    reg = Registry(REG_DIR)
+    run_plan(_plan(), {}, reg, impls=IMPLS, runs_dir=tmp_path)
+    run_plan(_plan(), {}, reg, impls=IMPLS, runs_dir=tmp_path)
+
+    stats = CacheLedger(tmp_path / "cache").tool_stats()
+    assert stats["extractor_A.v1"]["hits"] == 1
+    assert stats["extractor_A.v1"]["misses"] == 1
+    assert stats["extractor_A.v1"]["bytes_served"] > 0
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["cache", "purge", "--tool", "entity_linker", "--runs", str(tmp_path)])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["removed"] == 1
+
+    summary, _ = run_plan(_plan(), {}, reg, impls=IMPLS, runs_dir=tmp_path)
+    m = _metrics(summary)
+    assert m["per_node"]["extract"]["cache"] is True
+    assert m["per_node"]["link"]["cache"] is False
+
+    result = runner.invoke(app, ["cache", "stats", "--runs", str(tmp_path), "--json"])
+    assert json.loads(result.stdout)["entity_linker.v1"]["misses"] == 2
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.errors import EngineError
+from symphonia.runtime.warm import warm_cache
+from symphonia.sdk.plan_ir import Execution, Node, Plan
+from symphonia.tools.stubs import entity_linker, extractor_A
+
+REG_DIR = Path("registry/manifests")
+PLAN = Plan(
+    version="0.1",
+    execution=Execution(cache_default=True),
+    graph=[
+        Node(id="extract", tool="extractor_A.v1", inputs={"text": "${context.text}"}),
+        Node(
+            id="link",
+            tool="entity_linker.v1",
+            needs=["extract"],
+            inputs={"mentions": "${extract.mentions}"},
+        ),
+    ],
+)
+
+
+def test_warm_populates_engine_cache(tmp_path: Path) -> None:
+    calls = []
+
+    def counting_extractor(payload):
+        calls.append(payload["text"])
+        return extractor_A(payload)
+
+    reg = Registry(REG_DIR)
+    corpus = [{"text": f"doc {i}"} for i in range(5)] + [{"text": "doc 0"}]
+    seen = []
+    report = warm_cache(
+        PLAN,
+        reg,
+        corpus,
+        nodes=["extract"],
+        runs_dir=tmp_path,
+        batch_size=4,
+        impls={"extractor_A.v1": counting_extractor},
+        progress=lambda r: seen.append(r.contexts),
+    )
+    assert report.contexts == 6
+    assert report.computed == 5
+    assert report.skipped == 1  # "doc 0" again, already in the cache
+    assert seen == [4, 6]
+    assert sorted(calls) == [f"doc {i}" for i in range(5)]
+
+    again = warm_cache(PLAN, Registry(REG_DIR), corpus[:2], nodes=["extract"], runs_dir=tmp_path,
+                       impls={"extractor_A.v1": counting_extractor})
+    assert again.computed == 0 and again.skipped == 2
+
+    impls = {"extractor_A.v1": counting_extractor, "entity_linker.v1": entity_linker}
+    summary, err = run_plan(PLAN, {"text": "doc 3"}, reg, impls=impls, runs_dir=tmp_path)
+    assert err is None
+    metrics = json.loads(Path(summary["artifacts"]["metrics"]).read_text())
+    assert metrics["per_node"]["extract"]["cache"] is True
+    assert len(calls) == 5
+
+    with pytest.raises(EngineError):
+        warm_cache(PLAN, reg, corpus, nodes=["link"], runs_dir=tmp_path)
+
+
+def test_warm_skips_uncached_nodes(tmp_path: Path) -> None:
+    calls = []
+
+    def counting_extractor(payload):
+        calls.append(payload["text"])
+        return extractor_A(payload)
+
+    impls = {"extractor_A.v1": counting_extractor}
+    uncached = Plan(
+        version="0.1",
+        execution=Execution(cache_default=True),
+        graph=[
+            Node(id="extract", tool="extractor_A.v1", inputs={"text": "${context.text}"},
+                 cache=False),
+        ],
+    )
+    report = warm_cache(uncached, Registry(REG_DIR), [{"text": "a"}], runs_dir=tmp_path,
+                        impls=impls)
+    assert report.computed == 0 and calls == []
+
+    # an uncached node still runs to feed a cached one, but is not written
+    feeding = Plan(version="0.1", execution=uncached.execution,
+                   graph=[uncached.graph[0], PLAN.graph[1]])
+    report = warm_cache(feeding, Registry(REG_DIR), [{"text": "a"}], runs_dir=tmp_path,
+                        impls=impls)
+    assert report.computed == 1 and report.errors == 0 and calls == ["a"]
+    assert len(list((tmp_path / "cache").rglob("*.json"))) == 1
+
+
+def test_warm_batches_calls_to_batch_endpoints(tmp_path: Path, monkeypatch) -> None:
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    manifest = json.loads((REG_DIR / "extractor_A.v1.json").read_text())
+    manifest.update(
+        kind="http",
+        endpoint="http://server/extract",
+        batch_endpoint="http://server/extract/batch",
+        max_batch_size=3,
+    )
+    del manifest["entrypoint"], manifest["model"]
+    (reg_dir / "extractor_A.v1.json").write_text(json.dumps(manifest))
+    posts = []
+
+    def post(url, json=None, timeout=None):
+        posts.append(url)
+        if url.endswith("/batch"):
+            body = [{"output": extractor_A(p)} for p in json]
+        else:
+            body = extractor_A(json)
+        return httpx.Response(200, json=body, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx, "post", post)
+    corpus = [{"text": f"doc {i}"} for i in range(7)]
+    plan = Plan(version="0.1", execution=PLAN.execution, graph=PLAN.graph[:1])
+    report = warm_cache(plan, Registry(reg_dir), corpus, runs_dir=tmp_path)
+    assert report.computed == 7
+    assert sorted(posts) == [manifest["endpoint"]] + [manifest["batch_endpoint"]] * 2
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.canonical import canonicalize
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.errors import RegistryError
+from symphonia.runtime.warm import warm_cache
+from symphonia.sdk.plan_ir import Execution, Node, Plan
+from symphonia.tools.stubs import entity_linker
+
+REG_DIR = Path("registry/manifests")
+
+
+def test_rules_apply_in_order() -> None:
+    rules = {"text": ["strip", "nfc", "collapse_whitespace", "lowercase"], "tags": ["sort_array"]}
+    out = canonicalize({"text": "  Café   Bar\n", "tags": ["b", "a"], "n": 1}, rules)
+    assert out == {"text": "café bar", "tags": ["a", "b"], "n": 1}
+    assert canonicalize({"text": "X"}, None) == {"text": "X"}
+
+
+def _registry(tmp_path: Path, rules, invoke: bool = False, tool: str = "extractor_A") -> Registry:
+    reg_dir = tmp_path / "reg"
+    shutil.copytree(REG_DIR, reg_dir)
+    path = reg_dir / f"{tool}.v1.json"
+    data = json.loads(path.read_text())
+    data["canonicalize"] = rules
+    data["canonicalize_invoke"] = invoke
+    path.write_text(json.dumps(data))
+    return Registry(reg_dir)
+
+
+def test_canonical_inputs_share_cache_entries(tmp_path: Path) -> None:
+    seen = []
+
+    def extractor(payload):
+        seen.append(payload["text"])
+        return {"mentions": [payload["text"]]}
+
+    reg = _registry(tmp_path, {"text": ["strip", "collapse_whitespace"]}, invoke=True)
+
+    def run(text):
+        plan = Plan(
+            version="0.1",
+            execution=Execution(cache_default=True),
+            graph=[Node(id="extract", tool="extractor_A.v1", inputs={"text": text})],
+        )
+        summary, err = run_plan(
+            plan, {}, reg, impls={"extractor_A.v1": extractor}, runs_dir=tmp_path / "runs"
+        )
+        assert err is None
+        return json.loads(Path(summary["artifacts"]["metrics"]).read_text())
+
+    run("Ada  Lovelace")
+    m = run("  Ada Lovelace \n")
+    assert m["per_node"]["extract"]["cache"] is True
+    assert m["cache_tools"]["extractor_A.v1"]["canonicalized"] == 1
+    assert m["cache_tools"]["extractor_A.v1"]["canonical_hits"] == 1
+    assert seen == ["Ada Lovelace"]  # invoked with the canonical form
+
+    with pytest.raises(RegistryError):
+        _registry(tmp_path / "bad", {"text": ["titlecase"]})
+
+
+def test_rules_apply_to_upstream_values(tmp_path: Path) -> None:
+    linked = []
+
+    def linker(payload):
+        linked.append(payload["mentions"])
+        return entity_linker(payload)
+
+    reg = _registry(tmp_path, {"mentions": ["sort_array"]}, invoke=True, tool="entity_linker")
+    impls = {
+        "extractor_A.v1": lambda p: {"mentions": p["text"].split(",")},
+        "entity_linker.v1": linker,
+    }
+    plan = Plan(
+        version="0.1",
+        execution=Execution(cache_default=True),
+        graph=[
+            Node(id="extract", tool="extractor_A.v1", inputs={"text": "${context.text}"}),
+            Node(
+                id="link",
+                tool="entity_linker.v1",
+                needs=["extract"],
+                inputs={"mentions": "${extract.mentions}"},
+            ),
+        ],
+    )
+
+    def run(text):
+        summary, err = run_plan(
+            plan, {"text": text}, reg, impls=impls, runs_dir=tmp_path / "runs"
+        )
+        assert err is None
+        return json.loads(Path(summary["artifacts"]["metrics"]).read_text())
+
+    first = run("b,a")
+    assert first["cache_tools"]["entity_linker.v1"]["canonicalized"] == 1
+    second = run("a,b")
+    assert second["per_node"]["extract"]["cache"] is False
+    assert second["per_node"]["link"]["cache"] is True
+    assert linked == [["a", "b"]]
+
+    # cache warm invokes with, and keys by, the same canonical inputs
+    report = warm_cache(
+        plan, reg, [{"text": "d,c"}, {"text": "c,d"}], runs_dir=tmp_path / "runs", impls=impls
+    )
+    assert report.computed == 3  # two extractions, one shared link call
+    assert linked == [["a", "b"], ["c", "d"]]
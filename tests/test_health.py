@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import socket
+import time
+
+import pytest
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.errors import EngineError
+from symphonia.runtime.health import check_health, recent_health
+from symphonia.runtime.model_loader import ModelLoader
+from symphonia.runtime.preflight import build_tool
+from symphonia.tools.server import ToolServer
+
+
+def _write(reg_dir, name: str, endpoint: str) -> None:
+    manifest = {
+        "name": name,
+        "version": "v1",
+        "kind": "http",
+        "endpoint": endpoint,
+        "input_schema": {"type": "object"},
+        "output_schema": {"type": "object"},
+    }
+    (reg_dir / f"{name}.v1.json").write_text(json.dumps(manifest))
+
+
+def test_probes_run_concurrently_and_are_cached(tmp_path) -> None:
+    # Listening sockets that never answer: each probe waits out its timeout.
+    hung = []
+    for _ in range(4):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        hung.append(sock)
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    with ToolServer(lambda p: p) as server:
+        _write(reg_dir, "up", server.url)
+        for i, sock in enumerate(hung):
+            _write(reg_dir, f"hung{i}", f"http://127.0.0.1:{sock.getsockname()[1]}")
+        reg = Registry(reg_dir)
+        start = time.perf_counter()
+        result = reg.health(timeout_s=0.5)
+        elapsed = time.perf_counter() - start
+    for sock in hung:
+        sock.close()
+    assert result == {"up.v1": True, **{f"hung{i}.v1": False for i in range(4)}}
+    assert elapsed < 1.5  # sequential probing would take at least 2 s
+
+    # the server is gone, but a recent result is reused without probing
+    assert recent_health(server.url) is True
+    assert check_health([server.url]) == {server.url: True}
+    assert reg.health(max_age_s=0)["up.v1"] is False
+
+
+def test_preflight_fails_fast_on_recent_failure(tmp_path) -> None:
+    dead = ToolServer(lambda p: p)
+    url = dead.url
+    dead.server_close()
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    _write(reg_dir, "gone", url)
+    reg = Registry(reg_dir)
+    assert reg.health() == {"gone.v1": False}
+    with pytest.raises(EngineError, match="failed its last health check"):
+        build_tool(reg.resolve("gone.v1"), loader=ModelLoader())
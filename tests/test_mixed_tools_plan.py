@@ -83,6 +83,8 @@ def test_mixed_plan(tmp_path, monkeypatch):
             Node(id="b", tool="h.v1", inputs={}),
         ],
     )
-    record, err = run_plan(plan, {}, reg, loader=ModelLoader(), warmup=False)
+    record, err = run_plan(
+        plan, {}, reg, loader=ModelLoader(), warmup=False, runs_dir=tmp_path / "runs"
+    )
     assert err is None
     assert record["totals"]["tool_calls"] == 2
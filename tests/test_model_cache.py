@@ -0,0 +1,115 @@
+import types
+from pathlib import Path
+
+import pytest
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.errors import CacheError
+from symphonia.runtime.model_loader import ModelCache, ModelLoader
+from symphonia.runtime.warm import warm_cache
+from symphonia.sdk.plan_ir import Node, Plan
+
+
+class FakeModel:
+    def __init__(self, base_id):
+        self.base_id = base_id
+
+    def get_memory_footprint(self):
+        return 100 * 1024 * 1024
+
+    def eval(self):
+        pass
+
+
+def _patch(monkeypatch, downloads, base_loads):
+    def fake_fs(self, uri, dest):
+        downloads.append(uri)
+        dest.mkdir(parents=True, exist_ok=True)
+        (dest / "adapter.bin").write_text(uri)
+        return dest
+
+    def fake_base(base_id, **_k):
+        base_loads.append(base_id)
+        return FakeModel(base_id)
+
+    monkeypatch.setattr(ModelLoader, "_resolve_fs", fake_fs)
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.AutoTokenizer",
+        types.SimpleNamespace(from_pretrained=lambda *_a, **_k: "tok"),
+    )
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.AutoModelForCausalLM",
+        types.SimpleNamespace(from_pretrained=fake_base),
+    )
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.PeftModel",
+        types.SimpleNamespace(from_pretrained=lambda base, _dir: base),
+    )
+
+
+def test_cache_hits_skip_download_and_load(monkeypatch, tmp_path):
+    downloads, base_loads = [], []
+    _patch(monkeypatch, downloads, base_loads)
+    cache = ModelCache()
+    first = ModelLoader(cache_dir=tmp_path / "c1", models=cache)
+    first.load(base_id="gemma", adapter_uri="s3://bucket/linker")
+    first.release()
+
+    # a second preflight in the same process, even with its own download dir
+    second = ModelLoader(cache_dir=tmp_path / "c2", models=cache)
+    tok, model = second.load(base_id="gemma", adapter_uri="s3://bucket/linker")
+    assert tok == "tok" and model.model.base_id == "gemma"
+    assert downloads == ["s3://bucket/linker"] and base_loads == ["gemma"]
+    assert second.counters == {"hits": 1, "misses": 0}
+    assert cache.counters["hits"] == 1 and cache.counters["misses"] == 1
+
+
+def test_idle_models_evicted_lru_within_budget(monkeypatch, tmp_path):
+    downloads, base_loads = [], []
+    _patch(monkeypatch, downloads, base_loads)
+    cache = ModelCache(budget_mb=250)
+    loader = ModelLoader(cache_dir=tmp_path / "c", models=cache)
+    for base_id in ("a", "b"):
+        loader.load(base_id=base_id, adapter_uri=f"s3://bucket/{base_id}")
+    loader.release()
+    loader.load(base_id="a", adapter_uri="s3://bucket/a")  # "a" becomes most recent
+
+    # a third base exceeds the budget: the idle, least recently used "b" goes
+    loader.load(base_id="c", adapter_uri="s3://bucket/c")
+    assert cache.counters["evictions"] == 1 and cache.size_mb() == 200
+    assert set(k[0] for k in cache._base_locks) == {"a", "c"}  # no lock left for "b"
+    loader.load(base_id="a", adapter_uri="s3://bucket/a")
+    loader.load(base_id="b", adapter_uri="s3://bucket/b")
+    assert base_loads == ["a", "b", "c", "b"]
+
+    # held models are never evicted, even over budget
+    assert cache.size_mb() == 300 and cache.counters["evictions"] == 1
+    loader.release()
+    assert cache.size_mb() == 200
+
+
+class CountingLoader(ModelLoader):
+    releases = 0
+
+    def release(self):
+        self.releases += 1
+        super().release()
+
+
+def test_failed_runs_release_models(tmp_path):
+    reg = Registry(Path("registry/manifests"))
+    plan = Plan(
+        version="0.1",
+        graph=[Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"})],
+    )
+    # the unknown backend fails after preflight, once the tools hold models
+    loader = CountingLoader()
+    with pytest.raises(CacheError):
+        run_plan(plan, {}, reg, runs_dir=tmp_path, loader=loader, cache_backend="nope")
+    assert loader.releases == 1
+
+    loader = CountingLoader()
+    with pytest.raises(CacheError):
+        warm_cache(plan, reg, [{}], runs_dir=tmp_path, loader=loader, cache_backend="nope")
+    assert loader.releases == 1
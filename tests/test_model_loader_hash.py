@@ -1,3 +1,10 @@
+import hashlib
+import os
+
+import pytest
+
+from symphonia.runtime import model_loader
+from symphonia.runtime.errors import ModelLoadError
 from symphonia.runtime.model_loader import ModelLoader
 
 
@@ -20,3 +27,39 @@ def test_bundle_hash_ignores_hidden(tmp_path):
     h3 = loader._bundle_hash(d)
     assert h3 != h1
 
+
+
+def test_bundle_hash_streams_same_digest(tmp_path):
+    d = tmp_path / "bundle"
+    (d / "sub").mkdir(parents=True)
+    (d / "weights.bin").write_bytes(bytes(range(256)) * 10_000)  # several chunks
+    (d / "sub" / "config.json").write_text("{}")
+    legacy = hashlib.sha256(
+        "".join(
+            hashlib.sha256(p.read_bytes()).hexdigest()
+            for p in sorted([d / "sub" / "config.json", d / "weights.bin"])
+        ).encode()
+    ).hexdigest()
+    assert model_loader.HASH_CHUNK_BYTES < 2_560_000
+    assert ModelLoader(cache_dir=tmp_path / "c")._bundle_hash(d) == legacy
+
+
+def test_verified_sidecar_skips_rehash(tmp_path, monkeypatch):
+    loader = ModelLoader(cache_dir=tmp_path / "c")
+    d = tmp_path / "bundle"
+    d.mkdir()
+    (d / "a.bin").write_text("a")
+    sha = loader._bundle_hash(d)
+    assert loader._verify_bundle(d, sha) is False  # hashed, sidecar written
+
+    hashed = []
+    orig = model_loader._file_digest
+    monkeypatch.setattr(model_loader, "_file_digest", lambda p: hashed.append(p) or orig(p))
+    assert loader._verify_bundle(d, sha) is True and hashed == []
+    assert loader._bundle_hash(d) == sha  # the sidecar is not part of the bundle
+
+    st = (d / "a.bin").stat()
+    (d / "a.bin").write_text("b")
+    os.utime(d / "a.bin", ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    with pytest.raises(ModelLoadError):
+        loader._verify_bundle(d, sha)
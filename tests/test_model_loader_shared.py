@@ -0,0 +1,74 @@
+import types
+
+from symphonia.runtime.model_loader import AdapterModel, ModelLoader, generate_mixed
+
+
+class FakePeft:
+    def __init__(self, base, directory):
+        self.base = base
+        self.adapters = {"default": directory}
+        self.active = "default"
+
+    def load_adapter(self, directory, adapter_name):
+        self.adapters[adapter_name] = directory
+
+    def set_adapter(self, name):
+        self.active = name
+
+    def generate(self, adapter_names=None, **kwargs):
+        return adapter_names or [self.active]
+
+    def eval(self):
+        pass
+
+    def score(self, text):
+        return self.active, text
+
+
+def test_adapters_share_one_base(monkeypatch, tmp_path):
+    base_loads = []
+
+    def fake_fs(self, uri, dest):
+        dest.mkdir(parents=True, exist_ok=True)
+        (dest / "adapter.bin").write_text(uri)
+        return dest
+
+    monkeypatch.setattr(ModelLoader, "_resolve_fs", fake_fs)
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.AutoTokenizer",
+        types.SimpleNamespace(from_pretrained=lambda *_a, **_k: "tok"),
+    )
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.AutoModelForCausalLM",
+        types.SimpleNamespace(from_pretrained=lambda base_id, **_k: base_loads.append(base_id)),
+    )
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.PeftModel",
+        types.SimpleNamespace(from_pretrained=FakePeft),
+    )
+
+    loader = ModelLoader(cache_dir=tmp_path / "c")
+    views = [
+        loader.load(base_id="gemma", adapter_uri=f"s3://bucket/{name}")[1]
+        for name in ("linker", "extractor", "verifier", "linker")
+    ]
+    assert base_loads == ["gemma"]
+    assert all(isinstance(v, AdapterModel) for v in views)
+    assert [v.adapter_name for v in views] == ["default", "adapter_1", "adapter_2", "default"]
+    assert len(views[0].model.adapters) == 3
+
+    # each call runs with its own adapter; mixed batches name one per row
+    assert views[1].generate() == ["adapter_1"]
+    assert views[0].generate() == ["default"]
+    assert generate_mixed([views[2], views[0]]) == ["adapter_2", "default"]
+    # other methods reached through the wrapper activate its adapter too
+    assert views[2].score("x") == ("adapter_2", "x")
+    assert views[0].score("y") == ("default", "y")
+    assert views[0].adapters is views[1].adapters
+
+    loader.load(base_id="gemma", adapter_uri="s3://bucket/linker", quant="8bit")
+    report = loader.memory_report()
+    assert base_loads == ["gemma", "gemma"]
+    assert report["gemma|none|auto"]["adapters"] == 3
+    assert report["gemma|8bit|auto"]["adapters"] == 1
+    assert report["gemma|none|auto"]["rss_attributable"] is True
@@ -72,7 +72,9 @@ def test_preflight_error(tmp_path, monkeypatch):
         "symphonia.runtime.model_loader.PeftModel",
         types.SimpleNamespace(from_pretrained=lambda base, dir: object()),
     )
-    record, err = run_plan(plan, {}, reg, loader=ModelLoader(), warmup=False)
+    record, err = run_plan(
+        plan, {}, reg, loader=ModelLoader(), warmup=False, runs_dir=tmp_path / "runs"
+    )
     assert isinstance(err, ModelLoadError)
     assert record["stop_reason"] == STOP_REASON_PREFLIGHT
     err_path = Path(record["artifacts"]["nodes"]["__preflight__"]["error"])
@@ -0,0 +1,76 @@
+import json
+import time
+import types
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.constants import AdapterScheme, LoaderType
+from symphonia.runtime.model_loader import ModelLoader
+from symphonia.runtime.preflight import preflight_build_tool_pool
+from symphonia.sdk.plan_ir import Node, Plan
+
+
+class DummyModel:
+    def eval(self):
+        pass
+
+
+def test_tools_load_concurrently_with_timings(monkeypatch, tmp_path):
+    def slow_fs(self, uri, dest):
+        time.sleep(0.3)
+        dest.mkdir(parents=True, exist_ok=True)
+        (dest / "adapter.bin").write_text(uri)
+        return dest
+
+    def slow_base(*_a, **_k):
+        time.sleep(0.1)
+        return DummyModel()
+
+    monkeypatch.setattr(ModelLoader, "_resolve_fs", slow_fs)
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.AutoTokenizer",
+        types.SimpleNamespace(from_pretrained=lambda *_a, **_k: "tok"),
+    )
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.AutoModelForCausalLM",
+        types.SimpleNamespace(from_pretrained=slow_base),
+    )
+    monkeypatch.setattr(
+        "symphonia.runtime.model_loader.PeftModel",
+        types.SimpleNamespace(from_pretrained=lambda base, _dir: DummyModel()),
+    )
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    names = ["linker", "extractor", "verifier"]
+    for i, name in enumerate(names):
+        manifest = {
+            "name": name,
+            "version": "v1",
+            "kind": "inproc",
+            "entrypoint": "examples.tools.extractor.factory",
+            "input_schema": {"type": "object"},
+            "output_schema": {"type": "object"},
+            "model": {
+                "base_id": f"base{i}",
+                "adapter_uri": f"{AdapterScheme.S3.value}bucket/{name}",
+                "loader": LoaderType.PEFT_LORA.value,
+            },
+        }
+        (reg_dir / f"{name}.v1.json").write_text(json.dumps(manifest))
+    plan = Plan(
+        version="0.1", graph=[Node(id=n, tool=f"{n}.v1", inputs={}) for n in names]
+    )
+
+    timings = {}
+    start = time.perf_counter()
+    loader = ModelLoader(cache_dir=tmp_path / "c")
+    pool = preflight_build_tool_pool(plan, Registry(reg_dir), loader=loader, timings=timings)
+    elapsed = time.perf_counter() - start
+    assert list(pool) == [f"{n}.v1" for n in names]
+    assert elapsed < 0.8  # three 0.3 s downloads overlap
+    for phases in timings.values():
+        assert phases["download_ms"] >= 300 and phases["cache_hit"] is False
+        assert {"resolve_ms", "model_ms", "import_ms", "instantiate_ms", "total_ms"} <= set(phases)
+    # the bases loaded at the same time, so their peak-RSS figures overlap
+    report = loader.memory_report()
+    assert len(report) == 3
+    assert not any(entry["rss_attributable"] for entry in report.values())
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from symphonia.registry.manifest import ToolManifest
+from symphonia.registry.registry import Registry
+from symphonia.runtime.errors import ToolCallError
+from symphonia.runtime.replicas import ReplicaSet, replica_counters
+from symphonia.runtime.tools import HttpTool
+from symphonia.tools.server import ToolServer
+
+
+def _manifest(endpoints, **kw) -> ToolManifest:
+    data = dict(
+        name="scaled",
+        version="v1",
+        kind="http",
+        endpoints=endpoints,
+        input_schema={"type": "object"},
+        output_schema={"type": "object"},
+    )
+    return ToolManifest(**dict(data, **kw))
+
+
+def test_least_outstanding_routing() -> None:
+    replicas = ReplicaSet(["http://a", "http://b", "http://c"])
+    a = replicas.acquire()
+    b = replicas.acquire()
+    c = replicas.acquire()
+    assert {a.url, b.url, c.url} == {"http://a", "http://b", "http://c"}
+    replicas.release(b, 1.0, True)
+    assert replicas.acquire() is b  # the only idle replica
+    assert replicas.acquire(exclude=[a, b]) is c
+
+
+def test_failover_ejection_and_metrics(tmp_path) -> None:
+    def broken(payload):
+        raise RuntimeError("boom")
+
+    with ToolServer(lambda p: {"ok": True}) as good, ToolServer(broken) as bad:
+        dead = ToolServer(lambda p: p)
+        dead_url = dead.url
+        dead.server_close()
+        endpoints = [bad.url, dead_url, good.url]
+        tool = HttpTool(_manifest(endpoints))
+        start = replica_counters([tool])
+        for _ in range(6):
+            assert tool.invoke({}) == {"ok": True}
+        stats = replica_counters([tool], since=start)["scaled.v1"]
+        assert stats[good.url]["calls"] == 6 and stats[good.url]["errors"] == 0
+        assert stats[bad.url]["ejections"] == 1 and stats[dead_url]["ejections"] == 1
+        assert stats[bad.url]["calls"] == stats[bad.url]["errors"] == 3
+
+        # side-effecting tools are not retried on another replica
+        once = HttpTool(_manifest([bad.url, good.url], version="v2", tags=["side_effecting"]))
+        with pytest.raises(ToolCallError):
+            once.invoke({})
+
+        reg_dir = tmp_path / "reg"
+        reg_dir.mkdir()
+        data = {
+            "name": "scaled",
+            "version": "v1",
+            "kind": "http",
+            "endpoints": endpoints,
+            "batch_endpoint": "/batch",
+            "input_schema": {},
+            "output_schema": {},
+        }
+        (reg_dir / "scaled.v1.json").write_text(json.dumps(data))
+        assert Registry(reg_dir).health() == {"scaled.v1": True}
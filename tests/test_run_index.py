@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.artifacts import RunArtifacts
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.run_index import RunIndex
+from symphonia.sdk.cli import app
+from symphonia.sdk.plan_ir import Node, Plan
+from symphonia.tools.stubs import extractor_A
+
+REG_DIR = Path("registry/manifests")
+
+
+def test_index_tracks_runs_and_cli(tmp_path: Path) -> None:
+    reg = Registry(REG_DIR)
+    plan = Plan(version="0.1", graph=[Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"})])
+    record, err = run_plan(
+        plan, {}, reg, impls={"extractor_A.v1": extractor_A}, runs_dir=tmp_path, run_id="r1"
+    )
+    assert err is None
+
+    index = RunIndex(tmp_path)
+    assert index.lookup("r1") == Path(record["artifacts"]["root"])
+    row = index.get("r1")
+    assert row["status"] == "ok"
+    assert row["inputs_hash"]
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["runs", "ls", "--runs", str(tmp_path), "--json"])
+    assert result.exit_code == 0
+    assert [r["run_id"] for r in json.loads(result.stdout)] == ["r1"]
+    result = runner.invoke(app, ["runs", "show", "r1", "--runs", str(tmp_path)])
+    assert json.loads(result.stdout)["status"] == "ok"
+
+
+def test_index_backfills_existing_runs(tmp_path: Path) -> None:
+    legacy = tmp_path / "2024-01-01" / "old1"
+    legacy.mkdir(parents=True)
+    (legacy / "run.json").write_text(json.dumps({"inputs_hash": "i", "created_at": "2024-01-01T00:00:00+00:00"}))
+    (legacy / "summary.json").write_text(json.dumps({"ok": False, "stop_reason": "deadline"}))
+
+    ra = RunArtifacts(tmp_path, run_id="old1")
+    assert ra.root == legacy
+    assert ra.read_run_info()["inputs_hash"] == "i"
+    assert RunIndex(tmp_path).get("old1")["stop_reason"] == "deadline"
+
+
+def test_unindexed_run_resumes_and_read_only_cli(tmp_path: Path) -> None:
+    RunIndex(tmp_path)  # index created before the run was copied in
+    copied = tmp_path / "2024-01-02" / "copied1"
+    copied.mkdir(parents=True)
+    assert RunArtifacts(tmp_path, run_id="copied1").root == copied
+    assert RunIndex(tmp_path).lookup("copied1") == copied
+
+    def no_scan(self, pattern):
+        raise AssertionError(f"scanned {self} for {pattern}")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Path, "glob", no_scan)
+        fresh = RunArtifacts(tmp_path)  # a generated run_id needs no lookup
+    assert RunIndex(tmp_path).lookup(fresh.run_id) == fresh.root
+
+    missing = tmp_path / "nowhere"
+    runner = CliRunner()
+    result = runner.invoke(app, ["runs", "ls", "--runs", str(missing), "--json"])
+    assert result.exit_code == 0 and json.loads(result.stdout) == []
+    result = runner.invoke(app, ["runs", "show", "r1", "--runs", str(missing)])
+    assert result.exit_code == 1
+    assert not missing.exists()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from typer.testing import CliRunner
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.artifacts import RunArtifacts
+from symphonia.runtime.cache import SimpleCache
+from symphonia.runtime.db import connect
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.errors import EngineError
+from symphonia.runtime.retention import RetentionPolicy, collect_garbage
+from symphonia.runtime.run_index import RunIndex
+from symphonia.sdk.cli import app
+from symphonia.sdk.plan_ir import Node, Plan
+from symphonia.tools.stubs import extractor_A
+
+REG_DIR = Path("registry/manifests")
+PLAN = Plan(version="0.1", graph=[Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"})])
+
+
+def _run(tmp_path: Path, run_id: str, impl=extractor_A, **kw):
+    return run_plan(
+        PLAN, {}, Registry(REG_DIR), impls={"extractor_A.v1": impl}, runs_dir=tmp_path, run_id=run_id, **kw
+    )
+
+
+def _boom(p):
+    raise ValueError("boom")
+
+
+def test_gc_respects_budgets_and_protected_runs(tmp_path: Path) -> None:
+    _run(tmp_path, "old1")
+    _run(tmp_path, "old2")
+    _run(tmp_path, "bad", impl=_boom)
+    live = RunArtifacts(tmp_path, run_id="live")  # registered as running by this process
+    _run(tmp_path, "new")
+
+    report = collect_garbage(tmp_path, RetentionPolicy(max_runs=4, pinned=["old2"]))
+    assert report.removed == ["old1"]
+    assert report.reclaimed_bytes > 0
+    assert RunIndex(tmp_path).lookup("old1") is None
+    assert {r["run_id"] for r in RunIndex(tmp_path).query()} == {"old2", "bad", "live", "new"}
+
+    # In-engine policy never removes the run that is executing.
+    summary, err = _run(tmp_path, "newest", retention=RetentionPolicy(max_runs=0, keep_failed=False))
+    assert err is None
+    gc = json.loads(Path(summary["artifacts"]["metrics"]).read_text())["gc"]
+    assert set(gc["removed"]) == {"old2", "bad", "new"}
+    assert gc["skipped_active"] == ["live"]
+    assert live.root.exists()
+    assert Path(summary["artifacts"]["root"]).exists()
+
+
+def test_gc_cli_prunes_cache_by_age(tmp_path: Path, monkeypatch) -> None:
+    cache = SimpleCache(tmp_path / "cache")
+    old = time.time() - 3 * 86400
+    monkeypatch.setattr("symphonia.runtime.cache._now", lambda: old)
+    cache.write("stale", {"v": 1})
+    monkeypatch.undo()
+    cache.write("fresh", {"v": 2})
+
+    result = CliRunner().invoke(
+        app, ["runs", "gc", "--runs", str(tmp_path), "--cache-max-age-days", "1"]
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["cache_reclaimed_bytes"] > 0
+    assert cache.read("stale") is None
+    assert cache.read("fresh") == {"v": 2}
+
+
+def test_gc_claims_block_resume_and_crashed_runs_count_as_failed(tmp_path: Path) -> None:
+    _run(tmp_path, "done")
+    crashed = RunArtifacts(tmp_path, run_id="crashed")
+    index = RunIndex(tmp_path)
+    with closing(connect(index.path)) as conn:  # owner died without finishing
+        conn.execute("UPDATE runs SET pid = ?, bytes = NULL WHERE run_id = 'crashed'", (2**30,))
+
+    report = collect_garbage(tmp_path, RetentionPolicy(max_runs=0))
+    assert report.removed == ["done"]
+    assert crashed.root.exists()
+    assert index.get("crashed")["bytes"] is not None  # measured once, then stored
+
+    _run(tmp_path, "victim")
+    assert index.claim("victim", "ok", "deleting")
+    with pytest.raises(EngineError):
+        RunArtifacts(tmp_path, run_id="victim")  # resuming a run being deleted
+    assert index.claim("victim", "deleting", "ok")  # e.g. gc gave up
+    assert not index.delete_claimed("victim", lambda: None)
+    assert index.lookup("victim") is not None
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.stats import collect_stats, percentile
+from symphonia.sdk.cli import app
+from symphonia.sdk.plan_ir import Execution, Node, Plan
+from symphonia.tools.stubs import entity_linker, extractor_A
+
+REG_DIR = Path("registry/manifests")
+
+
+def test_percentile_interpolates() -> None:
+    assert percentile([], 50) is None
+    assert percentile([10], 99) == 10
+    assert percentile([0, 10, 20, 30, 40], 50) == 20
+    assert percentile([0, 100], 95) == 95
+
+
+def test_stats_aggregate_history(tmp_path: Path) -> None:
+    reg = Registry(REG_DIR)
+    plan = Plan(
+        version="0.1",
+        execution=Execution(cache_default=True),
+        graph=[
+            Node(id="extract", tool="extractor_A.v1", inputs={"text": "hi"}),
+            Node(
+                id="link",
+                tool="entity_linker.v1",
+                needs=["extract"],
+                inputs={"mentions": "${extract.mentions}"},
+            ),
+        ],
+    )
+    impls = {"extractor_A.v1": extractor_A, "entity_linker.v1": entity_linker}
+    run_plan(plan, {}, reg, impls=impls, runs_dir=tmp_path)
+    run_plan(plan, {}, reg, impls=impls, runs_dir=tmp_path)
+
+    stats = collect_stats(tmp_path)
+    assert stats["runs"] == 2
+    linker = stats["tools"]["entity_linker.v1"]
+    assert linker["executions"] == 2
+    assert linker["calls"] == 1
+    assert linker["cache_hit_ratio"] == 0.5
+    assert linker["p95_ms"] is not None
+    assert set(stats["nodes"]) == {"extract", "link"}
+    assert sum(w["runs"] for w in stats["windows"]) == 2
+
+    only = collect_stats(tmp_path, tool="extractor_A.v1")
+    assert list(only["tools"]) == ["extractor_A.v1"]
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["runs", "stats", "--runs", str(tmp_path), "--since", "1d", "--json"])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["runs"] == 2
+    result = runner.invoke(app, ["runs", "stats", "--runs", str(tmp_path)])
+    assert "entity_linker.v1" in result.stdout
+
+
+def test_read_only_commands_do_not_create_missing_roots(tmp_path: Path) -> None:
+    runner = CliRunner()
+    missing = tmp_path / "nowhere"
+    for args, what in [
+        (["runs", "stats"], "runs"),
+        (["runs", "gc", "--max-runs", "1"], "runs"),
+        (["cache", "stats"], "cache"),
+    ]:
+        result = runner.invoke(app, [*args, "--runs", str(missing)])
+        assert result.exit_code == 1
+        assert f"no {what} at " in result.output
+    assert not missing.exists()
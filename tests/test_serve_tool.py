@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from symphonia.registry.registry import Registry
+from symphonia.runtime.errors import RegistryError, SchemaError, ToolCallError
+from symphonia.runtime.model_loader import ModelLoader
+from symphonia.runtime.tools import HttpTool, InprocTool
+from symphonia.sdk.cli import app
+from symphonia.tools.serve import DynamicBatcher, serve_tool
+from symphonia.tools.stubs.entity_linker import run as link, run_batch as link_batch
+
+REG_DIR = Path(__file__).resolve().parents[1] / "registry" / "manifests"
+
+
+def test_dynamic_batcher_groups_concurrent_calls() -> None:
+    seen = []
+    started, gate = threading.Event(), threading.Event()
+
+    class Tool:
+        def invoke(self, payload, timeout_s=None):
+            started.set()
+            gate.wait()
+            if payload["n"] < 0:
+                raise ToolCallError(status=422, message="negative")
+            return {"n": payload["n"] * 2}
+
+        def invoke_batch(self, payloads):
+            seen.append(len(payloads))
+            return [{"n": p["n"] * 2} for p in payloads]
+
+    batcher = DynamicBatcher(Tool(), max_batch_size=8, max_wait_ms=1)
+    first = batcher.submit({"n": -1})  # occupies the worker until the gate opens
+    started.wait()
+    futures = [batcher.submit({"n": i}) for i in range(5)]
+    gate.set()
+    with pytest.raises(ToolCallError):
+        first.result()
+    assert [f.result() for f in futures] == [{"n": 2 * i} for i in range(5)]
+    assert seen == [5]
+    batcher.close()
+
+
+def test_dynamic_batcher_fails_every_item_on_short_batches() -> None:
+    started, gate = threading.Event(), threading.Event()
+
+    class Tool:
+        def invoke(self, payload, timeout_s=None):
+            started.set()
+            gate.wait()
+            return payload
+
+        def invoke_batch(self, payloads):
+            return payloads[:1]
+
+    batcher = DynamicBatcher(Tool(), max_batch_size=8, max_wait_ms=1)
+    busy = batcher.submit({"n": 0})
+    started.wait()
+    futures = [batcher.submit({"n": i}) for i in range(1, 4)]
+    gate.set()
+    assert busy.result() == {"n": 0}
+    for future in futures:
+        with pytest.raises(ToolCallError, match="1 results for 3 calls"):
+            future.result(timeout=5)
+    batcher.close()
+
+
+def test_batcher_invoke_times_out() -> None:
+    started, gate = threading.Event(), threading.Event()
+
+    class Tool:
+        def invoke(self, payload, timeout_s=None):
+            started.set()
+            gate.wait()
+            return payload
+
+    batcher = DynamicBatcher(Tool(), timeout_s=0.05)
+    busy = batcher.submit({"n": 0})  # holds the worker until the gate opens
+    started.wait()
+    with pytest.raises(ToolCallError) as info:
+        batcher.invoke({"n": 1})
+    assert info.value.status == 504
+    assert batcher.invoke_batch([{"n": 2}])[0]["error"]["status"] == 504
+    gate.set()
+    assert busy.result() == {"n": 0}
+    batcher.close()
+    assert batcher.counters["items"] == 1  # timed-out requests were dropped
+
+
+def test_inproc_batch_hook() -> None:
+    manifest = Registry(REG_DIR).resolve("entity_linker.v1")
+    batches = []
+
+    def run_batch(payloads):
+        batches.append(len(payloads))
+        return link_batch(payloads)
+
+    tool = InprocTool(manifest, link, run_batch)
+    out = tool.invoke_batch([{"mentions": ["A", "B"]}, {"bad": 1}, {"mentions": []}])
+    assert out[0] == link({"mentions": ["A", "B"]})
+    assert isinstance(out[1], SchemaError)
+    assert out[2] == {"entities": []}
+    assert batches == [2]  # one call for the valid items
+
+    short = InprocTool(manifest, link, lambda payloads: link_batch(payloads)[:1])
+    with pytest.raises(ToolCallError):
+        short.invoke_batch([{"mentions": ["A"]}, {"mentions": ["B"]}])
+
+    plain = InprocTool(manifest, link).invoke_batch([{"mentions": ["C"]}])
+    assert plain == [{"entities": [{"mention": "C", "entity": "c"}]}]
+
+
+def test_serve_tool_cli_takes_registry_positionally(tmp_path) -> None:
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    manifest = {
+        "name": "remote",
+        "version": "v1",
+        "kind": "http",
+        "endpoint": "http://x",
+        "input_schema": {},
+        "output_schema": {},
+    }
+    (reg_dir / "remote.v1.json").write_text(json.dumps(manifest))
+    result = CliRunner().invoke(app, ["serve-tool", "remote.v1", str(reg_dir)])
+    assert result.exit_code != 0
+    assert "only inproc tools can be served" in result.output
+
+
+def test_serve_tool_shares_one_model(tmp_path) -> None:
+    server, batcher, manifest = serve_tool(
+        Registry(REG_DIR),
+        "entity_linker.v1",
+        uds=tmp_path / "linker.sock",
+        loader=ModelLoader(),
+        max_wait_ms=20,
+    )
+    assert manifest["kind"] == "http" and "entrypoint" not in manifest
+    assert manifest["batch_endpoint"] == f"unix://{tmp_path / 'linker.sock'}:/batch"
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    (reg_dir / "entity_linker.v1.json").write_text(json.dumps(manifest))
+
+    with server:
+        tools = [HttpTool(Registry(reg_dir).resolve("entity_linker.v1")) for _ in range(4)]
+        with ThreadPoolExecutor(8) as pool:
+            results = list(
+                pool.map(lambda i: tools[i % 4].invoke({"mentions": [f"M{i}"]}), range(16))
+            )
+        assert results[3] == {"entities": [{"mention": "M3", "entity": "m3"}]}
+        assert tools[0].invoke_batch([{"mentions": ["A"]}, {"bad": 1}])[0]["entities"]
+    batcher.close()
+    assert batcher.counters["items"] == 17
+    assert batcher.counters["batches"] < 17
+
+    with pytest.raises(RegistryError):
+        serve_tool(Registry(reg_dir), "entity_linker.v1")
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import pytest
 
-from symphonia.runtime.state import State, interpolate
+from symphonia.registry.manifest import ToolManifest
+from symphonia.runtime.cache import cache_key, manifest_hash, node_cache_key
+from symphonia.runtime.state import State, content_hash, interpolate, key_view
 from symphonia.runtime.errors import SchemaError
 
 
@@ -17,3 +19,44 @@ def test_missing_ref() -> None:
     state = State({}, {})
     with pytest.raises(SchemaError):
         interpolate("${unknown}", state)
+
+
+def test_key_view_uses_upstream_hashes() -> None:
+    state = State({"doc": "hello"}, {})
+    state.set_node("up", {"big": list(range(1000))})
+    inputs = {"text": "${context.doc}", "items": "${up.big}", "t": "n=${up.big}"}
+    view = key_view(inputs, state)
+    assert view["text"] == "hello"
+    assert view["items"] == {"$node": content_hash({"big": list(range(1000))}), "$path": "big"}
+    assert view["t"]["$refs"] == [view["items"]]
+
+    # A known response digest seeds the hash without serializing the value.
+    state.set_node("up", {"big": []}, response_hash="abc", out={"big": "$.big"})
+    assert key_view(inputs, state)["items"]["$node"] == content_hash(
+        {"response": "abc", "out": {"big": "$.big"}}
+    )
+    with pytest.raises(SchemaError):
+        key_view({"x": "${missing.y}"}, state)
+
+
+def test_fresh_and_cached_outputs_hash_alike() -> None:
+    response = {"mentions": ["a", "b"], "debug": "x" * 100}
+    out = {"mentions": "$.mentions"}
+    expose = {"mentions": response["mentions"]}
+    fresh, cached = State({}, {}), State({}, {})
+    fresh.set_node("up", expose, response=response, out=out)
+    cached.set_node("up", expose, response_hash=content_hash(response), out=out)
+    assert fresh.node_hash("up") == cached.node_hash("up")
+
+    fresh.set_node("up", response, response=response)
+    cached.set_node("up", response, response_hash=content_hash(response))
+    assert fresh.node_hash("up") == cached.node_hash("up")
+
+
+def test_node_cache_key_matches_resolved_inputs_without_refs() -> None:
+    m = ToolManifest(name="t", version="v1", kind="inproc", input_schema={}, output_schema={})
+    state = State({"doc": "hi"}, {})
+    key = node_cache_key(m, {"text": "${context.doc}"}, state)
+    assert key == cache_key("t", "v1", {"text": "hi"}, manifest_hash(m))
+    m.cache_ttl_s = 60  # cache-neutral field
+    assert node_cache_key(m, {"text": "${context.doc}"}, state) == key
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from symphonia.registry.manifest import ToolManifest
+from symphonia.registry.registry import Registry
+from symphonia.runtime import transport
+from symphonia.runtime.engine import run_plan
+from symphonia.runtime.errors import RegistryError
+from symphonia.runtime.model_loader import ModelLoader
+from symphonia.runtime.tools import HttpTool
+from symphonia.runtime.transport import parse_unix_endpoint
+from symphonia.sdk.plan_ir import Node, Plan
+from symphonia.tools.server import UnixToolServer
+
+
+def _manifest(endpoint: str) -> dict:
+    return {
+        "name": "sidecar",
+        "version": "v1",
+        "kind": "http",
+        "endpoint": endpoint,
+        "batch_endpoint": f"{endpoint}:/batch",
+        "input_schema": {"type": "object"},
+        "output_schema": {"type": "object", "required": ["n"]},
+    }
+
+
+def test_parse_unix_endpoint() -> None:
+    assert parse_unix_endpoint("unix:///run/t.sock") == ("/run/t.sock", "/")
+    assert parse_unix_endpoint("unix:///run/t.sock:/batch") == ("/run/t.sock", "/batch")
+
+
+def test_http_tool_over_unix_socket(tmp_path) -> None:
+    with UnixToolServer(lambda p: {"n": len(p)}, tmp_path / "tool.sock") as server:
+        tool = HttpTool(ToolManifest(**_manifest(server.url)))
+        assert tool.invoke({"a": 1, "b": 2}) == {"n": 2}
+        assert tool.invoke_batch([{}, {"a": 1}]) == [{"n": 0}, {"n": 1}]
+
+        reg_dir = tmp_path / "reg"
+        reg_dir.mkdir()
+        (reg_dir / "sidecar.v1.json").write_text(json.dumps(_manifest(server.url)))
+        assert Registry(reg_dir).health() == {"sidecar.v1": True}
+    assert Registry(reg_dir).health() == {"sidecar.v1": False}
+
+    (reg_dir / "sidecar.v1.json").write_text(json.dumps(_manifest("unix://relative.sock")))
+    with pytest.raises(RegistryError):
+        Registry(reg_dir)
+
+
+def test_runs_close_socket_clients(tmp_path) -> None:
+    reg_dir = tmp_path / "reg"
+    reg_dir.mkdir()
+    plan = Plan(version="0.1", graph=[Node(id="n", tool="sidecar.v1", inputs={"a": 1})])
+    with UnixToolServer(lambda p: {"n": len(p)}, tmp_path / "tool.sock") as server:
+        (reg_dir / "sidecar.v1.json").write_text(json.dumps(_manifest(server.url)))
+
+        def run():
+            _, err = run_plan(
+                plan, {}, Registry(reg_dir), runs_dir=tmp_path / "runs", loader=ModelLoader()
+            )
+            assert err is None
+
+        run()
+        assert not transport._CLIENTS
+        transport.hold_clients()  # e.g. another run in the same process
+        run()
+        assert transport._CLIENTS  # still in use by the other run
+        transport.close_clients()
+        assert not transport._CLIENTS
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import pytest
+
+from symphonia.registry.manifest import ToolManifest
+from symphonia.runtime.errors import SchemaError
+from symphonia.runtime.tools import InprocTool
+from symphonia.runtime.validation import (
+    SchemaViolation,
+    ValidationPolicy,
+    compile_schema,
+    parse_mode,
+    validation_counters,
+)
+
+SCHEMA = {
+    "type": "object",
+    "required": ["text", "n"],
+    "properties": {
+        "text": {"type": "string", "minLength": 1, "pattern": "^[a-z]"},
+        "n": {"type": "integer", "minimum": 0},
+        "tags": {"type": "array", "items": {"enum": ["a", "b"]}, "maxItems": 2},
+        "score": {"type": ["number", "null"]},
+    },
+    "additionalProperties": False,
+}
+
+CASES = [
+    ({"text": "hi", "n": 1}, True),
+    ({"text": "hi", "n": 2.0, "tags": ["a", "b"], "score": None}, True),
+    ({"text": "hi", "n": 1, "score": 0.5}, True),
+    ({"text": "hi"}, False),
+    ({"text": "", "n": 1}, False),
+    ({"text": "Hi", "n": 1}, False),
+    ({"text": "hi", "n": True}, False),
+    ({"text": "hi", "n": -1}, False),
+    ({"text": "hi", "n": 1.5}, False),
+    ({"text": "hi", "n": 1, "tags": ["c"]}, False),
+    ({"text": "hi", "n": 1, "tags": ["a", "a", "b"]}, False),
+    ({"text": "hi", "n": 1, "score": "x"}, False),
+    ({"text": "hi", "n": 1, "extra": 1}, False),
+    ([], False),
+]
+
+
+@pytest.mark.parametrize("payload, ok", CASES)
+def test_codegen_agrees_with_jsonschema(payload, ok) -> None:
+    for engine in ("codegen", "jsonschema"):
+        validate = compile_schema(SCHEMA, engine)
+        if ok:
+            validate(payload)
+        else:
+            with pytest.raises(SchemaViolation):
+                validate(payload)
+
+
+@pytest.mark.parametrize(
+    "schema, payload, ok",
+    [
+        ({"enum": [1]}, True, False),
+        ({"enum": [1]}, 1.0, True),
+        ({"enum": [0, "a"]}, False, False),
+        ({"enum": [True]}, 1, False),
+        ({"const": [1, {"a": 0}]}, [True, {"a": False}], False),
+        ({"const": [1, {"a": 0}]}, [1.0, {"a": 0}], True),
+        ({"const": False}, 0, False),
+    ],
+)
+def test_enum_and_const_tell_booleans_from_numbers(schema, payload, ok) -> None:
+    for engine in ("codegen", "jsonschema"):
+        validate = compile_schema(schema, engine)
+        if ok:
+            validate(payload)
+        else:
+            with pytest.raises(SchemaViolation):
+                validate(payload)
+
+
+def test_unsupported_keywords_fall_back() -> None:
+    schema = {"anyOf": [{"type": "string"}, {"type": "integer"}]}
+    with pytest.raises(NotImplementedError):
+        compile_schema(schema, "codegen")
+    validate = compile_schema(schema, "jsonschema")
+    validate(3)
+    with pytest.raises(SchemaViolation):
+        validate([])
+
+
+def test_tools_share_compiled_validators() -> None:
+    def manifest(version: str) -> ToolManifest:
+        return ToolManifest(
+            name="t", version=version, kind="inproc", input_schema=dict(SCHEMA), output_schema={}
+        )
+
+    a = InprocTool(manifest("v1"), lambda p: {})
+    b = InprocTool(manifest("v2"), lambda p: {})
+    assert a._in_validator.validate is b._in_validator.validate
+    with pytest.raises(SchemaError, match="input schema error"):
+        a.invoke({"text": "hi"})
+
+
+def test_validation_modes_and_revert_on_violation() -> None:
+    calls = []
+
+    def validate(data):
+        calls.append(data)
+        if data == "bad":
+            raise SchemaViolation("bad")
+
+    first = ValidationPolicy(validate, "first:2")
+    for item in ("a", "b", "c"):
+        first(item)
+    assert calls == ["a", "b"] and first.counters["skipped"] == 1
+
+    sampled = ValidationPolicy(validate, "sample:0")
+    sampled("bad")  # not sampled
+    assert sampled.counters == {"validated": 0, "skipped": 1, "violations": 0}
+    sampled.kind = "sample"
+    sampled.param = 1.0
+    with pytest.raises(SchemaViolation):
+        sampled("bad")
+    assert sampled.kind == "always" and sampled.counters["violations"] == 1
+
+    for bad in ("sometimes", "sample:2", "first:-1", "always:1"):
+        with pytest.raises(ValueError):
+            parse_mode(bad)
+
+
+def test_trusted_tool_counters() -> None:
+    m = ToolManifest(
+        name="trusted",
+        version="v1",
+        kind="inproc",
+        input_schema={},
+        output_schema={"type": "object", "required": ["y"]},
+        validate_output="first:1",
+    )
+    tool = InprocTool(m, lambda p: {"y": 1} if p else {})
+    start = validation_counters([tool])
+    tool.invoke({"x": 1})
+    tool.invoke({})  # invalid output, but past the first call
+    out = validation_counters([tool], since=start)["trusted.v1"]["output"]
+    assert (out["validated"], out["skipped"], out["violations"]) == (1, 1, 0)
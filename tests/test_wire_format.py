@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from symphonia.registry.manifest import ToolManifest
+from symphonia.runtime import wire
+from symphonia.runtime.errors import ToolCallError
+from symphonia.runtime.tools import HttpTool
+from symphonia.tools.server import ToolServer
+
+
+def _link(payload: dict) -> dict:
+    if not payload["mentions"]:
+        raise ToolCallError(status=404, message="nothing to link")
+    return {"entities": [{"mention": m, "entity": m.lower()} for m in payload["mentions"]]}
+
+
+def _manifest(url: str, **kw) -> ToolManifest:
+    return ToolManifest(
+        name="linker",
+        version="v1",
+        kind="http",
+        endpoint=url,
+        batch_endpoint=f"{url}/batch",
+        input_schema={"type": "object", "required": ["mentions"]},
+        output_schema={"type": "object", "required": ["entities"]},
+        **kw,
+    )
+
+
+needs_msgpack = pytest.mark.skipif(wire.msgpack is None, reason="msgpack not installed")
+
+
+@pytest.mark.parametrize(
+    "fmt, compress", [("json", False), pytest.param("msgpack", True, marks=needs_msgpack)]
+)
+def test_reference_server_roundtrip(fmt: str, compress: bool) -> None:
+    mentions = [f"Entity{i}" for i in range(200)]
+    with ToolServer(_link) as server:
+        tool = HttpTool(_manifest(server.url, wire_format=fmt, wire_compress=compress))
+        assert tool.invoke({"mentions": mentions})["entities"][-1]["entity"] == "entity199"
+        ok, err = tool.invoke_batch([{"mentions": ["A"]}, {"mentions": []}])
+        assert ok == {"entities": [{"mention": "A", "entity": "a"}]}
+        assert isinstance(err, ToolCallError) and err.status == 404
+        with pytest.raises(ToolCallError):
+            tool.invoke({"mentions": []})
+        assert httpx.get(f"{server.url}/health").status_code == 200
+    assert tool._wire == (wire.MSGPACK if fmt == "msgpack" else None)
+
+
+@needs_msgpack
+def test_msgpack_falls_back_to_json(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        kind = request.headers.get("content-type")
+        seen.append(kind)
+        if kind != wire.JSON:
+            return httpx.Response(415)
+        return httpx.Response(200, json={"entities": []})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def fake_post(url, json=None, content=None, headers=None, timeout=None):
+        return client.post(url, json=json, content=content, headers=headers)
+
+    monkeypatch.setattr(httpx, "post", fake_post)
+    tool = HttpTool(_manifest("http://legacy/tool", wire_format="msgpack"))
+    assert tool.invoke({"mentions": ["a"]}) == {"entities": []}
+    assert tool.invoke({"mentions": ["b"]}) == {"entities": []}
+    assert seen == [wire.MSGPACK, wire.JSON, wire.JSON]